@@ -5,13 +5,17 @@ import org.springframework.data.domain.Page;
 import org.springframework.data.domain.PageRequest;
 import org.springframework.data.domain.Pageable;
 import org.springframework.data.domain.Sort;
+import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.http.HttpStatus;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import com.mcphackathon.signal_intelligence.dto.CellTowerChanges;
+import com.mcphackathon.signal_intelligence.dto.CellTowerGroupStats;
 import com.mcphackathon.signal_intelligence.entity.CellTower;
 import com.mcphackathon.signal_intelligence.service.CellTowerService;
 
+import java.time.LocalDateTime;
 import java.util.List;
 import java.util.Optional;
 
@@ -85,12 +89,12 @@ public class CellTowerController {
     }
     
     @GetMapping("/cell/{cellId}")
-    public ResponseEntity<List<CellTower>> getCellTowerByCellId(@PathVariable Integer cellId) {
-        Optional<CellTower> cellTower = cellTowerService.getCellTowerByCellId(cellId);
-        if (cellTower.isEmpty()) {
+    public ResponseEntity<List<CellTower>> getCellTowersByCellId(@PathVariable Integer cellId) {
+        List<CellTower> cellTowers = cellTowerService.getCellTowersByCellId(cellId);
+        if (cellTowers.isEmpty()) {
             return new ResponseEntity<>(HttpStatus.NOT_FOUND);
         }
-        return new ResponseEntity<>(List.of(cellTower.get()), HttpStatus.OK);
+        return new ResponseEntity<>(cellTowers, HttpStatus.OK);
     }
 
 
@@ -245,6 +249,51 @@ public class CellTowerController {
         }
     }
     
+    // Aggregation endpoint: GROUP BY radio, net, area or signal with optional radio / bounding box filters
+    @GetMapping("/stats")
+    public ResponseEntity<List<CellTowerGroupStats>> getGroupStats(
+            @RequestParam(defaultValue = "radio") String groupBy,
+            @RequestParam(required = false) String radio,
+            @RequestParam(required = false) Double minLon,
+            @RequestParam(required = false) Double maxLon,
+            @RequestParam(required = false) Double minLat,
+            @RequestParam(required = false) Double maxLat) {
+        
+        boolean partialBounds = (minLon == null) != (maxLon == null) || (minLat == null) != (maxLat == null);
+        if (partialBounds) {
+            return new ResponseEntity<>(null, HttpStatus.BAD_REQUEST);
+        }
+        try {
+            List<CellTowerGroupStats> stats = cellTowerService.getGroupStats(groupBy, radio, minLon, maxLon, minLat, maxLat);
+            if (stats.isEmpty()) {
+                return new ResponseEntity<>(HttpStatus.NO_CONTENT);
+            }
+            return new ResponseEntity<>(stats, HttpStatus.OK);
+        } catch (IllegalArgumentException e) {
+            return new ResponseEntity<>(null, HttpStatus.BAD_REQUEST);
+        } catch (Exception e) {
+            return new ResponseEntity<>(null, HttpStatus.INTERNAL_SERVER_ERROR);
+        }
+    }
+    
+    // Change feed for incremental sync: towers written and deleted after a watermark, in write order
+    @GetMapping("/changes")
+    public ResponseEntity<CellTowerChanges> getChanges(
+            @RequestParam(required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) LocalDateTime since,
+            @RequestParam(required = false) Long afterId,
+            @RequestParam(defaultValue = "1000") int size) {
+        
+        if (size < 1 || size > 10000) {
+            return new ResponseEntity<>(null, HttpStatus.BAD_REQUEST);
+        }
+        try {
+            CellTowerChanges changes = cellTowerService.getChangesSince(since, afterId, size);
+            return new ResponseEntity<>(changes, HttpStatus.OK);
+        } catch (Exception e) {
+            return new ResponseEntity<>(null, HttpStatus.INTERNAL_SERVER_ERROR);
+        }
+    }
+    
     @GetMapping("/radio/{radio}/count")
     public ResponseEntity<Long> getCountByRadio(@PathVariable String radio) {
         try {
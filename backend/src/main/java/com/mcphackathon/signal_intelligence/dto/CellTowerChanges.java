@@ -0,0 +1,60 @@
+package com.mcphackathon.signal_intelligence.dto;
+
+import com.mcphackathon.signal_intelligence.entity.CellTower;
+
+import java.time.LocalDateTime;
+import java.util.List;
+
+/**
+ * One page of the /api/cell-towers/changes feed. Clients pass nextSince and
+ * nextAfterId back while hasMore is set; deletions and the reset flag come with
+ * the first page of a round only. serverTime is read before the page query, so
+ * it is a safe watermark for the next round.
+ */
+public class CellTowerChanges {
+
+    private List<CellTower> towers;
+    private List<Long> deletedIds;
+    private boolean reset;
+    private LocalDateTime nextSince;
+    private Long nextAfterId;
+    private boolean hasMore;
+    private LocalDateTime serverTime;
+
+    // Constructors
+    public CellTowerChanges() {}
+
+    public CellTowerChanges(List<CellTower> towers, List<Long> deletedIds, boolean reset,
+                            LocalDateTime nextSince, Long nextAfterId, boolean hasMore,
+                            LocalDateTime serverTime) {
+        this.towers = towers;
+        this.deletedIds = deletedIds;
+        this.reset = reset;
+        this.nextSince = nextSince;
+        this.nextAfterId = nextAfterId;
+        this.hasMore = hasMore;
+        this.serverTime = serverTime;
+    }
+
+    // Getters and Setters
+    public List<CellTower> getTowers() { return towers; }
+    public void setTowers(List<CellTower> towers) { this.towers = towers; }
+
+    public List<Long> getDeletedIds() { return deletedIds; }
+    public void setDeletedIds(List<Long> deletedIds) { this.deletedIds = deletedIds; }
+
+    public boolean isReset() { return reset; }
+    public void setReset(boolean reset) { this.reset = reset; }
+
+    public LocalDateTime getNextSince() { return nextSince; }
+    public void setNextSince(LocalDateTime nextSince) { this.nextSince = nextSince; }
+
+    public Long getNextAfterId() { return nextAfterId; }
+    public void setNextAfterId(Long nextAfterId) { this.nextAfterId = nextAfterId; }
+
+    public boolean isHasMore() { return hasMore; }
+    public void setHasMore(boolean hasMore) { this.hasMore = hasMore; }
+
+    public LocalDateTime getServerTime() { return serverTime; }
+    public void setServerTime(LocalDateTime serverTime) { this.serverTime = serverTime; }
+}
@@ -0,0 +1,70 @@
+package com.mcphackathon.signal_intelligence.dto;
+
+/**
+ * Aggregates of one GROUP BY bucket returned by /api/cell-towers/stats.
+ * Missing signal and sample values count as 0, and the sums of squares let
+ * clients derive variance without the raw rows.
+ */
+public class CellTowerGroupStats {
+
+    private Object groupKey;
+    private Long towerCount;
+    private Long signalSum;
+    private Double signalSumSquares;
+    private Integer signalMin;
+    private Integer signalMax;
+    private Long samplesSum;
+    private Double samplesSumSquares;
+    private Integer samplesMin;
+    private Integer samplesMax;
+
+    // Constructors
+    public CellTowerGroupStats() {}
+
+    // Used by the JPQL constructor expressions in CellTowerRepository
+    public CellTowerGroupStats(Object groupKey, Number towerCount,
+                               Number signalSum, Number signalSumSquares, Number signalMin, Number signalMax,
+                               Number samplesSum, Number samplesSumSquares, Number samplesMin, Number samplesMax) {
+        this.groupKey = groupKey;
+        this.towerCount = towerCount.longValue();
+        this.signalSum = signalSum == null ? 0L : signalSum.longValue();
+        this.signalSumSquares = signalSumSquares == null ? 0.0 : signalSumSquares.doubleValue();
+        this.signalMin = signalMin == null ? null : signalMin.intValue();
+        this.signalMax = signalMax == null ? null : signalMax.intValue();
+        this.samplesSum = samplesSum == null ? 0L : samplesSum.longValue();
+        this.samplesSumSquares = samplesSumSquares == null ? 0.0 : samplesSumSquares.doubleValue();
+        this.samplesMin = samplesMin == null ? null : samplesMin.intValue();
+        this.samplesMax = samplesMax == null ? null : samplesMax.intValue();
+    }
+
+    // Getters and Setters
+    public Object getGroupKey() { return groupKey; }
+    public void setGroupKey(Object groupKey) { this.groupKey = groupKey; }
+
+    public Long getTowerCount() { return towerCount; }
+    public void setTowerCount(Long towerCount) { this.towerCount = towerCount; }
+
+    public Long getSignalSum() { return signalSum; }
+    public void setSignalSum(Long signalSum) { this.signalSum = signalSum; }
+
+    public Double getSignalSumSquares() { return signalSumSquares; }
+    public void setSignalSumSquares(Double signalSumSquares) { this.signalSumSquares = signalSumSquares; }
+
+    public Integer getSignalMin() { return signalMin; }
+    public void setSignalMin(Integer signalMin) { this.signalMin = signalMin; }
+
+    public Integer getSignalMax() { return signalMax; }
+    public void setSignalMax(Integer signalMax) { this.signalMax = signalMax; }
+
+    public Long getSamplesSum() { return samplesSum; }
+    public void setSamplesSum(Long samplesSum) { this.samplesSum = samplesSum; }
+
+    public Double getSamplesSumSquares() { return samplesSumSquares; }
+    public void setSamplesSumSquares(Double samplesSumSquares) { this.samplesSumSquares = samplesSumSquares; }
+
+    public Integer getSamplesMin() { return samplesMin; }
+    public void setSamplesMin(Integer samplesMin) { this.samplesMin = samplesMin; }
+
+    public Integer getSamplesMax() { return samplesMax; }
+    public void setSamplesMax(Integer samplesMax) { this.samplesMax = samplesMax; }
+}
@@ -4,8 +4,13 @@ package com.mcphackathon.signal_intelligence.entity;
 import jakarta.persistence.*;
 import java.time.LocalDateTime;
 
+import org.hibernate.annotations.UpdateTimestamp;
+
+import com.fasterxml.jackson.annotation.JsonIgnore;
+
 @Entity
-@Table(name = "cell_tower")
+@Table(name = "cell_tower",
+       indexes = @Index(name = "idx_cell_tower_modified", columnList = "modified_at, id"))
 public class CellTower {
     
     @Id
@@ -54,6 +59,13 @@ public class CellTower {
     @Column(name = "average_signal")
     private Integer averageSignal;
     
+    // Row write time, set by Hibernate on insert and update. Unlike `updated`
+    // (the OpenCelliD measurement time) it drives the /changes feed.
+    @UpdateTimestamp
+    @Column(name = "modified_at")
+    @JsonIgnore
+    private LocalDateTime modifiedAt;
+    
     // Constructors
     public CellTower() {}
     
@@ -122,4 +134,7 @@ public class CellTower {
     
     public Integer getAverageSignal() { return averageSignal; }
     public void setAverageSignal(Integer averageSignal) { this.averageSignal = averageSignal; }
+    
+    public LocalDateTime getModifiedAt() { return modifiedAt; }
+    public void setModifiedAt(LocalDateTime modifiedAt) { this.modifiedAt = modifiedAt; }
 }
\ No newline at end of file
@@ -0,0 +1,44 @@
+package com.mcphackathon.signal_intelligence.entity;
+
+import jakarta.persistence.*;
+import java.time.LocalDateTime;
+
+import org.hibernate.annotations.CreationTimestamp;
+
+/**
+ * Tombstone left by a tower delete so /changes can report it to syncing clients.
+ * A null towerId records that the whole table was cleared.
+ */
+@Entity
+@Table(name = "cell_tower_deletion",
+       indexes = @Index(name = "idx_cell_tower_deletion_deleted", columnList = "deleted_at"))
+public class CellTowerDeletion {
+    
+    @Id
+    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    private Long id;
+    
+    @Column(name = "tower_id")
+    private Long towerId;
+    
+    @CreationTimestamp
+    @Column(name = "deleted_at", nullable = false)
+    private LocalDateTime deletedAt;
+    
+    // Constructors
+    public CellTowerDeletion() {}
+    
+    public CellTowerDeletion(Long towerId) {
+        this.towerId = towerId;
+    }
+    
+    // Getters and Setters
+    public Long getId() { return id; }
+    public void setId(Long id) { this.id = id; }
+    
+    public Long getTowerId() { return towerId; }
+    public void setTowerId(Long towerId) { this.towerId = towerId; }
+    
+    public LocalDateTime getDeletedAt() { return deletedAt; }
+    public void setDeletedAt(LocalDateTime deletedAt) { this.deletedAt = deletedAt; }
+}
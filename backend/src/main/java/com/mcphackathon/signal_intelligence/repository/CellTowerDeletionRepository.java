@@ -0,0 +1,16 @@
+package com.mcphackathon.signal_intelligence.repository;
+
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.stereotype.Repository;
+
+import com.mcphackathon.signal_intelligence.entity.CellTowerDeletion;
+
+import java.time.LocalDateTime;
+import java.util.List;
+
+@Repository
+public interface CellTowerDeletionRepository extends JpaRepository<CellTowerDeletion, Long> {
+    
+    // Tombstones written after a sync watermark
+    List<CellTowerDeletion> findByDeletedAtAfter(LocalDateTime since);
+}
@@ -8,8 +8,10 @@ import org.springframework.data.jpa.repository.Query;
 import org.springframework.data.repository.query.Param;
 import org.springframework.stereotype.Repository;
 
+import com.mcphackathon.signal_intelligence.dto.CellTowerGroupStats;
 import com.mcphackathon.signal_intelligence.entity.CellTower;
 
+import java.time.LocalDateTime;
 import java.util.List;
 import java.util.Optional;
 
@@ -58,4 +60,48 @@ public interface CellTowerRepository extends JpaRepository<CellTower, Long> {
                                               @Param("maxSignal") Integer maxSignal);
     
     // REMOVED: Don't need custom count method, JpaRepository already provides count()
-}
\ No newline at end of file
+
+    // Grouped aggregates for coverage analysis; null filters match every tower
+    String GROUP_STATS_SELECT = "SELECT new com.mcphackathon.signal_intelligence.dto.CellTowerGroupStats(";
+    String GROUP_STATS_COLUMNS = ", COUNT(ct), "
+            + "SUM(COALESCE(ct.averageSignal, 0)), "
+            + "SUM(CAST(COALESCE(ct.averageSignal, 0) AS Double) * COALESCE(ct.averageSignal, 0)), "
+            + "MIN(COALESCE(ct.averageSignal, 0)), MAX(COALESCE(ct.averageSignal, 0)), "
+            + "SUM(COALESCE(ct.samples, 0)), "
+            + "SUM(CAST(COALESCE(ct.samples, 0) AS Double) * COALESCE(ct.samples, 0)), "
+            + "MIN(COALESCE(ct.samples, 0)), MAX(COALESCE(ct.samples, 0))) "
+            + "FROM CellTower ct "
+            + "WHERE (:radio IS NULL OR ct.radio = :radio) "
+            + "AND (:minLon IS NULL OR ct.lon BETWEEN :minLon AND :maxLon) "
+            + "AND (:minLat IS NULL OR ct.lat BETWEEN :minLat AND :maxLat) ";
+
+    @Query(GROUP_STATS_SELECT + "ct.radio" + GROUP_STATS_COLUMNS + "GROUP BY ct.radio")
+    List<CellTowerGroupStats> aggregateByRadio(@Param("radio") String radio,
+                                               @Param("minLon") Double minLon, @Param("maxLon") Double maxLon,
+                                               @Param("minLat") Double minLat, @Param("maxLat") Double maxLat);
+
+    @Query(GROUP_STATS_SELECT + "ct.net" + GROUP_STATS_COLUMNS + "GROUP BY ct.net")
+    List<CellTowerGroupStats> aggregateByNet(@Param("radio") String radio,
+                                             @Param("minLon") Double minLon, @Param("maxLon") Double maxLon,
+                                             @Param("minLat") Double minLat, @Param("maxLat") Double maxLat);
+
+    @Query(GROUP_STATS_SELECT + "ct.area" + GROUP_STATS_COLUMNS + "GROUP BY ct.area")
+    List<CellTowerGroupStats> aggregateByArea(@Param("radio") String radio,
+                                              @Param("minLon") Double minLon, @Param("maxLon") Double maxLon,
+                                              @Param("minLat") Double minLat, @Param("maxLat") Double maxLat);
+
+    // One bucket per signal value (dBm), used for percentiles
+    @Query(GROUP_STATS_SELECT + "COALESCE(ct.averageSignal, 0)" + GROUP_STATS_COLUMNS
+            + "GROUP BY COALESCE(ct.averageSignal, 0)")
+    List<CellTowerGroupStats> aggregateBySignal(@Param("radio") String radio,
+                                                @Param("minLon") Double minLon, @Param("maxLon") Double maxLon,
+                                                @Param("minLat") Double minLat, @Param("maxLat") Double maxLat);
+
+    // Change feed: towers written after the (since, afterId) cursor in write order.
+    // Keyset paging stays correct while rows keep changing, unlike page offsets.
+    @Query("SELECT ct FROM CellTower ct WHERE ct.modifiedAt > :since "
+            + "OR (ct.modifiedAt = :since AND ct.id > :afterId) "
+            + "ORDER BY ct.modifiedAt, ct.id")
+    List<CellTower> findModifiedAfter(@Param("since") LocalDateTime since, @Param("afterId") Long afterId,
+                                      Pageable pageable);
+}
@@ -5,8 +5,11 @@ package com.mcphackathon.signal_intelligence.service;
 import org.springframework.data.domain.Page;
 import org.springframework.data.domain.Pageable;
 
+import com.mcphackathon.signal_intelligence.dto.CellTowerChanges;
+import com.mcphackathon.signal_intelligence.dto.CellTowerGroupStats;
 import com.mcphackathon.signal_intelligence.entity.CellTower;
 
+import java.time.LocalDateTime;
 import java.util.List;
 import java.util.Optional;
 
@@ -23,7 +26,7 @@ public interface CellTowerService {
     List<CellTower> getAllCellTowers();
     Page<CellTower> getAllCellTowers(Pageable pageable);
     Optional<CellTower> getCellTowerById(Long id);
-    Optional<CellTower> getCellTowerByCellId(Integer cellId);
+    List<CellTower> getCellTowersByCellId(Integer cellId);
     
     // Update
     CellTower updateCellTower(Long id, CellTower cellTower);
@@ -50,6 +53,14 @@ public interface CellTowerService {
     
     Long getCountByRadio(String radio);
 
+    // Aggregation: groupBy is one of radio, net, area or signal
+    List<CellTowerGroupStats> getGroupStats(String groupBy, String radio,
+                                            Double minLon, Double maxLon, Double minLat, Double maxLat);
+
+    // Change feed: towers written after (since, afterId) plus tombstones newer than since;
+    // a null since returns only the server time, to start a watermark
+    CellTowerChanges getChangesSince(LocalDateTime since, Long afterId, int size);
+
     // FIXED: Use consistent method name and return type
     Long count();
 }
\ No newline at end of file
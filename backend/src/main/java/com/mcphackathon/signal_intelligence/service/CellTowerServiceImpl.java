@@ -2,13 +2,20 @@ package com.mcphackathon.signal_intelligence.service;
 
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.data.domain.Page;
+import org.springframework.data.domain.PageRequest;
 import org.springframework.data.domain.Pageable;
 import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
 
+import com.mcphackathon.signal_intelligence.dto.CellTowerChanges;
+import com.mcphackathon.signal_intelligence.dto.CellTowerGroupStats;
 import com.mcphackathon.signal_intelligence.entity.CellTower;
+import com.mcphackathon.signal_intelligence.entity.CellTowerDeletion;
+import com.mcphackathon.signal_intelligence.repository.CellTowerDeletionRepository;
 import com.mcphackathon.signal_intelligence.repository.CellTowerRepository;
 
+import java.time.LocalDateTime;
+import java.util.ArrayList;
 import java.util.List;
 import java.util.Optional;
 
@@ -19,6 +26,9 @@ public class CellTowerServiceImpl implements CellTowerService {
     @Autowired
     private CellTowerRepository cellTowerRepository;
     
+    @Autowired
+    private CellTowerDeletionRepository cellTowerDeletionRepository;
+    
     @Override
     public CellTower createCellTower(CellTower cellTower) {
         return cellTowerRepository.save(cellTower);
@@ -120,11 +130,15 @@ public class CellTowerServiceImpl implements CellTowerService {
             throw new RuntimeException("CellTower not found with id: " + id);
         }
         cellTowerRepository.deleteById(id);
+        cellTowerDeletionRepository.save(new CellTowerDeletion(id));
     }
     
     @Override
     public void deleteAllCellTowers() {
         cellTowerRepository.deleteAll();
+        // One reset marker replaces per-row tombstones; syncing clients reload
+        cellTowerDeletionRepository.deleteAll();
+        cellTowerDeletionRepository.save(new CellTowerDeletion(null));
     }
     
     @Override
@@ -181,6 +195,61 @@ public class CellTowerServiceImpl implements CellTowerService {
         return cellTowerRepository.countByRadio(radio);
     }
     
+    @Override
+    @Transactional(readOnly = true)
+    public List<CellTowerGroupStats> getGroupStats(String groupBy, String radio,
+                                                   Double minLon, Double maxLon, Double minLat, Double maxLat) {
+        switch (groupBy.toLowerCase()) {
+            case "radio":
+                return cellTowerRepository.aggregateByRadio(radio, minLon, maxLon, minLat, maxLat);
+            case "net":
+                return cellTowerRepository.aggregateByNet(radio, minLon, maxLon, minLat, maxLat);
+            case "area":
+                return cellTowerRepository.aggregateByArea(radio, minLon, maxLon, minLat, maxLat);
+            case "signal":
+                return cellTowerRepository.aggregateBySignal(radio, minLon, maxLon, minLat, maxLat);
+            default:
+                throw new IllegalArgumentException("Unsupported groupBy: " + groupBy);
+        }
+    }
+    
+    @Override
+    @Transactional(readOnly = true)
+    public CellTowerChanges getChangesSince(LocalDateTime since, Long afterId, int size) {
+        // Read before the queries: anything written later is newer than this watermark
+        LocalDateTime serverTime = LocalDateTime.now();
+        if (since == null) {
+            return new CellTowerChanges(List.of(), List.of(), false, serverTime, 0L, false, serverTime);
+        }
+        
+        Long cursorId = afterId == null ? 0L : afterId;
+        List<CellTower> towers = cellTowerRepository.findModifiedAfter(since, cursorId, PageRequest.of(0, size + 1));
+        boolean hasMore = towers.size() > size;
+        if (hasMore) {
+            towers = towers.subList(0, size);
+        }
+        
+        List<Long> deletedIds = new ArrayList<>();
+        boolean reset = false;
+        if (afterId == null) {
+            for (CellTowerDeletion deletion : cellTowerDeletionRepository.findByDeletedAtAfter(since)) {
+                if (deletion.getTowerId() == null) {
+                    reset = true;
+                } else {
+                    deletedIds.add(deletion.getTowerId());
+                }
+            }
+        }
+        
+        LocalDateTime nextSince = since;
+        if (!towers.isEmpty()) {
+            CellTower last = towers.get(towers.size() - 1);
+            nextSince = last.getModifiedAt();
+            cursorId = last.getId();
+        }
+        return new CellTowerChanges(towers, deletedIds, reset, nextSince, cursorId, hasMore, serverTime);
+    }
+    
     // FIXED: Use Long return type to match interface
     @Override
     @Transactional(readOnly = true)
@@ -192,8 +261,8 @@ public class CellTowerServiceImpl implements CellTowerService {
 
     @Override
     @Transactional(readOnly = true)
-    public Optional<CellTower> getCellTowerByCellId(Integer cellId) {
-        return cellTowerRepository.findByCell(cellId).stream().findFirst();
+    public List<CellTower> getCellTowersByCellId(Integer cellId) {
+        return cellTowerRepository.findByCell(cellId);
     }
    
 }
\ No newline at end of file
@@ -2,13 +2,42 @@
 HTTP client manager for Cell Tower Signal Intelligence MCP Server
 """
 
+import asyncio
+import importlib.util
+import json
 import logging
-from typing import Optional
+import random
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
 
 import httpx
 
-from config import API_BASE_URL, DEFAULT_HEADERS, DEFAULT_TIMEOUT
+from circuit_breaker import CircuitBreaker
+from config import (
+    API_BASE_URL,
+    CACHE_ENABLED,
+    CIRCUIT_BREAKER_ENABLED,
+    DEFAULT_HEADERS,
+    FANOUT_MAX_CONCURRENCY,
+    HTTP2_ENABLED,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_POOL_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_WRITE_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_STATUS_CODES,
+    STREAM_MAX_IN_FLIGHT,
+    STREAM_PAGE_SIZE,
+)
 from exceptions import APIConnectionError
+from metrics import metrics, route_label
+from response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +47,58 @@ class APIClient:
 
     _instance: Optional["APIClient"] = None
     _client: Optional[httpx.AsyncClient] = None
+    _transport: Optional[httpx.AsyncBaseTransport] = None
+    cache: ResponseCache
+    breaker: CircuitBreaker | None
 
     def __new__(cls) -> "APIClient":
         """Implement singleton pattern"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance.cache = ResponseCache()
+            cls._instance.breaker = CircuitBreaker() if CIRCUIT_BREAKER_ENABLED else None
         return cls._instance
 
     async def get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
         if self._client is None:
             try:
+                http2 = HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+                if HTTP2_ENABLED and not http2:
+                    logger.warning("HTTP2_ENABLED is set but the h2 package is missing; using HTTP/1.1")
                 self._client = httpx.AsyncClient(
-                    timeout=DEFAULT_TIMEOUT,
+                    timeout=httpx.Timeout(
+                        connect=HTTP_CONNECT_TIMEOUT,
+                        read=HTTP_READ_TIMEOUT,
+                        write=HTTP_WRITE_TIMEOUT,
+                        pool=HTTP_POOL_TIMEOUT,
+                    ),
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                    http2=http2,
                     headers=DEFAULT_HEADERS,
                     base_url=API_BASE_URL,
+                    transport=self._transport,
+                )
+                logger.info(
+                    f"HTTP client initialized with base URL: {API_BASE_URL} "
+                    f"({'HTTP/2' if http2 else 'HTTP/1.1'}, {HTTP_MAX_CONNECTIONS} connections)"
                 )
-                logger.info(f"HTTP client initialized with base URL: {API_BASE_URL}")
             except Exception as e:
                 logger.error(f"Failed to initialize HTTP client: {e}")
                 raise APIConnectionError(f"Failed to initialize HTTP client: {e}")
         return self._client
 
+    async def use_transport(self, transport: httpx.AsyncBaseTransport | None) -> None:
+        """Route requests through a custom transport (e.g. an in-process fake backend)"""
+        await self.close()
+        self._transport = transport
+        self.cache.clear()
+        self.breaker = CircuitBreaker() if CIRCUIT_BREAKER_ENABLED else None
+
     async def close(self) -> None:
         """Close the HTTP client"""
         if self._client is not None:
@@ -47,13 +106,57 @@ class APIClient:
             self._client = None
             logger.info("HTTP client closed")
 
-    async def get(self, endpoint: str, **kwargs) -> dict:
-        """Make GET request to API"""
+    async def get(self, endpoint: str, cache: bool = True, **kwargs) -> dict:
+        """Make GET request to API, served from the response cache when possible"""
+        if cache and CACHE_ENABLED and set(kwargs) <= {"params"}:
+            key = self.cache.make_key(endpoint, kwargs.get("params"))
+            return await self.cache.get_or_fetch(key, lambda: self._get(endpoint, **kwargs))
+        return await self._get(endpoint, **kwargs)
+
+    async def get_many(
+        self, endpoints: list[str], max_concurrency: int = FANOUT_MAX_CONCURRENCY
+    ) -> list[dict | Exception]:
+        """GET several endpoints concurrently on the shared client
+
+        Results come back in input order; a failed request yields its exception
+        instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(endpoint: str) -> dict | Exception:
+            async with semaphore:
+                try:
+                    return await self.get(endpoint)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(fetch(endpoint) for endpoint in endpoints))
+
+    def cache_stats(self) -> dict:
+        """Hit/miss/eviction counters of the response cache"""
+        return self.cache.stats()
+
+    def circuit_stats(self) -> dict:
+        """Circuit breaker state and counters"""
+        if self.breaker is None:
+            return {"state": "disabled"}
+        return self.breaker.stats()
+
+    async def get_bytes(self, endpoint: str, **kwargs) -> bytes:
+        """Uncached GET returning the undecoded response body (empty for 204)"""
+        response = await self._send("GET", endpoint, **kwargs)
+        response.raise_for_status()
+        return b"" if response.status_code == 204 else response.content
+
+    async def _get(self, endpoint: str, **kwargs) -> dict:
+        """Make uncached GET request to API"""
         try:
-            client = await self.get_client()
-            response = await client.get(endpoint, **kwargs)
+            response = await self._send("GET", endpoint, **kwargs)
             response.raise_for_status()
-            return response.json()
+            # The backend answers empty list queries with 204 No Content
+            if response.status_code == 204:
+                return []
+            return self._decode(response)
         except httpx.HTTPStatusError as e:
             logger.error(f"GET {endpoint} failed with status {e.response.status_code}: {e.response.text}")
             raise
@@ -61,13 +164,141 @@ class APIClient:
             logger.error(f"GET {endpoint} failed: {e}")
             raise
 
-    async def post(self, endpoint: str, json_data: dict, **kwargs) -> dict:
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Issue a request through the circuit breaker, retrying idempotent GETs
+
+        Connection errors, timeouts and RETRY_STATUS_CODES responses to a GET are
+        retried with exponential backoff and full jitter. The final response is
+        returned as is; callers decide how to treat its status.
+        """
+        client = await self.get_client()
+        route = route_label(endpoint)
+        attempts = max(RETRY_MAX_ATTEMPTS, 1) if method == "GET" else 1
+        for attempt in range(1, attempts + 1):
+            if self.breaker is not None:
+                self.breaker.before_request()
+            retry_after = None
+            try:
+                response = await self._send_once(client, method, endpoint, route, **kwargs)
+            except httpx.TransportError as e:
+                self._record_outcome(success=False)
+                if attempt == attempts:
+                    raise
+                reason = type(e).__name__
+            except BaseException:
+                # Cancelled or failed outside the transport: no verdict on backend health
+                if self.breaker is not None:
+                    self.breaker.release_probe()
+                raise
+            else:
+                self._record_outcome(success=response.status_code < 500)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == attempts:
+                    return response
+                reason = f"status {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+
+            delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), RETRY_BACKOFF_MAX))
+            metrics.increment("backend_retries_total", method=method, route=route)
+            logger.warning(f"{method} {endpoint} failed ({reason}), retry {attempt}/{attempts - 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _record_outcome(self, success: bool) -> None:
+        if self.breaker is None:
+            return
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    async def _send_once(
+        self, client: httpx.AsyncClient, method: str, endpoint: str, route: str, **kwargs
+    ) -> httpx.Response:
+        """Issue one request, recording latency, status and body size"""
+        started = time.perf_counter()
+        status = "error"
+        try:
+            with metrics.phase("backend"):
+                response = await client.request(method, endpoint, **kwargs)
+            status = str(response.status_code)
+            metrics.observe_bytes("backend_response_bytes", len(response.content), method=method, route=route)
+            return response
+        finally:
+            metrics.observe("backend_request_seconds", time.perf_counter() - started, method=method, route=route)
+            metrics.increment("backend_requests_total", method=method, route=route, status=status)
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> dict:
+        with metrics.phase("decode"):
+            return response.json()
+
+    async def iter_pages(
+        self,
+        endpoint: str = "/paged",
+        params: dict | None = None,
+        page_size: int = STREAM_PAGE_SIZE,
+        max_in_flight: int = STREAM_MAX_IN_FLIGHT,
+        raw: bool = False,
+    ) -> AsyncIterator[list[dict] | bytes]:
+        """Walk a Spring paged endpoint, yielding each page's content in order
+
+        The first page is fetched alone to learn the page count; after that at
+        most `max_in_flight` page requests are outstanding at any time, so
+        peak memory stays around `max_in_flight` pages regardless of table size.
+        With `raw`, whole response bodies are yielded undecoded so the caller
+        can decode them off the event loop.
+        """
+        base_params = {"sortBy": "id", "sortDirection": "asc", **(params or {})}
+
+        def page_params(page: int) -> dict:
+            return {**base_params, "page": page, "size": page_size}
+
+        async def fetch(page: int) -> list[dict] | bytes:
+            if raw:
+                return await self.get_bytes(endpoint, params=page_params(page))
+            return (await self.get(endpoint, cache=False, params=page_params(page))).get("content") or []
+
+        if raw:
+            content = await fetch(0)
+            with metrics.phase("decode"):
+                total_pages = self._total_pages(json.loads(content)) if content else 0
+        else:
+            first = await self.get(endpoint, cache=False, params=page_params(0))
+            total_pages = self._total_pages(first)
+            content = first.get("content") or []
+            del first
+        if content:
+            yield content
+
+        pending: deque[asyncio.Task] = deque()
+        next_page = 1
+        try:
+            while next_page < total_pages or pending:
+                while next_page < total_pages and len(pending) < max_in_flight:
+                    pending.append(asyncio.create_task(fetch(next_page)))
+                    next_page += 1
+                content = await pending.popleft()
+                if content:
+                    yield content
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _total_pages(page: dict) -> int:
+        """Page count from either the legacy PageImpl or the PagedModel JSON layout"""
+        if "totalPages" in page:
+            return int(page["totalPages"])
+        return int((page.get("page") or {}).get("totalPages", 1))
+
+    async def post(self, endpoint: str, json_data: dict | list, **kwargs) -> dict:
         """Make POST request to API"""
         try:
-            client = await self.get_client()
-            response = await client.post(endpoint, json=json_data, **kwargs)
+            response = await self._send("POST", endpoint, json=json_data, **kwargs)
             response.raise_for_status()
-            return response.json()
+            self.cache.invalidate()
+            return self._decode(response)
         except httpx.HTTPStatusError as e:
             logger.error(f"POST {endpoint} failed with status {e.response.status_code}: {e.response.text}")
             raise
@@ -75,13 +306,17 @@ class APIClient:
             logger.error(f"POST {endpoint} failed: {e}")
             raise
 
+    async def post_batch(self, towers: list[dict], **kwargs) -> list[dict]:
+        """Create many towers in one request through the /batch endpoint"""
+        return await self.post("/batch", json_data=towers, **kwargs)
+
     async def patch(self, endpoint: str, json_data: dict, **kwargs) -> dict:
         """Make PATCH request to API"""
         try:
-            client = await self.get_client()
-            response = await client.patch(endpoint, json=json_data, **kwargs)
+            response = await self._send("PATCH", endpoint, json=json_data, **kwargs)
             response.raise_for_status()
-            return response.json()
+            self.cache.invalidate(endpoint)
+            return self._decode(response)
         except httpx.HTTPStatusError as e:
             logger.error(f"PATCH {endpoint} failed with status {e.response.status_code}: {e.response.text}")
             raise
@@ -92,9 +327,9 @@ class APIClient:
     async def delete(self, endpoint: str, **kwargs) -> None:
         """Make DELETE request to API"""
         try:
-            client = await self.get_client()
-            response = await client.delete(endpoint, **kwargs)
+            response = await self._send("DELETE", endpoint, **kwargs)
             response.raise_for_status()
+            self.cache.invalidate(endpoint)
         except httpx.HTTPStatusError as e:
             logger.error(f"DELETE {endpoint} failed with status {e.response.status_code}: {e.response.text}")
             raise
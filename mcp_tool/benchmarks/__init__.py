@@ -0,0 +1,4 @@
+"""
+Benchmarks for Cell Tower Signal Intelligence MCP Server
+Latency, throughput and memory measurements against an in-process fake backend
+"""
@@ -0,0 +1,354 @@
+"""
+In-process stand-in for the Spring /api/cell-towers API
+Seeded from backend/src/main/resources/655.csv and served through httpx.MockTransport
+"""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import numpy as np
+
+from bulk_ingest import CSV_COLUMNS
+from tower_model import INT_NULL, RADIO_NULL
+from tower_schema import FIELD_ORDER
+from tower_snapshot import TowerSnapshot
+
+DEFAULT_CSV = Path(__file__).resolve().parents[2] / "backend" / "src" / "main" / "resources" / "655.csv"
+BASE_PATH = "/api/cell-towers"
+
+
+def load_csv_columns(path: Path = DEFAULT_CSV) -> dict[str, np.ndarray]:
+    """Read an OpenCelliD CSV straight into snapshot-style columns"""
+    raw = np.genfromtxt(path, delimiter=",", dtype=None, encoding="utf-8", names=list(CSV_COLUMNS))
+    columns: dict[str, np.ndarray] = {
+        "id": np.arange(1, len(raw) + 1, dtype=np.int64),
+        "radio": raw["radio"].astype(object),
+    }
+    for field in ("mcc", "net", "area", "cell", "unit", "range", "samples", "changeable", "averageSignal"):
+        columns[field] = raw[field].astype(np.int64)
+    for field in ("lon", "lat"):
+        columns[field] = raw[field].astype(np.float64)
+    for field in ("created", "updated"):
+        columns[field] = raw[field].astype("datetime64[s]")
+    return columns
+
+
+def synthesize(columns: dict[str, np.ndarray], size: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """Resize a seed dataset to `size` rows by tiling it with jittered positions and ids"""
+    rng = np.random.default_rng(seed)
+    n = len(columns["id"])
+    source = np.resize(np.arange(n), size)
+    out = {field: column[source] for field, column in columns.items()}
+    out["id"] = np.arange(1, size + 1, dtype=np.int64)
+    copies = np.arange(size) // n
+    # Later copies get distinct cell ids and positions nudged by up to ~2 km
+    out["cell"] = out["cell"] + copies * 1_000_000
+    out["lon"] = out["lon"] + np.where(copies > 0, rng.uniform(-0.02, 0.02, size), 0.0)
+    out["lat"] = out["lat"] + np.where(copies > 0, rng.uniform(-0.02, 0.02, size), 0.0)
+    return out
+
+
+class FakeBackend:
+    """Column-backed fake of CellTowerController with the same routes and status codes
+
+    Reads are answered with vectorized masks over the seed columns; writes go to
+    a small overlay of created, updated and deleted rows. Writes are stamped
+    with a server time and deletes leave tombstones, which /changes serves;
+    `change_feed=False` answers /changes with 400 like an older backend.
+    """
+
+    def __init__(self, size: int | None = None, latency_ms: float = 0.0, seed: int = 0, change_feed: bool = True):
+        columns = load_csv_columns()
+        if size is not None and size != len(columns["id"]):
+            columns = synthesize(columns, size, seed)
+        self.store = TowerSnapshot()
+        self.store.load_columns(columns)
+        self.latency = latency_ms / 1000.0
+        self.overlay: dict[int, dict[str, Any] | None] = {}
+        self.next_id = int(columns["id"].max()) + 1 if len(columns["id"]) else 1
+        self.requests = 0
+        self.change_feed = change_feed
+        self.modified: dict[int, np.datetime64] = {}
+        self.deletions: list[tuple[np.datetime64, int]] = []
+        self._clock = np.datetime64("now", "us")
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        path = request.url.path
+        if not path.startswith(BASE_PATH):
+            return httpx.Response(404)
+        path = path[len(BASE_PATH):].rstrip("/")
+        params = request.url.params
+        try:
+            if request.method == "GET":
+                return self._get(path, params)
+            if request.method == "POST":
+                return self._post(path, json.loads(request.content))
+            if request.method == "PATCH" and re.fullmatch(r"/\d+", path):
+                return self._patch(int(path[1:]), json.loads(request.content))
+            if request.method == "DELETE" and re.fullmatch(r"/\d+", path):
+                return self._delete(int(path[1:]))
+        except (KeyError, ValueError):
+            return httpx.Response(500)
+        return httpx.Response(404)
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    def _get(self, path: str, params: httpx.QueryParams) -> httpx.Response:
+        store = self.store
+        if path == "":
+            return self._list(np.ones(len(store), dtype=bool), lambda t: True)
+        if path == "/paged":
+            return self._paged(params)
+        if match := re.fullmatch(r"/(\d+)", path):
+            row = self._by_id(int(match[1]))
+            return httpx.Response(200, json=row) if row else httpx.Response(404)
+        if match := re.fullmatch(r"/cell/(-?\d+)", path):
+            cell = int(match[1])
+            rows = self._rows(store.columns["cell"] == cell, lambda t: t["cell"] == cell)
+            return httpx.Response(200, json=rows) if rows else httpx.Response(404)
+        if match := re.fullmatch(r"/radio/([^/]+)", path):
+            radio = match[1]
+            return self._list(store.mask_radio(radio), lambda t: t["radio"] == radio)
+        if match := re.fullmatch(r"/mcc/(-?\d+)", path):
+            mcc = int(match[1])
+            return self._list(store.mask_mcc(mcc), lambda t: t["mcc"] == mcc)
+        if path == "/location":
+            box = [float(params[key]) for key in ("minLon", "maxLon", "minLat", "maxLat")]
+            return self._list(
+                store.mask_bbox(*box),
+                lambda t: box[0] <= t["lon"] <= box[1] and box[2] <= t["lat"] <= box[3],
+            )
+        if path == "/signal":
+            low, high = int(params["minSignal"]), int(params["maxSignal"])
+            return self._list(
+                store.mask_signal(low, high),
+                lambda t: t["averageSignal"] is not None and low <= t["averageSignal"] <= high,
+            )
+        if path == "/stats":
+            return self._stats(params)
+        if path == "/changes":
+            return self._changes(params) if self.change_feed else httpx.Response(400)
+        if match := re.fullmatch(r"/samples/(-?\d+)", path):
+            minimum = int(match[1])
+            return self._list(
+                store.mask_min_samples(minimum),
+                lambda t: t["samples"] is not None and t["samples"] > minimum,
+            )
+        return httpx.Response(404)
+
+    def _paged(self, params: httpx.QueryParams) -> httpx.Response:
+        page = int(params.get("page", 0))
+        size = int(params.get("size", 20))
+        sort_by = params.get("sortBy", "id")
+        descending = params.get("sortDirection", "asc").lower() == "desc"
+        if sort_by not in FIELD_ORDER:
+            return httpx.Response(500)
+
+        mask = self._seed_mask(np.ones(len(self.store), dtype=bool))
+        indices = np.flatnonzero(mask)
+        if sort_by != "id":
+            indices = indices[np.argsort(self.store.columns[sort_by][indices], kind="stable")]
+        extra = self._overlay_rows(lambda t: True)
+        total = len(indices) + len(extra)
+        if descending:
+            indices = indices[::-1]
+        start, stop = page * size, (page + 1) * size
+        content = self.store.rows(indices[start:stop])
+        if stop > len(indices):
+            content += extra[max(start - len(indices), 0):stop - len(indices)]
+        total_pages = (total + size - 1) // size if size else 0
+        return httpx.Response(200, json={
+            "content": content,
+            "totalElements": total,
+            "totalPages": total_pages,
+            "number": page,
+            "size": size,
+            "numberOfElements": len(content),
+            "first": page == 0,
+            "last": page >= total_pages - 1,
+            "empty": not content,
+        })
+
+    def _stats(self, params: httpx.QueryParams) -> httpx.Response:
+        """GROUP BY radio, net, area or signal, mirroring CellTowerRepository.aggregateBy*"""
+        group_by = params.get("groupBy", "radio").lower()
+        if group_by not in ("radio", "net", "area", "signal"):
+            return httpx.Response(400)
+        radio = params.get("radio")
+        box = [float(params[key]) for key in ("minLon", "maxLon", "minLat", "maxLat")] if "minLon" in params else None
+
+        store = self.store
+        mask = np.ones(len(store), dtype=bool)
+        if radio is not None:
+            mask &= store.mask_radio(radio)
+        if box is not None:
+            mask &= store.mask_bbox(*box)
+        mask = self._seed_mask(mask)
+
+        def zero_nulls(field: str) -> np.ndarray:
+            values = store.columns[field][mask]
+            return np.where(values == INT_NULL, 0, values)
+
+        signal, samples = zero_nulls("averageSignal"), zero_nulls("samples")
+        if group_by == "radio":
+            names = [name if name != RADIO_NULL else None for name in store.radio_names]
+            keys = np.array(names, dtype=object)[store.columns["radio"][mask]]
+        elif group_by == "signal":
+            keys = signal
+        else:
+            keys = store.columns[group_by][mask]
+
+        # (count, signal values, sample values) per group key
+        groups: dict[Any, tuple[int, list[float], list[float]]] = {}
+        if len(keys):
+            unique, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+            for key, members in zip(unique, np.split(order, bounds)):
+                key = None if key == INT_NULL else (key.item() if hasattr(key, "item") else key)
+                groups[key] = (len(members), signal[members].tolist(), samples[members].tolist())
+
+        def in_filter(tower: dict) -> bool:
+            if radio is not None and tower.get("radio") != radio:
+                return False
+            return box is None or (box[0] <= tower["lon"] <= box[1] and box[2] <= tower["lat"] <= box[3])
+
+        for tower in self._overlay_rows(in_filter):
+            tower_signal, tower_samples = tower.get("averageSignal") or 0, tower.get("samples") or 0
+            key = tower_signal if group_by == "signal" else tower.get(group_by)
+            count, signals, sample_values = groups.get(key, (0, [], []))
+            groups[key] = (count + 1, signals + [tower_signal], sample_values + [tower_samples])
+
+        rows = [
+            {
+                "groupKey": key,
+                "towerCount": count,
+                "signalSum": int(sum(signals)),
+                "signalSumSquares": float(sum(value * value for value in signals)),
+                "signalMin": int(min(signals)),
+                "signalMax": int(max(signals)),
+                "samplesSum": int(sum(sample_values)),
+                "samplesSumSquares": float(sum(value * value for value in sample_values)),
+                "samplesMin": int(min(sample_values)),
+                "samplesMax": int(max(sample_values)),
+            }
+            for key, (count, signals, sample_values) in groups.items()
+        ]
+        if not rows:
+            return httpx.Response(204)
+        return httpx.Response(200, json=rows)
+
+    def _changes(self, params: httpx.QueryParams) -> httpx.Response:
+        """Keyset page of rows written after (since, afterId), mirroring CellTowerServiceImpl.getChangesSince"""
+        server_time = self._now()
+        size = int(params.get("size", 1000))
+        if size < 1:
+            return httpx.Response(400)
+        if "since" not in params:
+            return httpx.Response(200, json=self._change_page([], [], False, str(server_time), 0, False, server_time))
+
+        since = np.datetime64(params["since"], "us")
+        after_id = int(params.get("afterId", 0))
+        written = sorted(
+            (stamp, tower_id) for tower_id, stamp in self.modified.items()
+            if self.overlay.get(tower_id) is not None and (stamp > since or (stamp == since and tower_id > after_id))
+        )
+        has_more = len(written) > size
+        written = written[:size]
+        deleted = [] if "afterId" in params else [tower_id for stamp, tower_id in self.deletions if stamp > since]
+        next_since, next_id = (str(written[-1][0]), written[-1][1]) if written else (params["since"], after_id)
+        towers = [dict(self.overlay[tower_id]) for _, tower_id in written]
+        return httpx.Response(200, json=self._change_page(towers, deleted, False, next_since, next_id, has_more, server_time))
+
+    @staticmethod
+    def _change_page(towers, deleted, reset, next_since, next_id, has_more, server_time) -> dict[str, Any]:
+        return {
+            "towers": towers,
+            "deletedIds": deleted,
+            "reset": reset,
+            "nextSince": next_since,
+            "nextAfterId": next_id,
+            "hasMore": has_more,
+            "serverTime": str(server_time),
+        }
+
+    def _post(self, path: str, body: Any) -> httpx.Response:
+        if path == "":
+            return httpx.Response(201, json=self._insert(body))
+        if path == "/batch":
+            return httpx.Response(201, json=[self._insert(tower) for tower in body])
+        return httpx.Response(404)
+
+    def _patch(self, tower_id: int, updates: dict) -> httpx.Response:
+        row = self._by_id(tower_id)
+        if row is None:
+            return httpx.Response(404)
+        # Mirrors partialUpdateCellTower: only non-null known fields are applied
+        row.update({
+            key: value for key, value in updates.items()
+            if key in FIELD_ORDER and key != "id" and value is not None
+        })
+        self.overlay[tower_id] = row
+        self.modified[tower_id] = self._now()
+        return httpx.Response(200, json=row)
+
+    def _delete(self, tower_id: int) -> httpx.Response:
+        if self._by_id(tower_id) is None:
+            return httpx.Response(404)
+        self.overlay[tower_id] = None
+        self.deletions.append((self._now(), tower_id))
+        return httpx.Response(204)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _insert(self, body: dict) -> dict[str, Any]:
+        row = {field: body.get(field) for field in FIELD_ORDER}
+        row["id"] = self.next_id
+        self.next_id += 1
+        self.overlay[row["id"]] = row
+        self.modified[row["id"]] = self._now()
+        return row
+
+    def _now(self) -> np.datetime64:
+        """Strictly increasing server time, so every write gets its own stamp"""
+        self._clock = max(np.datetime64("now", "us"), self._clock + np.timedelta64(1, "us"))
+        return self._clock
+
+    def _by_id(self, tower_id: int) -> dict[str, Any] | None:
+        if tower_id in self.overlay:
+            row = self.overlay[tower_id]
+            return dict(row) if row is not None else None
+        return self.store.find_by_id(tower_id)
+
+    def _seed_mask(self, mask: np.ndarray) -> np.ndarray:
+        """Hide seed rows that the overlay has replaced or deleted"""
+        if self.overlay:
+            mask = mask & ~np.isin(self.store.columns["id"], list(self.overlay))
+        return mask
+
+    def _overlay_rows(self, predicate: Callable[[dict], bool]) -> list[dict[str, Any]]:
+        return [dict(row) for _, row in sorted(self.overlay.items()) if row is not None and predicate(row)]
+
+    def _rows(self, mask: np.ndarray, predicate: Callable[[dict], bool]) -> list[dict[str, Any]]:
+        return self.store.select(self._seed_mask(mask)) + self._overlay_rows(predicate)
+
+    def _list(self, mask: np.ndarray, predicate: Callable[[dict], bool]) -> httpx.Response:
+        rows = self._rows(mask, predicate)
+        if not rows:
+            return httpx.Response(204)
+        return httpx.Response(200, json=rows)
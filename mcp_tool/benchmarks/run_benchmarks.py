@@ -0,0 +1,259 @@
+"""
+Benchmark harness for Cell Tower Signal Intelligence MCP Server
+Drives ToolHandler.handle_tool against the in-process fake backend
+
+Run from the mcp_tool directory:
+    python -m benchmarks.run_benchmarks --sizes 1000,43757 --concurrency 1,8
+    python -m benchmarks.run_benchmarks --save-baseline local
+    python -m benchmarks.run_benchmarks --compare local
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from api_client import APIClient
+from benchmarks.fake_backend import FakeBackend
+from tool_handler import ToolHandler
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Devices for locate_from_cells, each hearing the first rows of the seed dataset at varying strength
+LOCATE_DEVICES: list[dict[str, Any]] = [
+    {
+        "id": f"device-{i}",
+        "cells": [
+            {"radio": "GSM", "mcc": 655, "net": 1, "area": area, "cell": cell, "signal": -60 - (i + k * 7) % 40}
+            for k, (area, cell) in enumerate(((149, 13441), (720, 58722), (720, 58721), (720, 52263)))
+        ],
+    }
+    for i in range(500)
+]
+
+# (tool name, arguments) exercised per iteration; writes land in the fake's overlay
+SCENARIOS: list[tuple[str, dict[str, Any]]] = [
+    ("get_towers_paged", {"page": 3, "size": 50}),
+    ("get_tower_by_id", {"id": 42}),
+    ("get_towers_by_ids", {"ids": list(range(100, 300, 2))}),
+    ("get_towers_by_cell_identity", {"cells": [{"cell": 13441}, {"cell": 58722}]}),
+    ("get_towers_by_radio", {"radio": "LTE"}),
+    ("get_towers_by_mcc", {"mcc": 655, "format": "summary"}),
+    ("get_towers_by_location", {"min_lon": 27.9, "max_lon": 28.2, "min_lat": -26.3, "max_lat": -26.0}),
+    ("get_nearest_towers", {"lon": 28.04, "lat": -26.2, "limit": 25}),
+    ("get_towers_within_radius", {"lon": 18.42, "lat": -33.92, "radius_m": 3000}),
+    ("get_towers_by_signal_range", {"min_signal": -100, "max_signal": -60}),
+    ("get_towers_by_min_samples", {"min_samples": 100}),
+    ("fetch_result_page", {"offset": 100, "limit": 1000, "format": "compact"}),
+    ("query_towers", {
+        "where": [{"field": "radio", "op": "eq", "value": "LTE"}, {"field": "samples", "op": "gte", "value": 10}],
+        "bbox": {"min_lon": 27.9, "max_lon": 28.2, "min_lat": -26.3, "max_lat": -26.0},
+        "sort_by": "samples",
+        "sort_direction": "desc",
+        "limit": 50,
+    }),
+    ("locate_from_cells", {"devices": LOCATE_DEVICES, "format": "compact"}),
+    ("coverage_timeseries", {"radio": "LTE", "granularity": "month"}),
+    ("coverage_timeseries", {"time_field": "updated", "min_lon": 27.9, "max_lon": 28.2, "min_lat": -26.3, "max_lat": -26.0}),
+    ("find_duplicate_towers", {"match_radio": False}),
+    ("find_conflicting_towers", {"match_radio": False, "min_distance_m": 1000}),
+    ("get_tower_neighbors", {"id": 42}),
+    ("interference_clusters", {}),
+    ("interference_clusters", {"radio": "LTE", "min_size": 5}),
+    ("analyze_coverage", {"radio": "UMTS"}),
+    ("analyze_coverage", {"min_lon": 18.0, "max_lon": 19.0, "min_lat": -34.5, "max_lat": -33.5}),
+    ("analyze_coverage", {}),
+    ("coverage_grid", {"resolution": 0.05, "format": "compact"}),
+    ("coverage_grid", {"grid": "geohash", "precision": 5, "min_lon": 27.5, "max_lon": 28.6, "min_lat": -26.6, "max_lat": -25.6}),
+    ("find_coverage_gaps", {"resolution": 0.01}),
+    ("find_coverage_overlap", {"resolution": 0.01, "min_towers": 3}),
+    ("get_all_towers", {"stream": True, "page_size": 5000}),
+    ("create_tower", {"radio": "LTE", "mcc": 655, "net": 7, "area": 1, "cell": 1, "lon": 28.0, "lat": -26.0}),
+    ("update_tower", {"id": 42, "updates": {"samples": 5}}),
+    ("bulk_create_towers", {"csv": "LTE,655,7,1,2,0,28.0,-26.0,100,1,1,1459761501,1751694138,0\n" * 50}),
+    ("bulk_create_towers", {
+        "csv": "LTE,655,7,1,2,0,28.0,-26.0,100,1,1,1459761501,1751694138,0\n" * 50,
+        "check_duplicates": True,
+    }),
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    values = np.array(latencies) * 1000
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def open_result_handle(handler: ToolHandler) -> str | None:
+    """Handle of a stored get_all_towers result for the fetch_result_page scenario"""
+    result = await handler.handle_tool("get_all_towers", {"format": "compact"})
+    return json.loads(result[0].text)["handle"] if len(result) > 1 else None
+
+
+async def run_scenario(
+    handler: ToolHandler,
+    name: str,
+    args: dict[str, Any],
+    concurrency: int,
+    iterations: int,
+    use_cache: bool,
+) -> dict[str, Any]:
+    """Run `iterations` calls per worker across `concurrency` workers"""
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in range(iterations):
+            if not use_cache:
+                handler.api_client.cache.clear()
+            started = time.perf_counter()
+            result = await handler.handle_tool(name, dict(args))
+            latencies.append(time.perf_counter() - started)
+            if result and result[0].text.startswith("Error:"):
+                errors += 1
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "tool": name,
+        "args": {key: value for key, value in args.items() if key not in ("ids", "csv", "devices", "handle")},
+        **summarize(latencies, elapsed),
+        "errors": errors,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+async def run(
+    sizes: list[int | None],
+    concurrency_levels: list[int],
+    iterations: int,
+    tools: set[str] | None,
+    latency_ms: float,
+    use_cache: bool,
+) -> dict[str, Any]:
+    api_client = APIClient()
+    results = []
+    for size in sizes:
+        backend = FakeBackend(size=size, latency_ms=latency_ms)
+        await api_client.use_transport(backend.transport)
+        handler = ToolHandler()
+        dataset_size = len(backend.store)
+        for concurrency in concurrency_levels:
+            for name, args in SCENARIOS:
+                if tools and name not in tools:
+                    continue
+                if name == "fetch_result_page":
+                    args = {**args, "handle": await open_result_handle(handler)}
+                result = await run_scenario(handler, name, args, concurrency, iterations, use_cache)
+                result.update({"dataset_size": dataset_size, "concurrency": concurrency})
+                results.append(result)
+                print(
+                    f"{dataset_size:>9} c={concurrency:<3} {name:<28} "
+                    f"p50={result['p50_ms']:>9.2f}ms p95={result['p95_ms']:>9.2f}ms "
+                    f"p99={result['p99_ms']:>9.2f}ms {result['throughput_per_s']:>8.1f}/s "
+                    f"rss={result['peak_rss_mb']:.0f}MB",
+                    file=sys.stderr,
+                )
+        await api_client.close()
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": iterations,
+        "backend_latency_ms": latency_ms,
+        "cache": use_cache,
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Scenarios whose p95 latency grew by more than `threshold` times the baseline"""
+    def key(result: dict) -> tuple:
+        return result["tool"], json.dumps(result["args"], sort_keys=True), result["dataset_size"], result["concurrency"]
+
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(key(result))
+        if old and old["p95_ms"] > 0 and result["p95_ms"] > old["p95_ms"] * threshold:
+            regressions.append(
+                f"{result['tool']} n={result['dataset_size']} c={result['concurrency']}: "
+                f"p95 {old['p95_ms']:.2f}ms -> {result['p95_ms']:.2f}ms"
+            )
+    return regressions
+
+
+def parse_sizes(value: str) -> list[int | None]:
+    """Comma-separated dataset sizes; 'csv' keeps the seed file as is"""
+    return [None if part == "csv" else int(float(part)) for part in value.split(",")]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=parse_sizes, default=[None], help="Dataset sizes, e.g. 1000,csv,1e6")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated concurrent workers")
+    parser.add_argument("--iterations", type=int, default=10, help="Calls per worker per scenario")
+    parser.add_argument("--tools", help="Comma-separated subset of tools to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated backend latency")
+    parser.add_argument("--no-cache", action="store_true", help="Clear the response cache before each call")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Write results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Fail if p95 regresses against baselines/NAME.json")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed p95 ratio when comparing")
+    parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    report = asyncio.run(run(
+        sizes=options.sizes,
+        concurrency_levels=[int(part) for part in options.concurrency.split(",")],
+        iterations=options.iterations,
+        tools=set(options.tools.split(",")) if options.tools else None,
+        latency_ms=options.latency_ms,
+        use_cache=not options.no_cache,
+    ))
+
+    if options.output:
+        options.output.write_text(json.dumps(report, indent=2))
+    if options.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{options.save_baseline}.json"
+        path.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {path}", file=sys.stderr)
+    if options.compare:
+        baseline = json.loads((BASELINE_DIR / f"{options.compare}.json").read_text())
+        regressions = compare(report, baseline, options.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
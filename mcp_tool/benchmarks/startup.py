@@ -0,0 +1,163 @@
+"""
+Cold-start benchmark for Cell Tower Signal Intelligence MCP Server
+Spawns `main.py` over stdio like an MCP client and times the first responses
+
+Run from the mcp_tool directory:
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 10 --no-prewarm --budget-ms 150
+
+Each run measures, from process spawn, the `initialize` response, the first
+`tools/list` response and the first `tools/call` (get_server_metrics, which
+needs no backend). The floor is a bare interpreter importing the MCP SDK
+modules the server cannot do without; the budget applies to the server's own
+overhead on top of it, since the SDK import cost depends on the machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+PROTOCOL_VERSION = "2025-06-18"
+FLOOR_IMPORTS = "import mcp.server.stdio, mcp.server.models"
+
+
+def request(stdin: IO[bytes], stdout: IO[bytes], message_id: int, method: str, params: dict | None = None) -> dict:
+    """Send one JSON-RPC request and read lines until its response arrives"""
+    message: dict[str, Any] = {"jsonrpc": "2.0", "id": message_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    stdin.write(json.dumps(message).encode() + b"\n")
+    stdin.flush()
+    while True:
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError(f"Server exited before answering {method}")
+        response = json.loads(line)
+        if response.get("id") == message_id:
+            if "error" in response:
+                raise RuntimeError(f"{method} failed: {response['error']}")
+            return response["result"]
+
+
+def notify(stdin: IO[bytes], method: str) -> None:
+    stdin.write(json.dumps({"jsonrpc": "2.0", "method": method}).encode() + b"\n")
+    stdin.flush()
+
+
+def measure_server(env: dict[str, str]) -> dict[str, float]:
+    """Milliseconds from spawn to the initialize, tools/list and first tools/call responses"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=SERVER_DIR,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        request(process.stdin, process.stdout, 1, "initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+        })
+        initialize_ms = (time.perf_counter() - started) * 1000
+        notify(process.stdin, "notifications/initialized")
+        tools = request(process.stdin, process.stdout, 2, "tools/list")["tools"]
+        list_tools_ms = (time.perf_counter() - started) * 1000
+        request(process.stdin, process.stdout, 3, "tools/call", {
+            "name": "get_server_metrics",
+            "arguments": {"format": "compact"},
+        })
+        first_call_ms = (time.perf_counter() - started) * 1000
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {
+        "initialize_ms": initialize_ms,
+        "list_tools_ms": list_tools_ms,
+        "first_call_ms": first_call_ms,
+        "tools": len(tools),
+    }
+
+
+def measure_floor(env: dict[str, str]) -> float:
+    """Milliseconds for an interpreter to start and import the MCP SDK server modules"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", f"{FLOOR_IMPORTS}; print(flush=True)"],
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+    )
+    process.stdout.readline()
+    elapsed = (time.perf_counter() - started) * 1000
+    process.wait()
+    return elapsed
+
+
+def run(runs: int, prewarm: bool) -> dict[str, Any]:
+    env = {**os.environ, "SERVER_PREWARM": "true" if prewarm else "false"}
+    # One untimed run compiles bytecode so every timed run starts the same way
+    measure_server(env)
+    samples = []
+    for i in range(runs):
+        sample = measure_server(env)
+        sample["floor_ms"] = measure_floor(env)
+        samples.append(sample)
+        print(
+            f"run {i + 1:>2}: initialize={sample['initialize_ms']:7.1f}ms "
+            f"list_tools={sample['list_tools_ms']:7.1f}ms first_call={sample['first_call_ms']:7.1f}ms "
+            f"floor={sample['floor_ms']:7.1f}ms",
+            file=sys.stderr,
+        )
+
+    def median(key: str) -> float:
+        return round(statistics.median(sample[key] for sample in samples), 1)
+
+    summary = {key: median(key) for key in ("initialize_ms", "list_tools_ms", "first_call_ms", "floor_ms")}
+    summary["overhead_ms"] = round(statistics.median(
+        sample["list_tools_ms"] - sample["floor_ms"] for sample in samples
+    ), 1)
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "runs": runs,
+        "prewarm": prewarm,
+        "tools": samples[0]["tools"],
+        **summary,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Timed server starts")
+    parser.add_argument("--no-prewarm", action="store_true", help="Start the server with SERVER_PREWARM=false")
+    parser.add_argument("--budget-ms", type=float, help="Fail if median overhead over the SDK floor exceeds this")
+    parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+    options = parser.parse_args()
+
+    report = run(options.runs, prewarm=not options.no_prewarm)
+    print(json.dumps(report, indent=2))
+    if options.output:
+        options.output.write_text(json.dumps(report, indent=2))
+    if options.budget_ms is not None and report["overhead_ms"] > options.budget_ms:
+        print(f"OVER BUDGET: {report['overhead_ms']}ms overhead > {options.budget_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
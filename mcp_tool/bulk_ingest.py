@@ -0,0 +1,213 @@
+"""
+Bulk tower ingestion for Cell Tower Signal Intelligence MCP Server
+Parses, validates and uploads large tower sets through the backend /batch endpoint
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import numpy as np
+
+from api_client import APIClient
+from config import BULK_BATCH_SIZE, BULK_MAX_CONCURRENT_BATCHES, BULK_MAX_REPORTED_FAILURES
+
+logger = logging.getLogger(__name__)
+
+# Column layout of OpenCelliD exports such as backend/src/main/resources/655.csv
+CSV_COLUMNS: tuple[str, ...] = (
+    "radio", "mcc", "net", "area", "cell", "unit", "lon", "lat",
+    "range", "samples", "changeable", "created", "updated", "averageSignal",
+)
+REQUIRED_FIELDS: tuple[str, ...] = ("radio", "mcc", "net", "area", "cell", "lon", "lat")
+INTEGER_FIELDS: tuple[str, ...] = (
+    "mcc", "net", "area", "cell", "unit", "range", "samples", "changeable", "averageSignal",
+)
+TIMESTAMP_FIELDS: tuple[str, ...] = ("created", "updated")
+RADIO_TYPES: frozenset[str] = frozenset({"GSM", "UMTS", "LTE", "CDMA", "NR"})
+
+# (field, lower bound, upper bound) checked on every row that carries the field;
+# upper bounds respect the backend's Integer columns
+VALUE_RANGES: tuple[tuple[str, float, float], ...] = (
+    ("mcc", 0, 999),
+    ("net", 0, 32767),
+    ("area", 0, 2**31 - 1),
+    ("cell", 0, 2**31 - 1),
+    ("lon", -180.0, 180.0),
+    ("lat", -90.0, 90.0),
+    ("range", 0, 10**7),
+    ("samples", 0, 2**31 - 1),
+)
+
+
+def parse_csv(text: str) -> list[dict[str, Any]]:
+    """Parse OpenCelliD-format CSV text (optional header row) into raw tower dicts"""
+    rows = []
+    for values in csv.reader(io.StringIO(text)):
+        if not values or (not rows and values[0].strip().lower() == "radio"):
+            continue
+        rows.append({
+            column: value.strip() if value.strip() != "" else None
+            for column, value in zip(CSV_COLUMNS, values)
+        })
+    return rows
+
+
+def _to_timestamp(value: Any) -> str | None:
+    """Unix seconds (CSV) or an ISO string to the backend LocalDateTime format"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and not value.lstrip("-").isdigit():
+        moment = datetime.fromisoformat(value)
+        # An offset is folded into UTC, as unix seconds are; naive values are kept as given
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S")
+    return datetime.fromtimestamp(int(value), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _numeric_column(rows: list[dict], field: str) -> np.ndarray:
+    """Column of floats with NaN for missing or non-numeric values"""
+    values = np.array([row.get(field) for row in rows] + [None], dtype=object)[:-1]
+    values[np.equal(values, None) | np.equal(values, "")] = np.nan
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        pass
+    # Some value does not parse: convert row by row so only the bad ones become NaN
+    column = np.full(len(values), np.nan)
+    for i, value in enumerate(values.tolist()):
+        try:
+            column[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return column
+
+
+def validate_rows(rows: list[dict]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Validate and normalize rows column-wise
+
+    Returns (valid towers ready for /batch, failures with the input row index).
+    """
+    n = len(rows)
+    errors: list[list[str]] = [[] for _ in range(n)]
+    columns = {
+        field: _numeric_column(rows, field)
+        for field in INTEGER_FIELDS + ("lon", "lat")
+    }
+
+    radios = np.array([str(row.get("radio") or "").upper() for row in rows], dtype=object)
+    bad_radio = ~np.isin(radios, list(RADIO_TYPES))
+    for i in np.flatnonzero(bad_radio):
+        errors[i].append(f"invalid radio '{rows[i].get('radio')}'")
+
+    for field in REQUIRED_FIELDS:
+        if field == "radio":
+            continue
+        for i in np.flatnonzero(np.isnan(columns[field])):
+            errors[i].append(f"missing or non-numeric {field}")
+
+    for field, low, high in VALUE_RANGES:
+        column = columns[field]
+        with np.errstate(invalid="ignore"):
+            out_of_range = (column < low) | (column > high)
+        for i in np.flatnonzero(out_of_range):
+            errors[i].append(f"{field} out of range [{low}, {high}]")
+
+    for field in INTEGER_FIELDS:
+        column = columns[field]
+        with np.errstate(invalid="ignore"):
+            fractional = ~np.isnan(column) & (column != np.floor(column))
+        for i in np.flatnonzero(fractional):
+            errors[i].append(f"{field} must be an integer")
+
+    valid: list[dict[str, Any]] = []
+    failures: list[dict[str, Any]] = []
+    ints = {field: columns[field].tolist() for field in INTEGER_FIELDS}
+    floats = {field: columns[field].tolist() for field in ("lon", "lat")}
+    for i, row in enumerate(rows):
+        if not errors[i]:
+            try:
+                timestamps = {field: _to_timestamp(row.get(field)) for field in TIMESTAMP_FIELDS}
+            except (TypeError, ValueError, OverflowError, OSError):
+                errors[i].append("invalid created/updated timestamp")
+        if errors[i]:
+            failures.append({"row": i, "error": "; ".join(errors[i])})
+            continue
+        tower: dict[str, Any] = {"radio": radios[i]}
+        for field in INTEGER_FIELDS:
+            value = ints[field][i]
+            tower[field] = None if value != value else int(value)
+        for field, values in floats.items():
+            tower[field] = values[i]
+        tower.update(timestamps)
+        tower["_row"] = i
+        valid.append(tower)
+    return valid, failures
+
+
+class BulkIngestor:
+    """Uploads validated towers in batches with bounded concurrency"""
+
+    def __init__(self, api_client: APIClient | None = None):
+        self.api_client = api_client or APIClient()
+
+    async def ingest(
+        self,
+        rows: list[dict],
+        batch_size: int = BULK_BATCH_SIZE,
+        dry_run: bool = False,
+        dedup: Callable[[list[dict]], list[str | None]] | None = None,
+    ) -> dict[str, Any]:
+        """Validate `rows`, send them to /batch and report per-row failures
+
+        `dedup` maps the valid towers to an error for each duplicate (None to
+        keep it); duplicates are reported as failures and not sent.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        started = time.perf_counter()
+        valid, failures = validate_rows(rows)
+        if dedup is not None:
+            errors = dedup(valid)
+            failures.extend({"row": tower["_row"], "error": error} for tower, error in zip(valid, errors) if error)
+            valid = [tower for tower, error in zip(valid, errors) if not error]
+        batches = [valid[i:i + batch_size] for i in range(0, len(valid), batch_size)]
+        created = 0
+
+        if not dry_run and batches:
+            semaphore = asyncio.Semaphore(BULK_MAX_CONCURRENT_BATCHES)
+
+            async def send(batch: list[dict]) -> int:
+                payload = [{k: v for k, v in tower.items() if k != "_row"} for tower in batch]
+                async with semaphore:
+                    try:
+                        result = await self.api_client.post_batch(payload)
+                    except Exception as e:
+                        failures.extend({"row": tower["_row"], "error": f"batch rejected: {e}"} for tower in batch)
+                        return 0
+                return len(result) if isinstance(result, list) else len(batch)
+
+            created = sum(await asyncio.gather(*(send(batch) for batch in batches)))
+
+        failures.sort(key=lambda failure: failure["row"])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Bulk ingest: {len(rows)} rows, {len(valid)} valid, {created} created, "
+            f"{len(failures)} failed in {elapsed_ms:.0f} ms"
+        )
+        return {
+            "received": len(rows),
+            "valid": len(valid),
+            "created": created,
+            "dry_run": dry_run,
+            "batches": len(batches),
+            "failed": len(failures),
+            "failures": failures[:BULK_MAX_REPORTED_FAILURES],
+            "failures_truncated": len(failures) > BULK_MAX_REPORTED_FAILURES,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
@@ -0,0 +1,87 @@
+"""
+Circuit breaker for Cell Tower Signal Intelligence MCP Server
+Fails backend calls fast while the Spring API is unreachable
+"""
+
+import logging
+import time
+from typing import Any
+
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+from exceptions import BackendUnavailableError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe
+
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half_open once `reset_timeout` has elapsed, letting exactly one request
+    through; that probe closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.rejected = 0
+        self.trips = 0
+        self._probe_in_flight = False
+
+    def before_request(self) -> None:
+        """Raise BackendUnavailableError instead of sending while the circuit is open"""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            logger.info("Circuit half-open: probing backend")
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected += 1
+        retry_in = max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+        raise BackendUnavailableError(
+            f"Backend unavailable: circuit open after {self.consecutive_failures} consecutive "
+            f"failures, retrying in {retry_in:.0f}s"
+        )
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit closed: backend recovered")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+                logger.warning(f"Circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Let another request probe if the current one ended without a verdict"""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
@@ -2,15 +2,72 @@
 Configuration management for Cell Tower Signal Intelligence MCP Server
 """
 
+import os
 from typing import Final
 
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # API Configuration
-API_BASE_URL: Final[str] = "http://localhost:8080/api/cell-towers"
+API_BASE_URL: Final[str] = _env_str("API_BASE_URL", "http://localhost:8080/api/cell-towers")
 DEFAULT_TIMEOUT: Final[float] = 30.0
 
+# HTTP Transport Configuration
+# Every value can be overridden with an environment variable of the same name.
+# Connect and pool waits are kept short so an unreachable backend fails fast;
+# reads keep the historical 30 s budget for large list responses.
+HTTP_CONNECT_TIMEOUT: Final[float] = _env_float("HTTP_CONNECT_TIMEOUT", 5.0)
+HTTP_READ_TIMEOUT: Final[float] = _env_float("HTTP_READ_TIMEOUT", DEFAULT_TIMEOUT)
+HTTP_WRITE_TIMEOUT: Final[float] = _env_float("HTTP_WRITE_TIMEOUT", DEFAULT_TIMEOUT)
+HTTP_POOL_TIMEOUT: Final[float] = _env_float("HTTP_POOL_TIMEOUT", 10.0)
+HTTP_MAX_CONNECTIONS: Final[int] = _env_int("HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE_CONNECTIONS: Final[int] = _env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+HTTP_KEEPALIVE_EXPIRY: Final[float] = _env_float("HTTP_KEEPALIVE_EXPIRY", 30.0)
+# Requires the optional h2 package (pip install "httpx[http2]")
+HTTP2_ENABLED: Final[bool] = _env_bool("HTTP2_ENABLED", False)
+
+# Retry Configuration
+# Idempotent GETs are retried on connection errors, timeouts and these statuses
+# with exponential backoff and full jitter: sleep ~ U(0, min(max, base * 2**n))
+RETRY_MAX_ATTEMPTS: Final[int] = _env_int("RETRY_MAX_ATTEMPTS", 3)
+RETRY_BACKOFF_BASE: Final[float] = _env_float("RETRY_BACKOFF_BASE", 0.2)
+RETRY_BACKOFF_MAX: Final[float] = _env_float("RETRY_BACKOFF_MAX", 5.0)
+RETRY_STATUS_CODES: Final[frozenset[int]] = frozenset({500, 502, 503, 504})
+
+# Circuit Breaker Configuration
+# After this many consecutive failed requests the backend is considered down and
+# calls fail immediately until CIRCUIT_RESET_TIMEOUT seconds pass; then a single
+# probe request decides whether to close the circuit again.
+CIRCUIT_BREAKER_ENABLED: Final[bool] = _env_bool("CIRCUIT_BREAKER_ENABLED", True)
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = _env_int("CIRCUIT_FAILURE_THRESHOLD", 5)
+CIRCUIT_RESET_TIMEOUT: Final[float] = _env_float("CIRCUIT_RESET_TIMEOUT", 30.0)
+
 # Server Configuration
 SERVER_NAME: Final[str] = "cell-tower-intelligence"
 SERVER_VERSION: Final[str] = "1.0.0"
+# Tool implementations (numpy, the data layer) are imported on the first tool
+# call. With prewarm on, a background thread starts that import as soon as
+# list_tools has been answered.
+SERVER_PREWARM: Final[bool] = _env_bool("SERVER_PREWARM", True)
 
 # Pagination Defaults
 DEFAULT_PAGE: Final[int] = 0
@@ -18,7 +75,176 @@ DEFAULT_PAGE_SIZE: Final[int] = 50
 DEFAULT_SORT_BY: Final[str] = "id"
 DEFAULT_SORT_DIRECTION: Final[str] = "asc"
 
+# Response Format Configuration
+# Default output format of tool results; see response_format.RESPONSE_FORMATS
+DEFAULT_RESPONSE_FORMAT: Final[str] = "json"
+SUMMARY_PREVIEW_ROWS: Final[int] = 5
+
+# Result Handle Configuration
+# Tower lists longer than RESULT_HANDLE_MIN_ROWS are kept in a server-side
+# result store; the tool returns a handle, a summary and the first
+# RESULT_PAGE_ROWS rows, and fetch_result_page serves later slices without
+# another backend call. Results expire after RESULT_HANDLE_TTL seconds or when
+# the store needs room (least recently read first).
+RESULT_HANDLES_ENABLED: Final[bool] = _env_bool("RESULT_HANDLES_ENABLED", True)
+RESULT_HANDLE_MIN_ROWS: Final[int] = _env_int("RESULT_HANDLE_MIN_ROWS", 500)
+RESULT_PAGE_ROWS: Final[int] = 100
+RESULT_PAGE_MAX_ROWS: Final[int] = 5000
+RESULT_HANDLE_TTL: Final[float] = _env_float("RESULT_HANDLE_TTL", 900.0)
+RESULT_STORE_MAX_ENTRIES: Final[int] = 64
+RESULT_STORE_MAX_BYTES: Final[int] = _env_int("RESULT_STORE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Response Cache Configuration
+# GET responses are cached per endpoint + query parameters. TTLs (seconds) are
+# looked up by the first path segment; a TTL of 0 disables caching for it.
+CACHE_ENABLED: Final[bool] = _env_bool("CACHE_ENABLED", True)
+CACHE_MAX_ENTRIES: Final[int] = 256
+CACHE_DEFAULT_TTL: Final[float] = 60.0
+CACHE_ENDPOINT_TTLS: Final[dict[str, float]] = {
+    "": 30.0,
+    "/paged": 30.0,
+    "/radio": 300.0,
+    "/mcc": 300.0,
+    "/cell": 300.0,
+    "/location": 120.0,
+    "/signal": 120.0,
+    "/samples": 120.0,
+    "/stats": 120.0,
+}
+
+# Streaming Configuration
+# Page size and number of concurrent page requests used when walking /paged
+STREAM_PAGE_SIZE: Final[int] = 1000
+STREAM_MAX_IN_FLIGHT: Final[int] = 4
+
 # HTTP Headers
 DEFAULT_HEADERS: Final[dict[str, str]] = {
     "Content-Type": "application/json"
 }
+
+# Local Snapshot Configuration
+# When enabled, filter tools are answered from an in-process copy of the
+# tower table that is reloaded every SNAPSHOT_REFRESH_INTERVAL seconds.
+SNAPSHOT_ENABLED: Final[bool] = _env_bool("SNAPSHOT_ENABLED", False)
+SNAPSHOT_REFRESH_INTERVAL: Final[float] = _env_float("SNAPSHOT_REFRESH_INTERVAL", 300.0)
+SNAPSHOT_PAGE_SIZE: Final[int] = 5000
+# Incremental sync: if the backend serves /changes, the snapshot is brought up
+# to date every SNAPSHOT_SYNC_INTERVAL seconds by fetching only rows written
+# since the last watermark, with a full reload every SNAPSHOT_FULL_REFRESH_INTERVAL.
+# Each round re-reads SNAPSHOT_SYNC_OVERLAP seconds before the watermark to
+# catch transactions that committed after a later write was already seen.
+SNAPSHOT_SYNC_ENABLED: Final[bool] = _env_bool("SNAPSHOT_SYNC_ENABLED", True)
+SNAPSHOT_SYNC_INTERVAL: Final[float] = _env_float("SNAPSHOT_SYNC_INTERVAL", 30.0)
+SNAPSHOT_SYNC_PAGE_SIZE: Final[int] = 5000
+SNAPSHOT_SYNC_OVERLAP: Final[float] = 5.0
+SNAPSHOT_FULL_REFRESH_INTERVAL: Final[float] = _env_float("SNAPSHOT_FULL_REFRESH_INTERVAL", 3600.0)
+
+# Coverage Analysis Configuration
+# Signal percentiles come from a 1 dBm-wide histogram over this range
+COVERAGE_SIGNAL_HISTOGRAM_MIN: Final[int] = -150
+COVERAGE_SIGNAL_HISTOGRAM_MAX: Final[int] = 0
+COVERAGE_PERCENTILES: Final[tuple[int, ...]] = (10, 25, 50, 75, 90, 95, 99)
+COVERAGE_TOP_AREAS: Final[int] = 20
+# Let the backend /stats endpoint GROUP BY radio/net/area/signal instead of
+# downloading towers; falls back to local aggregation if the endpoint is missing
+COVERAGE_PUSHDOWN_ENABLED: Final[bool] = _env_bool("COVERAGE_PUSHDOWN_ENABLED", True)
+
+# Query Planner Configuration
+# Row limits of query_towers and the page size used when no predicate can be
+# pushed to a backend filter endpoint and the table has to be scanned
+QUERY_DEFAULT_LIMIT: Final[int] = 100
+QUERY_MAX_LIMIT: Final[int] = 10000
+QUERY_SCAN_PAGE_SIZE: Final[int] = 2000
+
+# Coverage Grid Configuration
+# Default cell edge in degrees, the largest grid one call may return, and the
+# tile cache: tiles are GRID_TILE_CELLS cells square and at most
+# GRID_CACHE_MAX_TILES are kept. Tower ranges are capped at GRID_MAX_RANGE_M,
+# which also bounds how far outside a box towers are considered for coverage.
+GRID_DEFAULT_RESOLUTION_DEG: Final[float] = 0.05
+GRID_MAX_CELLS: Final[int] = 250_000
+GRID_TILE_CELLS: Final[int] = 64
+GRID_CACHE_MAX_TILES: Final[int] = 256
+GRID_MAX_RANGE_M: Final[float] = 50_000.0
+
+# Coverage Gap / Overlap Configuration
+# Default cell edge for gap and overlap detection, the largest region grid, and
+# the cell count above which regions are swept in strips on the process pool
+COVERAGE_GAP_RESOLUTION_DEG: Final[float] = 0.01
+COVERAGE_REGION_MAX_CELLS: Final[int] = 4_000_000
+COVERAGE_REGION_LIMIT: Final[int] = 20
+COVERAGE_PARALLEL_MIN_CELLS: Final[int] = 1_000_000
+
+# Geolocation Configuration
+# locate_from_cells accepts up to LOCATE_MAX_OBSERVATIONS cells per call.
+# Towers without a usable range count as LOCATE_DEFAULT_RANGE_M; ranges below
+# LOCATE_MIN_RANGE_M are raised to it so one tiny cell cannot dominate.
+LOCATE_MAX_OBSERVATIONS: Final[int] = 20_000
+LOCATE_DEFAULT_RANGE_M: Final[float] = 1_000.0
+LOCATE_MIN_RANGE_M: Final[float] = 50.0
+
+# Duplicate Detection Configuration
+# Same-identity towers further apart than DUPLICATE_CONFLICT_DISTANCE_M are
+# reported as conflicting; reports list at most DUPLICATE_GROUP_LIMIT groups
+DUPLICATE_CONFLICT_DISTANCE_M: Final[float] = 1_000.0
+DUPLICATE_GROUP_LIMIT: Final[int] = 50
+
+# Time Rollup Configuration
+# Largest series coverage_timeseries returns in one call
+TIMESERIES_MAX_BUCKETS: Final[int] = 5000
+
+# Neighbor Graph Configuration
+# Towers are bucketed in NEIGHBOR_CELL_DEG cells to find range overlaps, in
+# chunks of NEIGHBOR_BUILD_CHUNK_CELLS range-circle cells. A sync touching more
+# than NEIGHBOR_DELTA_MAX_ROWS towers rebuilds the graph instead of patching it.
+# interference_clusters lists NEIGHBOR_CLUSTER_LIMIT clusters by default with
+# at most NEIGHBOR_CLUSTER_MAX_IDS tower ids each
+NEIGHBOR_CELL_DEG: Final[float] = 0.02
+NEIGHBOR_BUILD_CHUNK_CELLS: Final[int] = 500_000
+NEIGHBOR_DELTA_MAX_ROWS: Final[int] = 10_000
+NEIGHBOR_DEFAULT_LIMIT: Final[int] = 50
+NEIGHBOR_CLUSTER_LIMIT: Final[int] = 20
+NEIGHBOR_CLUSTER_MAX_IDS: Final[int] = 50
+
+# Offload Configuration
+# CPU-heavy steps over at least OFFLOAD_MIN_ROWS rows leave the event loop:
+# "auto" sends object work to threads and bytes/array work to processes,
+# "thread" uses threads only, "inline" runs everything on the loop.
+# At most OFFLOAD_MAX_PENDING tasks per pool are queued; producers wait beyond that.
+OFFLOAD_MODE: Final[str] = _env_str("OFFLOAD_MODE", "auto")
+OFFLOAD_MIN_ROWS: Final[int] = _env_int("OFFLOAD_MIN_ROWS", 5000)
+OFFLOAD_THREAD_WORKERS: Final[int] = _env_int("OFFLOAD_THREAD_WORKERS", 4)
+OFFLOAD_PROCESS_WORKERS: Final[int] = _env_int("OFFLOAD_PROCESS_WORKERS", min(os.cpu_count() or 1, 4))
+OFFLOAD_MAX_PENDING: Final[int] = _env_int("OFFLOAD_MAX_PENDING", 16)
+OFFLOAD_START_METHOD: Final[str] = _env_str("OFFLOAD_START_METHOD", "spawn")
+
+# Multi-lookup Configuration
+# Concurrent GETs allowed when fanning out id / cell lookups, and ids per call
+FANOUT_MAX_CONCURRENCY: Final[int] = 16
+FANOUT_MAX_IDS: Final[int] = 500
+
+# Bulk Ingestion Configuration
+BULK_BATCH_SIZE: Final[int] = 1000
+BULK_MAX_CONCURRENT_BATCHES: Final[int] = 4
+BULK_MAX_REPORTED_FAILURES: Final[int] = 100
+
+# Metrics Configuration
+# Latency buckets in seconds and payload buckets in bytes for the in-process
+# histograms exposed by the get_server_metrics tool
+METRICS_ENABLED: Final[bool] = True
+METRICS_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+METRICS_BYTE_BUCKETS: Final[tuple[float, ...]] = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864,
+)
+
+# Profiler Configuration
+# Interval of the sampling profiler and number of functions in a profile report
+PROFILER_SAMPLE_INTERVAL: Final[float] = 0.005
+PROFILER_TOP_FUNCTIONS: Final[int] = 30
+
+# Spatial Index Configuration
+# Grid cell edge in degrees (0.05 deg is roughly 5.5 km at the equator)
+SPATIAL_CELL_SIZE_DEG: Final[float] = 0.05
+DEFAULT_NEAREST_LIMIT: Final[int] = 10
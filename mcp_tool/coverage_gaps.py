@@ -0,0 +1,305 @@
+"""
+Coverage gap and overlap detection for Cell Tower Signal Intelligence MCP Server
+Finds regions outside every tower's range, or inside too many same-radio ranges
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+import numpy as np
+
+from config import (
+    COVERAGE_PARALLEL_MIN_CELLS,
+    COVERAGE_REGION_LIMIT,
+    COVERAGE_REGION_MAX_CELLS,
+)
+from coverage_grid import GridSpec, clip_ranges, coverage_depth, data_extent, halo_box, halo_positions, tower_ranges
+from metrics import metrics
+from offload import SharedArrays, SharedHandle, offloader
+from spatial_index import METERS_PER_DEGREE_LAT
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+Span = tuple[int, int, int, int]
+
+
+def region_span(spec: GridSpec, bbox: tuple[float, float, float, float]) -> Span:
+    """Cell rectangle of a box, rejecting grids beyond COVERAGE_REGION_MAX_CELLS"""
+    min_lon, max_lon, min_lat, max_lat = bbox
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("min_lon/min_lat must not exceed max_lon/max_lat")
+    span = spec.cell_span(min_lon, max_lon, min_lat, max_lat)
+    col0, col1, row0, row1 = span
+    if (col1 - col0) * (row1 - row0) > COVERAGE_REGION_MAX_CELLS:
+        raise ValueError(
+            f"Grid of {row1 - row0} x {col1 - col0} cells exceeds the limit of {COVERAGE_REGION_MAX_CELLS}; "
+            "use a coarser resolution or a smaller bounding box"
+        )
+    return span
+
+
+async def depth_grids(
+    snapshot: TowerSnapshot,
+    spec: GridSpec,
+    span: Span,
+    radio_codes: list[int | None],
+    parallel: bool | None = None,
+) -> list[np.ndarray]:
+    """Coverage depth over `span` for each radio filter (None = all radios)
+
+    Large regions are cut into horizontal strips that are swept on the
+    offload process pool. Workers read tower columns from the snapshot's
+    shared-memory block, so each task ships only the strip bounds.
+    `parallel` forces the choice; by default the pool is used once the work
+    exceeds COVERAGE_PARALLEL_MIN_CELLS cells.
+    """
+    col0, col1, row0, row1 = span
+    cells = (col1 - col0) * (row1 - row0) * len(radio_codes)
+    if parallel is None:
+        parallel = offloader.process_parallelism > 1 and cells >= COVERAGE_PARALLEL_MIN_CELLS
+
+    if not parallel:
+        parts = []
+        for radio_code in radio_codes:
+            positions = halo_positions(snapshot, spec, span, radio_code)
+            parts.append(coverage_depth(
+                spec,
+                span,
+                snapshot.columns["lon"][positions],
+                snapshot.columns["lat"][positions],
+                tower_ranges(snapshot, positions),
+            ))
+        return parts
+
+    bounds = np.linspace(row0, row1, min(offloader.process_workers, row1 - row0) + 1).astype(int)
+    strips = [(col0, col1, int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    handle = snapshot.shared_columns().handle
+    parts = await asyncio.gather(*(
+        offloader.process(strip_depth, handle, spec, strip, radio_code)
+        for radio_code in radio_codes
+        for strip in strips
+    ))
+    per_radio = len(strips)
+    return [
+        np.concatenate(parts[i:i + per_radio], axis=0)
+        for i in range(0, len(parts), per_radio)
+    ]
+
+
+def strip_depth(handle: SharedHandle, spec: GridSpec, strip: Span, radio_code: int | None) -> np.ndarray:
+    """coverage_depth of one strip over towers in a shared snapshot block; runs in a worker"""
+    columns = SharedArrays.attach(handle).arrays
+    min_lon, max_lon, min_lat, max_lat = halo_box(spec, strip)
+    lon, lat = columns["lon"], columns["lat"]
+    keep = (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+    if radio_code is not None:
+        keep &= columns["radio"] == radio_code
+    return coverage_depth(spec, strip, lon[keep], lat[keep], clip_ranges(columns["range"][keep]))
+
+
+def find_regions(
+    mask: np.ndarray,
+    spec: GridSpec,
+    span: Span,
+    depth: np.ndarray | None = None,
+    min_cells: int = 1,
+    limit: int = 20,
+) -> tuple[int, list[dict[str, Any]]]:
+    """4-connected regions of True cells, largest area first
+
+    Cells are grouped into horizontal runs per row and runs that overlap
+    between neighbouring rows are joined with a union-find, so the work
+    scales with the number of runs rather than the number of cells.
+    Returns the number of regions with at least `min_cells` cells and the
+    `limit` largest of them.
+    """
+    n_rows, n_cols = mask.shape
+    if not mask.any():
+        return 0, []
+
+    # Run starts/stops from the edges of each zero-padded row
+    padded = np.zeros((n_rows, n_cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, stops = np.nonzero(edges == -1)
+
+    # Each run is linked to the runs of the previous row it overlaps; keys
+    # order runs by (row, column) so one searchsorted finds them all
+    width = n_cols + 1
+    start_keys = start_rows * width + starts
+    stop_keys = start_rows * width + stops
+    previous = (start_rows - 1) * width
+    first = np.searchsorted(stop_keys, previous + starts, side="right")
+    last = np.searchsorted(start_keys, previous + stops, side="left")
+    links = np.maximum(last - first, 0)
+    below = np.repeat(np.arange(len(starts)), links)
+    above = np.repeat(first, links) + (np.arange(links.sum()) - np.repeat(np.cumsum(links) - links, links))
+
+    parent = list(range(len(starts)))
+
+    def find(run: int) -> int:
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    for a, b in zip(below.tolist(), above.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    roots = np.array([find(run) for run in range(len(starts))])
+    _, component = np.unique(roots, return_inverse=True)
+    n_components = int(component.max()) + 1
+
+    col0, _, row0, _ = span
+    lengths = stops - starts
+    cell_km2 = _cell_km2(spec, start_rows + row0)
+    cells = np.bincount(component, weights=lengths, minlength=n_components)
+    area = np.bincount(component, weights=lengths * cell_km2, minlength=n_components)
+    # Sum of cell-centre columns over each run: length * (first + last) / 2
+    col_sum = np.bincount(component, weights=lengths * (starts + stops - 1) / 2.0, minlength=n_components)
+    row_sum = np.bincount(component, weights=lengths * start_rows, minlength=n_components)
+    min_col = np.full(n_components, n_cols)
+    max_col = np.zeros(n_components, dtype=np.int64)
+    min_row = np.full(n_components, n_rows)
+    max_row = np.zeros(n_components, dtype=np.int64)
+    np.minimum.at(min_col, component, starts)
+    np.maximum.at(max_col, component, stops)
+    np.minimum.at(min_row, component, start_rows)
+    np.maximum.at(max_row, component, start_rows + 1)
+    peak = None
+    if depth is not None:
+        # Masked cells in row-major order lay the runs out back to back
+        run_peak = np.maximum.reduceat(depth[mask], np.cumsum(lengths) - lengths)
+        peak = np.zeros(n_components, dtype=np.int64)
+        np.maximum.at(peak, component, run_peak)
+
+    qualifying = np.flatnonzero(cells >= min_cells)
+    order = qualifying[np.argsort(-area[qualifying], kind="stable")][:limit]
+    regions = []
+    for c in order.tolist():
+        region = {
+            "cells": int(cells[c]),
+            "area_km2": round(float(area[c]), 2),
+            "min_lon": round(-180.0 + (col0 + min_col[c]) * spec.cell_lon, 6),
+            "max_lon": round(-180.0 + (col0 + max_col[c]) * spec.cell_lon, 6),
+            "min_lat": round(-90.0 + (row0 + min_row[c]) * spec.cell_lat, 6),
+            "max_lat": round(-90.0 + (row0 + max_row[c]) * spec.cell_lat, 6),
+            "centroid_lon": round(-180.0 + (col0 + col_sum[c] / cells[c] + 0.5) * spec.cell_lon, 6),
+            "centroid_lat": round(-90.0 + (row0 + row_sum[c] / cells[c] + 0.5) * spec.cell_lat, 6),
+        }
+        if peak is not None:
+            region["max_towers"] = int(peak[c])
+        regions.append(region)
+    return len(qualifying), regions
+
+
+async def find_coverage_gaps(
+    snapshot: TowerSnapshot,
+    spec: GridSpec,
+    bbox: tuple[float, float, float, float] | None = None,
+    radio: str | None = None,
+    min_cells: int = 1,
+    limit: int = COVERAGE_REGION_LIMIT,
+    parallel: bool | None = None,
+) -> dict[str, Any]:
+    """Regions whose cell centres lie outside every tower's range circle"""
+    radio_code = _radio_code(snapshot, radio)
+    bbox = bbox or data_extent(snapshot)
+    if radio_code is False or bbox is None:
+        return {}
+    span = region_span(spec, bbox)
+    depth, = await depth_grids(snapshot, spec, span, [radio_code], parallel)
+    uncovered = depth == 0
+    with metrics.phase("analysis"):
+        region_count, regions = find_regions(uncovered, spec, span, min_cells=min_cells, limit=limit)
+    return {
+        "grid": grid_summary(spec, span),
+        "radio": radio,
+        "total_cells": int(uncovered.size),
+        "uncovered_cells": int(uncovered.sum()),
+        "uncovered_fraction": round(float(uncovered.mean()), 4),
+        "uncovered_area_km2": masked_area_km2(uncovered, spec, span),
+        "gap_count": region_count,
+        "gaps": regions,
+    }
+
+
+async def find_coverage_overlap(
+    snapshot: TowerSnapshot,
+    spec: GridSpec,
+    min_towers: int,
+    bbox: tuple[float, float, float, float] | None = None,
+    radio: str | None = None,
+    min_cells: int = 1,
+    limit: int = COVERAGE_REGION_LIMIT,
+    parallel: bool | None = None,
+) -> dict[str, Any]:
+    """Regions covered by more than `min_towers` towers of the same radio, per radio"""
+    radio_code = _radio_code(snapshot, radio)
+    bbox = bbox or data_extent(snapshot)
+    if radio_code is False or bbox is None:
+        return {}
+    names = [radio] if radio is not None else snapshot.radio_labels
+    codes = [radio_code] if radio is not None else list(range(len(snapshot.radio_names)))
+    span = region_span(spec, bbox)
+    depths = await depth_grids(snapshot, spec, span, codes, parallel)
+
+    by_radio = {}
+    with metrics.phase("analysis"):
+        for name, depth in zip(names, depths):
+            crowded = depth > min_towers
+            region_count, regions = find_regions(crowded, spec, span, depth=depth, min_cells=min_cells, limit=limit)
+            by_radio[name] = {
+                "overlap_cells": int(crowded.sum()),
+                "overlap_fraction": round(float(crowded.mean()), 4),
+                "overlap_area_km2": masked_area_km2(crowded, spec, span),
+                "max_towers": int(depth.max()) if depth.size else 0,
+                "region_count": region_count,
+                "regions": regions,
+            }
+    return {
+        "grid": grid_summary(spec, span),
+        "min_towers": min_towers,
+        "total_cells": (span[1] - span[0]) * (span[3] - span[2]),
+        "by_radio": by_radio,
+    }
+
+
+def _radio_code(snapshot: TowerSnapshot, radio: str | None) -> int | None | bool:
+    """Code of a radio filter, None for no filter, False for an unknown radio"""
+    if radio is None:
+        return None
+    if radio not in snapshot.radio_names:
+        return False
+    return snapshot.radio_names.index(radio)
+
+
+def grid_summary(spec: GridSpec, span: Span) -> dict[str, Any]:
+    min_lon, max_lon, min_lat, max_lat = spec.edges(*span)
+    col0, col1, row0, row1 = span
+    return {
+        "resolution": spec.cell_lon,
+        "min_lon": min_lon,
+        "max_lon": max_lon,
+        "min_lat": min_lat,
+        "max_lat": max_lat,
+        "cols": col1 - col0,
+        "rows": row1 - row0,
+    }
+
+
+def masked_area_km2(mask: np.ndarray, spec: GridSpec, span: Span) -> float:
+    """Total area of the True cells"""
+    _, _, row0, row1 = span
+    return round(float(mask.sum(axis=1) @ _cell_km2(spec, np.arange(row0, row1))), 2)
+
+
+def _cell_km2(spec: GridSpec, rows: np.ndarray) -> np.ndarray:
+    """Area of one cell in each global grid row"""
+    centre_lat = -90.0 + (rows + 0.5) * spec.cell_lat
+    km_per_degree = METERS_PER_DEGREE_LAT / 1000.0
+    return (spec.cell_lat * km_per_degree) * (spec.cell_lon * km_per_degree) * np.cos(np.radians(centre_lat))
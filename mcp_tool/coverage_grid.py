@@ -0,0 +1,439 @@
+"""
+Coverage grid for Cell Tower Signal Intelligence MCP Server
+Rasterizes towers into lon/lat or geohash cells with per-cell counts, signal and range coverage
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from config import (
+    GRID_CACHE_MAX_TILES,
+    GRID_MAX_CELLS,
+    GRID_MAX_RANGE_M,
+    GRID_TILE_CELLS,
+)
+from spatial_index import METERS_PER_DEGREE_LAT
+from tower_model import INT_NULL
+from tower_schema import DEFAULT_GRID_LAYERS
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+_GEOHASH_ALPHABET = np.array(list("0123456789bcdefghjkmnpqrstuvwxyz"))
+
+# Per-cell arrays of one rasterized rectangle; radio_mix is (radios, rows, cols)
+Raster = dict[str, np.ndarray]
+
+
+class GridSpec:
+    """Global grid of fixed-size cells anchored at (-180, -90)
+
+    Every grid with the same cell size shares cell boundaries, so rasters
+    computed for different boxes line up and can be cached per tile.
+    """
+
+    __slots__ = ("kind", "cell_lon", "cell_lat", "precision")
+
+    def __init__(self, kind: str, cell_lon: float, cell_lat: float, precision: int | None = None):
+        self.kind = kind
+        self.cell_lon = cell_lon
+        self.cell_lat = cell_lat
+        self.precision = precision
+
+    @classmethod
+    def lonlat(cls, resolution: float) -> "GridSpec":
+        return cls("lonlat", float(resolution), float(resolution))
+
+    @classmethod
+    def geohash(cls, precision: int) -> "GridSpec":
+        """Cells of a geohash of `precision` characters (5 bits each, lon bit first)"""
+        bits = 5 * precision
+        lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+        return cls("geohash", 360.0 / 2 ** lon_bits, 180.0 / 2 ** lat_bits, precision)
+
+    @property
+    def key(self) -> tuple:
+        return self.kind, self.cell_lon, self.cell_lat
+
+    def col(self, lon: np.ndarray | float) -> np.ndarray:
+        return np.floor((np.asarray(lon) + 180.0) / self.cell_lon).astype(np.int64)
+
+    def row(self, lat: np.ndarray | float) -> np.ndarray:
+        return np.floor((np.asarray(lat) + 90.0) / self.cell_lat).astype(np.int64)
+
+    def cell_span(self, min_lon: float, max_lon: float, min_lat: float, max_lat: float) -> tuple[int, int, int, int]:
+        """Half-open global [col0, col1) x [row0, row1) of the cells overlapping the box"""
+        max_col = int(round(360.0 / self.cell_lon))
+        max_row = int(round(180.0 / self.cell_lat))
+        col0 = min(max(int(self.col(min_lon)), 0), max_col - 1)
+        col1 = min(max(int(self.col(max_lon)), col0), max_col - 1) + 1
+        row0 = min(max(int(self.row(min_lat)), 0), max_row - 1)
+        row1 = min(max(int(self.row(max_lat)), row0), max_row - 1) + 1
+        return col0, col1, row0, row1
+
+    def edges(self, col0: int, col1: int, row0: int, row1: int) -> tuple[float, float, float, float]:
+        return (
+            round(-180.0 + col0 * self.cell_lon, 9),
+            round(-180.0 + col1 * self.cell_lon, 9),
+            round(-90.0 + row0 * self.cell_lat, 9),
+            round(-90.0 + row1 * self.cell_lat, 9),
+        )
+
+    def geohashes(self, cols: np.ndarray, rows: np.ndarray) -> list[str]:
+        """Geohash strings of global cells, by interleaving their column and row bits"""
+        bits = 5 * self.precision
+        lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+        code = np.zeros(len(cols), dtype=np.int64)
+        for i in range(bits):
+            if i % 2 == 0:
+                bit = (cols >> (lon_bits - 1 - i // 2)) & 1
+            else:
+                bit = (rows >> (lat_bits - 1 - i // 2)) & 1
+            code = (code << 1) | bit
+        chars = [
+            _GEOHASH_ALPHABET[(code >> (5 * (self.precision - 1 - i))) & 31]
+            for i in range(self.precision)
+        ]
+        return ["".join(parts) for parts in zip(*(c.tolist() for c in chars))]
+
+
+def rasterize(
+    snapshot: TowerSnapshot,
+    spec: GridSpec,
+    span: tuple[int, int, int, int],
+    radio_code: int | None = None,
+) -> Raster:
+    """Per-cell statistics for the global cell rectangle `span`
+
+    Towers are binned by the cell holding their position. Range coverage is
+    the number of towers whose range circle contains each cell centre; it
+    is built with a scanline sweep: every tower contributes one column
+    interval per grid row it reaches, accumulated in a difference array and
+    prefix-summed, so the cost grows with the rows a circle spans rather than
+    its area. Distances use a local equirectangular approximation, which is
+    accurate to well under a cell at tower ranges.
+    """
+    col0, col1, row0, row1 = span
+    n_cols, n_rows = col1 - col0, row1 - row0
+    n_radios = len(snapshot.radio_names)
+    positions = halo_positions(snapshot, spec, span, radio_code)
+
+    lon = snapshot.columns["lon"][positions]
+    lat = snapshot.columns["lat"][positions]
+    cols = spec.col(lon) - col0
+    rows = spec.row(lat) - row0
+    inside = (cols >= 0) & (cols < n_cols) & (rows >= 0) & (rows < n_rows)
+    flat = (rows * n_cols + cols)[inside]
+    n_cells = n_rows * n_cols
+
+    count = np.bincount(flat, minlength=n_cells)
+    radio = snapshot.columns["radio"][positions][inside].astype(np.int64)
+    radio_mix = np.bincount(radio * n_cells + flat, minlength=n_radios * n_cells)
+
+    signal = snapshot.columns["averageSignal"][positions][inside]
+    has_signal = signal != INT_NULL
+    signal_flat, signal = flat[has_signal], signal[has_signal].astype(np.float64)
+    signal_count = np.bincount(signal_flat, minlength=n_cells)
+    signal_sum = np.bincount(signal_flat, weights=signal, minlength=n_cells)
+    signal_max = np.full(n_cells, -np.inf)
+    np.maximum.at(signal_max, signal_flat, signal)
+
+    depth = coverage_depth(spec, span, lon, lat, tower_ranges(snapshot, positions))
+
+    shape = (n_rows, n_cols)
+    return {
+        "count": count.reshape(shape).astype(np.int32),
+        "radio_mix": radio_mix.reshape((n_radios, *shape)).astype(np.int32),
+        "signal_count": signal_count.reshape(shape).astype(np.int32),
+        "signal_sum": signal_sum.reshape(shape),
+        "signal_max": signal_max.reshape(shape),
+        "coverage_depth": depth.astype(np.int32),
+    }
+
+
+def halo_box(spec: GridSpec, span: tuple[int, int, int, int]) -> tuple[float, float, float, float]:
+    """The rectangle widened by the furthest distance a tower range can reach"""
+    min_lon, max_lon, min_lat, max_lat = spec.edges(*span)
+    halo_lat = GRID_MAX_RANGE_M / METERS_PER_DEGREE_LAT
+    widest = max(abs(min_lat), abs(max_lat)) + halo_lat
+    halo_lon = halo_lat / max(math.cos(math.radians(min(widest, 89.0))), 1e-6)
+    return min_lon - halo_lon, max_lon + halo_lon, min_lat - halo_lat, max_lat + halo_lat
+
+
+def halo_positions(
+    snapshot: TowerSnapshot, spec: GridSpec, span: tuple[int, int, int, int], radio_code: int | None = None
+) -> np.ndarray:
+    """Towers inside the rectangle plus a halo whose range can reach into it"""
+    positions = snapshot.spatial_index.bbox(*halo_box(spec, span))
+    if radio_code is not None:
+        positions = positions[snapshot.columns["radio"][positions] == radio_code]
+    return positions
+
+
+def tower_ranges(snapshot: TowerSnapshot, positions: np.ndarray) -> np.ndarray:
+    """Range in metres of the given towers, nulls as 0 and capped at GRID_MAX_RANGE_M"""
+    return clip_ranges(snapshot.columns["range"][positions])
+
+
+def clip_ranges(ranges: np.ndarray) -> np.ndarray:
+    ranges = ranges.astype(np.float64)
+    return np.clip(np.where(ranges == INT_NULL, 0.0, ranges), 0.0, GRID_MAX_RANGE_M)
+
+
+def coverage_depth(
+    spec: GridSpec,
+    span: tuple[int, int, int, int],
+    lon: np.ndarray,
+    lat: np.ndarray,
+    ranges: np.ndarray,
+) -> np.ndarray:
+    """Number of range circles containing each cell centre of the rectangle
+
+    A pure function of its arguments, so it can also run in a worker process.
+    """
+    col0, col1, row0, row1 = span
+    n_cols, n_rows = col1 - col0, row1 - row0
+    depth = np.zeros((n_rows, n_cols), dtype=np.int64)
+    covering = ranges > 0
+    if not covering.any():
+        return depth
+    lon, lat, ranges = lon[covering], lat[covering], ranges[covering]
+
+    # Rows whose centre latitude lies within each circle's latitude extent
+    reach = ranges / METERS_PER_DEGREE_LAT
+    first = np.ceil((lat - reach + 90.0) / spec.cell_lat - 0.5).astype(np.int64) - row0
+    last = np.floor((lat + reach + 90.0) / spec.cell_lat - 0.5).astype(np.int64) - row0
+    first = np.maximum(first, 0)
+    last = np.minimum(last, n_rows - 1)
+    spans = np.maximum(last - first + 1, 0)
+    if not spans.sum():
+        return depth
+
+    # One (tower, row) pair per grid row a circle crosses
+    tower = np.repeat(np.arange(len(spans)), spans)
+    offsets = np.arange(len(tower)) - np.repeat(np.cumsum(spans) - spans, spans)
+    row = first[tower] + offsets
+    centre_lat = -90.0 + (row + row0 + 0.5) * spec.cell_lat
+    dy = (centre_lat - lat[tower]) * METERS_PER_DEGREE_LAT
+    half_width_m = np.sqrt(np.maximum(ranges[tower] ** 2 - dy ** 2, 0.0))
+    half_width = half_width_m / (METERS_PER_DEGREE_LAT * np.maximum(np.cos(np.radians(centre_lat)), 1e-6))
+
+    start = np.ceil((lon[tower] - half_width + 180.0) / spec.cell_lon - 0.5).astype(np.int64) - col0
+    stop = np.floor((lon[tower] + half_width + 180.0) / spec.cell_lon - 0.5).astype(np.int64) - col0
+    start = np.maximum(start, 0)
+    stop = np.minimum(stop, n_cols - 1)
+    keep = start <= stop
+    row, start, stop = row[keep], start[keep], stop[keep]
+
+    width = n_cols + 1
+    diff = np.bincount(row * width + start, minlength=n_rows * width)
+    diff -= np.bincount(row * width + stop + 1, minlength=n_rows * width)
+    return np.cumsum(diff.reshape(n_rows, width), axis=1)[:, :n_cols]
+
+
+class CoverageGridCache:
+    """LRU of rasterized tiles keyed by grid, radio filter and tile position
+
+    Requests are split into square tiles of GRID_TILE_CELLS cells aligned to
+    the global grid, so a panned or zoomed map view at the same resolution
+    only rasterizes the tiles it has not seen. The cache is dropped whenever
+    the snapshot contents change.
+    """
+
+    def __init__(self, max_tiles: int = GRID_CACHE_MAX_TILES, tile_cells: int = GRID_TILE_CELLS):
+        self.max_tiles = max_tiles
+        self.tile_cells = tile_cells
+        self._tiles: OrderedDict[tuple, Raster] = OrderedDict()
+        self._version: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def raster(
+        self, snapshot: TowerSnapshot, spec: GridSpec, span: tuple[int, int, int, int], radio_code: int | None
+    ) -> Raster:
+        """Statistics for `span`, stitched from cached tiles"""
+        if snapshot.version != self._version:
+            self._tiles.clear()
+            self._version = snapshot.version
+
+        col0, col1, row0, row1 = span
+        size = self.tile_cells
+        tile_cols = range(col0 // size, (col1 - 1) // size + 1)
+        tile_rows = range(row0 // size, (row1 - 1) // size + 1)
+        prefix = (spec.key, radio_code)
+
+        missing = [
+            (tx, ty) for ty in tile_rows for tx in tile_cols
+            if (prefix, tx, ty) not in self._tiles
+        ]
+        self.hits += len(tile_cols) * len(tile_rows) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            # Rasterize the bounding rectangle of the missing tiles in one pass
+            tx0 = min(tx for tx, _ in missing)
+            tx1 = max(tx for tx, _ in missing) + 1
+            ty0 = min(ty for _, ty in missing)
+            ty1 = max(ty for _, ty in missing) + 1
+            block = rasterize(snapshot, spec, (tx0 * size, tx1 * size, ty0 * size, ty1 * size), radio_code)
+            for tx, ty in missing:
+                ys = slice((ty - ty0) * size, (ty - ty0 + 1) * size)
+                xs = slice((tx - tx0) * size, (tx - tx0 + 1) * size)
+                self._store((prefix, tx, ty), {name: layer[..., ys, xs].copy() for name, layer in block.items()})
+
+        tiles = {(tx, ty): self._get((prefix, tx, ty)) for ty in tile_rows for tx in tile_cols}
+        stitched = {
+            name: np.concatenate([
+                np.concatenate([tiles[(tx, ty)][name] for tx in tile_cols], axis=-1)
+                for ty in tile_rows
+            ], axis=-2)
+            for name in tiles[(tile_cols[0], tile_rows[0])]
+        }
+        ys = slice(row0 - tile_rows[0] * size, row1 - tile_rows[0] * size)
+        xs = slice(col0 - tile_cols[0] * size, col1 - tile_cols[0] * size)
+        return {name: layer[..., ys, xs] for name, layer in stitched.items()}
+
+    def _get(self, key: tuple) -> Raster:
+        self._tiles.move_to_end(key)
+        return self._tiles[key]
+
+    def _store(self, key: tuple, tile: Raster) -> None:
+        self._tiles[key] = tile
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+
+    def clear(self) -> None:
+        self._tiles.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"tiles": len(self._tiles), "hits": self.hits, "misses": self.misses}
+
+
+def coverage_grid(
+    snapshot: TowerSnapshot,
+    cache: CoverageGridCache,
+    spec: GridSpec,
+    bbox: tuple[float, float, float, float] | None = None,
+    radio: str | None = None,
+    layers: tuple[str, ...] = DEFAULT_GRID_LAYERS,
+) -> dict[str, Any]:
+    """Coverage grid payload for the cells overlapping `bbox` (default: all towers)"""
+    bbox = bbox or data_extent(snapshot)
+    if bbox is None:
+        return {}
+    min_lon, max_lon, min_lat, max_lat = bbox
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("min_lon/min_lat must not exceed max_lon/max_lat")
+
+    span = spec.cell_span(min_lon, max_lon, min_lat, max_lat)
+    col0, col1, row0, row1 = span
+    n_cells = (col1 - col0) * (row1 - row0)
+    if n_cells > GRID_MAX_CELLS:
+        raise ValueError(
+            f"Grid of {row1 - row0} x {col1 - col0} cells exceeds the limit of {GRID_MAX_CELLS}; "
+            "use a coarser resolution or a smaller bounding box"
+        )
+
+    radio_code = None
+    radio_names = snapshot.radio_labels
+    if radio is not None:
+        if radio not in snapshot.radio_names:
+            return {}
+        radio_code = snapshot.radio_names.index(radio)
+        radio_names = [radio]
+    raster = cache.raster(snapshot, spec, span, radio_code)
+    if radio_code is not None:
+        raster = {**raster, "radio_mix": raster["radio_mix"][[radio_code]]}
+
+    edges = spec.edges(*span)
+    grid = {
+        "type": spec.kind,
+        "cell_lon": spec.cell_lon,
+        "cell_lat": spec.cell_lat,
+        "min_lon": edges[0],
+        "max_lon": edges[1],
+        "min_lat": edges[2],
+        "max_lat": edges[3],
+        "cols": col1 - col0,
+        "rows": row1 - row0,
+    }
+    count = raster["count"]
+    depth = raster["coverage_depth"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_signal = np.where(raster["signal_count"] > 0, raster["signal_sum"] / raster["signal_count"], np.nan)
+    max_signal = np.where(np.isfinite(raster["signal_max"]), raster["signal_max"], np.nan)
+    values = {
+        "count": count,
+        "radio_mix": raster["radio_mix"],
+        "mean_signal": mean_signal,
+        "max_signal": max_signal,
+        "coverage": (depth > 0).astype(np.int8),
+        "coverage_depth": depth,
+    }
+    summary = {
+        "tower_count": int(count.sum()),
+        "occupied_cells": int((count > 0).sum()),
+        "covered_cells": int((depth > 0).sum()),
+        "total_cells": n_cells,
+    }
+
+    if spec.kind == "geohash":
+        grid["precision"] = spec.precision
+        return {"grid": grid, "radio": radio, **summary, "cells": _sparse_cells(spec, span, values, radio_names, layers)}
+
+    # Dense layers: row 0 is the southern edge, column 0 the western edge
+    rendered: dict[str, Any] = {}
+    for name in layers:
+        if name == "radio_mix":
+            rendered[name] = {
+                radio_name: values[name][code].tolist() for code, radio_name in enumerate(radio_names)
+            }
+        else:
+            rendered[name] = _to_lists(values[name])
+    return {"grid": {**grid, "row_order": "south_to_north"}, "radio": radio, **summary, "layers": rendered}
+
+
+def data_extent(snapshot: TowerSnapshot) -> tuple[float, float, float, float] | None:
+    """Bounding box of every tower with a position"""
+    lon, lat = snapshot.columns["lon"], snapshot.columns["lat"]
+    if not len(lon) or np.isnan(lon).all():
+        return None
+    return float(np.nanmin(lon)), float(np.nanmax(lon)), float(np.nanmin(lat)), float(np.nanmax(lat))
+
+
+def _to_lists(layer: np.ndarray) -> list:
+    """2D array to nested lists, with NaN as null and whole floats kept short"""
+    if layer.dtype.kind != "f":
+        return layer.tolist()
+    rounded = np.round(layer, 2)
+    return [[None if v != v else v for v in row] for row in rounded.tolist()]
+
+
+def _sparse_cells(
+    spec: GridSpec, span: tuple[int, int, int, int], values: dict[str, np.ndarray], radio_names: list[str], layers: tuple[str, ...]
+) -> dict[str, dict[str, Any]]:
+    """Occupied or covered cells keyed by geohash"""
+    col0, _, row0, _ = span
+    rows, cols = np.nonzero((values["count"] > 0) | (values["coverage_depth"] > 0))
+    hashes = spec.geohashes(cols + col0, rows + row0)
+    columns: dict[str, list] = {}
+    for name in layers:
+        if name == "radio_mix":
+            mix = values[name][:, rows, cols].T.tolist()
+            columns[name] = [
+                {radio: n for radio, n in zip(radio_names, counts) if n} for counts in mix
+            ]
+        else:
+            picked = values[name][rows, cols]
+            columns[name] = (
+                [None if v != v else round(v, 2) for v in picked.tolist()]
+                if picked.dtype.kind == "f" else picked.tolist()
+            )
+    return {
+        geohash: {name: columns[name][i] for name in layers}
+        for i, geohash in enumerate(hashes)
+    }
@@ -0,0 +1,374 @@
+"""
+Coverage statistics for Cell Tower Signal Intelligence MCP Server
+Single-pass, mergeable aggregators used by the coverage analysis tool
+"""
+
+import math
+from typing import Any, Iterable
+
+import numpy as np
+
+from config import (
+    COVERAGE_PERCENTILES,
+    COVERAGE_SIGNAL_HISTOGRAM_MAX,
+    COVERAGE_SIGNAL_HISTOGRAM_MIN,
+    COVERAGE_TOP_AREAS,
+)
+from tower_model import INT_NULL, TowerColumns
+
+
+class RunningStats:
+    """Count, sum, min/max and Welford mean/variance of a numeric stream"""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine with statistics gathered over a disjoint set of values (Chan et al.)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for slot in self.__slots__:
+                setattr(self, slot, getattr(other, slot))
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "RunningStats":
+        stats = cls()
+        if len(values):
+            stats.count = len(values)
+            stats.total = values.sum().item()
+            stats.minimum = values.min().item()
+            stats.maximum = values.max().item()
+            stats.mean = stats.total / stats.count
+            stats.m2 = float(np.square(values - stats.mean).sum())
+        return stats
+
+    @classmethod
+    def from_moments(
+        cls, count: int, total: float, sum_squares: float, minimum: float | None, maximum: float | None
+    ) -> "RunningStats":
+        """Rebuild from count, sum and sum of squares as returned by a SQL aggregate"""
+        stats = cls()
+        if count:
+            stats.count = count
+            stats.total = total
+            stats.minimum = minimum
+            stats.maximum = maximum
+            stats.mean = total / count
+            stats.m2 = max(sum_squares - total * total / count, 0.0)
+        return stats
+
+
+class FixedHistogram:
+    """Integer-width bins over [low, high] with under/overflow, for approximate percentiles"""
+
+    __slots__ = ("low", "high", "counts")
+
+    def __init__(self, low: int, high: int):
+        self.low = low
+        self.high = high
+        # index 0 is underflow, the last index is overflow
+        self.counts = [0] * (high - low + 3)
+
+    def add(self, value: float) -> None:
+        if value < self.low:
+            self.counts[0] += 1
+        elif value > self.high:
+            self.counts[-1] += 1
+        else:
+            self.counts[int(value - self.low) + 1] += 1
+
+    def add_count(self, value: float, count: int) -> None:
+        """Add `count` observations of the same value"""
+        if value < self.low:
+            self.counts[0] += count
+        elif value > self.high:
+            self.counts[-1] += count
+        else:
+            self.counts[int(value - self.low) + 1] += count
+
+    def merge(self, other: "FixedHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def quantile(self, q: float, minimum: float, maximum: float) -> float:
+        """Value below which a fraction `q` of observations fall, clamped to [minimum, maximum]"""
+        total = sum(self.counts)
+        if total == 0:
+            return 0.0
+        target = q * total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= target:
+                if index == 0:
+                    return float(minimum)
+                if index == len(self.counts) - 1:
+                    return float(maximum)
+                bin_start = self.low + index - 1
+                value = bin_start + (target - cumulative) / count
+                return float(min(max(value, minimum), maximum))
+            cumulative += count
+        return float(maximum)
+
+
+class GroupStats:
+    """Per-group tower count with signal and sample aggregates"""
+
+    __slots__ = ("count", "signal_total", "signal_min", "signal_max", "samples_total")
+
+    def __init__(self):
+        self.count = 0
+        self.signal_total = 0
+        self.signal_min: float | None = None
+        self.signal_max: float | None = None
+        self.samples_total = 0
+
+    def add(self, signal: float, samples: int) -> None:
+        self.count += 1
+        self.signal_total += signal
+        self.samples_total += samples
+        if self.signal_min is None or signal < self.signal_min:
+            self.signal_min = signal
+        if self.signal_max is None or signal > self.signal_max:
+            self.signal_max = signal
+
+    def merge(self, other: "GroupStats") -> None:
+        if other.count == 0:
+            return
+        self.signal_min = other.signal_min if self.count == 0 else min(self.signal_min, other.signal_min)
+        self.signal_max = other.signal_max if self.count == 0 else max(self.signal_max, other.signal_max)
+        self.count += other.count
+        self.signal_total += other.signal_total
+        self.samples_total += other.samples_total
+
+    @classmethod
+    def from_row(cls, row: dict) -> "GroupStats":
+        """Build from one /stats group row"""
+        stats = cls()
+        stats.count = row["towerCount"]
+        stats.signal_total = row["signalSum"]
+        stats.signal_min = row["signalMin"]
+        stats.signal_max = row["signalMax"]
+        stats.samples_total = row["samplesSum"]
+        return stats
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_signal": self.signal_total / self.count if self.count else 0.0,
+            "strongest": self.signal_max,
+            "weakest": self.signal_min,
+            "total_samples": self.samples_total,
+        }
+
+
+class CoverageAggregator:
+    """Streaming coverage statistics with mergeable partial state
+
+    Feed towers chunk by chunk with `update`; partial aggregators built over
+    different pages (possibly concurrently) combine with `merge`. Memory
+    depends on the number of distinct radio/net/area values, never on the
+    number of towers.
+    """
+
+    def __init__(self):
+        self.signal = RunningStats()
+        self.samples = RunningStats()
+        self.signal_histogram = FixedHistogram(COVERAGE_SIGNAL_HISTOGRAM_MIN, COVERAGE_SIGNAL_HISTOGRAM_MAX)
+        self.by_radio: dict[str, GroupStats] = {}
+        self.by_net: dict[int | None, GroupStats] = {}
+        self.by_area: dict[int | None, GroupStats] = {}
+
+    @property
+    def count(self) -> int:
+        return self.signal.count
+
+    def update(self, towers: Iterable[dict]) -> "CoverageAggregator":
+        """Fold a chunk of backend-shaped tower dicts into the running state"""
+        for tower in towers:
+            signal = tower.get("averageSignal") or 0
+            samples = tower.get("samples") or 0
+            self.signal.add(signal)
+            self.samples.add(samples)
+            self.signal_histogram.add(signal)
+            self._group(self.by_radio, tower.get("radio") or "Unknown").add(signal, samples)
+            self._group(self.by_net, tower.get("net")).add(signal, samples)
+            self._group(self.by_area, tower.get("area")).add(signal, samples)
+        return self
+
+    def update_columns(self, table: TowerColumns, positions: np.ndarray | None = None) -> "CoverageAggregator":
+        """Fold rows of a column table (all, or those at `positions`) without building dicts"""
+        columns = table.columns
+        if positions is None:
+            positions = slice(None)
+        signal = columns["averageSignal"][positions]
+        if not len(signal):
+            return self
+        signal = np.where(signal == INT_NULL, 0, signal)
+        samples = columns["samples"][positions]
+        samples = np.where(samples == INT_NULL, 0, samples)
+
+        self.signal.merge(RunningStats.from_array(signal))
+        self.samples.merge(RunningStats.from_array(samples))
+        values, counts = np.unique(signal, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.signal_histogram.add_count(value, count)
+
+        radio_names = table.radio_labels
+        for groups, keys, to_key in (
+            (self.by_radio, columns["radio"][positions], lambda code: radio_names[code]),
+            (self.by_net, columns["net"][positions], _nullable),
+            (self.by_area, columns["area"][positions], _nullable),
+        ):
+            unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            n = len(unique)
+            count = np.bincount(inverse, minlength=n)
+            signal_total = np.zeros(n, dtype=np.int64)
+            samples_total = np.zeros(n, dtype=np.int64)
+            signal_min = np.full(n, np.iinfo(np.int64).max)
+            signal_max = np.full(n, np.iinfo(np.int64).min)
+            np.add.at(signal_total, inverse, signal)
+            np.add.at(samples_total, inverse, samples)
+            np.minimum.at(signal_min, inverse, signal)
+            np.maximum.at(signal_max, inverse, signal)
+            # First-seen order, as the row-by-row path inserts groups
+            for g in np.argsort(first, kind="stable").tolist():
+                stats = GroupStats()
+                stats.count = int(count[g])
+                stats.signal_total = int(signal_total[g])
+                stats.signal_min = int(signal_min[g])
+                stats.signal_max = int(signal_max[g])
+                stats.samples_total = int(samples_total[g])
+                self._group(groups, to_key(unique[g].item())).merge(stats)
+        return self
+
+    @classmethod
+    def from_group_rows(
+        cls,
+        by_radio: list[dict],
+        by_net: list[dict],
+        by_area: list[dict],
+        by_signal: list[dict],
+    ) -> "CoverageAggregator":
+        """Rebuild the aggregate state from backend GROUP BY results
+
+        Every tower falls in exactly one radio group, so the overall moments are
+        the sums over the radio rows; the per-signal rows fill the histogram.
+        """
+        aggregator = cls()
+        for field, stats in (("signal", aggregator.signal), ("samples", aggregator.samples)):
+            for row in by_radio:
+                stats.merge(RunningStats.from_moments(
+                    row["towerCount"],
+                    row[f"{field}Sum"],
+                    row[f"{field}SumSquares"],
+                    row[f"{field}Min"],
+                    row[f"{field}Max"],
+                ))
+        for groups, rows, unknown in (
+            (aggregator.by_radio, by_radio, "Unknown"),
+            (aggregator.by_net, by_net, None),
+            (aggregator.by_area, by_area, None),
+        ):
+            for row in rows:
+                key = row["groupKey"] if row["groupKey"] is not None else unknown
+                cls._group(groups, key).merge(GroupStats.from_row(row))
+        for row in by_signal:
+            aggregator.signal_histogram.add_count(row["groupKey"], row["towerCount"])
+        return aggregator
+
+    def merge(self, other: "CoverageAggregator") -> "CoverageAggregator":
+        """Absorb an aggregator computed over a disjoint set of towers"""
+        self.signal.merge(other.signal)
+        self.samples.merge(other.samples)
+        self.signal_histogram.merge(other.signal_histogram)
+        for mine, theirs in (
+            (self.by_radio, other.by_radio),
+            (self.by_net, other.by_net),
+            (self.by_area, other.by_area),
+        ):
+            for key, stats in theirs.items():
+                self._group(mine, key).merge(stats)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """Render the analysis payload returned by analyze_coverage"""
+        if self.count == 0:
+            return {}
+        signal, samples = self.signal, self.samples
+        top_areas = sorted(self.by_area.items(), key=lambda item: item[1].count, reverse=True)
+        return {
+            "total_towers": self.count,
+            "radio_distribution": {radio: stats.count for radio, stats in self.by_radio.items()},
+            "signal_stats": {
+                "average": signal.total / signal.count,
+                "strongest": signal.maximum,
+                "weakest": signal.minimum,
+                "stddev": signal.stddev,
+                "percentiles": {
+                    f"p{q}": self.signal_histogram.quantile(q / 100, signal.minimum, signal.maximum)
+                    for q in COVERAGE_PERCENTILES
+                },
+            },
+            "sample_stats": {
+                "total_samples": samples.total,
+                "avg_samples_per_tower": samples.total / self.count,
+                "max_samples": samples.maximum,
+                "min_samples": samples.minimum,
+                "stddev": samples.stddev,
+            },
+            "radio_breakdown": {radio: stats.to_dict() for radio, stats in self.by_radio.items()},
+            "net_breakdown": {str(net): stats.to_dict() for net, stats in self.by_net.items()},
+            "area_breakdown": {
+                "distinct_areas": len(self.by_area),
+                "top_areas": {
+                    str(area): stats.to_dict() for area, stats in top_areas[:COVERAGE_TOP_AREAS]
+                },
+            },
+        }
+
+    @staticmethod
+    def _group(groups: dict, key: Any) -> GroupStats:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = GroupStats()
+        return stats
+
+
+def _nullable(value: int) -> int | None:
+    return None if value == INT_NULL else value
+
+
+def aggregate_page(body: bytes) -> CoverageAggregator:
+    """Decode one /paged response body into columns and fold them, in a worker process"""
+    return CoverageAggregator().update_columns(TowerColumns.from_body(body))
@@ -18,6 +18,12 @@ class APIConnectionError(CellTowerAPIError):
     pass
 
 
+class BackendUnavailableError(APIConnectionError):
+    """Raised without contacting the API while the circuit breaker is open"""
+
+    pass
+
+
 class APIValidationError(CellTowerAPIError):
     """Raised when API returns validation errors"""
 
@@ -0,0 +1,94 @@
+"""
+Device geolocation for Cell Tower Signal Intelligence MCP Server
+Estimates device positions from observed cell identities by weighted centroid
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from config import LOCATE_DEFAULT_RANGE_M, LOCATE_MIN_RANGE_M
+from spatial_index import METERS_PER_DEGREE_LAT
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Signals are clipped to this dBm window; a missing signal counts as the weakest
+SIGNAL_FLOOR_DBM = -140.0
+SIGNAL_CEILING_DBM = -25.0
+
+
+def locate_devices(snapshot: TowerSnapshot, devices: list[dict]) -> dict[str, Any]:
+    """Weighted-centroid position of each device from the towers it observed
+
+    Every observation is resolved through the snapshot's identity index in one
+    batch. A matched tower weighs its received amplitude (10^(dBm/20)) divided
+    by its range, so strong signals from small cells pull hardest; an
+    observation matching several rows splits its weight between them. The
+    reported accuracy is the weighted RMS of each tower's distance to the
+    estimate combined with its range, which is the range itself for one cell.
+    """
+    device_of, radios, keys, signal = [], [], ([], [], [], []), []
+    for index, entry in enumerate(devices):
+        for observation in entry["cells"]:
+            device_of.append(index)
+            radios.append(observation.get("radio"))
+            for values, field in zip(keys, ("mcc", "net", "area", "cell")):
+                values.append(observation[field])
+            signal.append(observation.get("signal"))
+    device_of = np.asarray(device_of, dtype=np.int64)
+    signal = np.array([np.nan if value is None else value for value in signal], dtype=np.float64)
+
+    observation, positions = snapshot.match_identities(radios, *keys)
+    lon = snapshot.columns["lon"][positions]
+    lat = snapshot.columns["lat"][positions]
+    located = ~(np.isnan(lon) | np.isnan(lat))
+    observation, positions, lon, lat = observation[located], positions[located], lon[located], lat[located]
+
+    ranges = snapshot.columns["range"][positions].astype(np.float64)
+    # Null ranges are INT_NULL, so they land here with the zeros
+    ranges[ranges <= 0] = LOCATE_DEFAULT_RANGE_M
+    ranges = np.maximum(ranges, LOCATE_MIN_RANGE_M)
+    dbm = np.clip(np.nan_to_num(signal[observation], nan=SIGNAL_FLOOR_DBM), SIGNAL_FLOOR_DBM, SIGNAL_CEILING_DBM)
+    weights = 10.0 ** ((dbm - SIGNAL_FLOOR_DBM) / 20.0) / ranges
+    weights /= np.bincount(observation, minlength=len(device_of))[observation]
+
+    device = device_of[observation]
+    count = len(devices)
+    total = np.bincount(device, weights=weights, minlength=count)
+    found = total > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        est_lon = np.bincount(device, weights=weights * lon, minlength=count) / total
+        est_lat = np.bincount(device, weights=weights * lat, minlength=count) / total
+
+    # Local equirectangular distances: towers a device hears are km, not degrees, apart
+    dx = (lon - est_lon[device]) * np.cos(np.radians(est_lat[device])) * METERS_PER_DEGREE_LAT
+    dy = (lat - est_lat[device]) * METERS_PER_DEGREE_LAT
+    spread = np.bincount(device, weights=weights * (dx * dx + dy * dy + ranges * ranges), minlength=count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        accuracy = np.sqrt(spread / total)
+
+    observed = np.bincount(device_of, minlength=count)
+    matched = np.bincount(device_of[np.unique(observation)], minlength=count)
+    towers = np.bincount(device, minlength=count)
+    labels = [str(entry.get("id", index)) for index, entry in enumerate(devices)]
+    results = [
+        {
+            "device": labels[i],
+            "lon": round(float(est_lon[i]), 6),
+            "lat": round(float(est_lat[i]), 6),
+            "accuracy_m": round(float(accuracy[i]), 1),
+            "cells_observed": int(observed[i]),
+            "cells_matched": int(matched[i]),
+            "towers_used": int(towers[i]),
+        }
+        for i in np.flatnonzero(found).tolist()
+    ]
+    logger.info(f"Located {len(results)} of {count} devices from {len(device_of)} observations")
+    return {
+        "located": len(results),
+        "results": results,
+        "not_located": [labels[i] for i in np.flatnonzero(~found).tolist()],
+        "unmatched_cells": int(len(device_of) - matched.sum()),
+    }
@@ -3,21 +3,27 @@
 Cell Tower Signal Intelligence MCP Server
 Provides AI assistants access to cell tower data via Model Context Protocol
 
-This module serves as the main entry point for the MCP server.
+This module serves as the main entry point for the MCP server. It imports only
+what `initialize` and `list_tools` need; the tool implementations and their
+numpy/httpx-backed data layer load on the first tool call (see SERVER_PREWARM).
 """
 
 import asyncio
+import importlib
 import logging
 import sys
+from typing import TYPE_CHECKING
 
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 from mcp.server.models import InitializationOptions
 
-from config import SERVER_NAME, SERVER_VERSION
+from config import SERVER_NAME, SERVER_PREWARM, SERVER_VERSION
 from tool_definitions import ToolDefinitions
-from tool_handler import ToolHandler
+
+if TYPE_CHECKING:
+    from tool_handler import ToolHandler
 
 # Configure logging
 logging.basicConfig(
@@ -30,14 +36,29 @@ logger = logging.getLogger(__name__)
 # Initialize MCP server
 server = Server(SERVER_NAME)
 
-# Initialize tool handler
-tool_handler = ToolHandler()
+# Created on the first tool call
+_tool_handler: "ToolHandler | None" = None
+_prewarm: asyncio.Future | None = None
+
+
+def get_tool_handler() -> "ToolHandler":
+    """The ToolHandler, importing the tool implementations on first use"""
+    global _tool_handler
+    if _tool_handler is None:
+        from tool_handler import ToolHandler
+
+        _tool_handler = ToolHandler()
+    return _tool_handler
 
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available cell tower analysis tools"""
+    global _prewarm
     logger.info("Listing available tools")
+    if SERVER_PREWARM and _prewarm is None:
+        # The client is reading the tool list; load the heavy modules meanwhile
+        _prewarm = asyncio.get_running_loop().run_in_executor(None, importlib.import_module, "tool_handler")
     return ToolDefinitions.get_all_tools()
 
 
@@ -47,7 +68,9 @@ async def handle_call_tool(
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Handle tool execution requests"""
     logger.info(f"Tool called: {name}")
-    return await tool_handler.handle_tool(name, arguments)
+    if _prewarm is not None and _tool_handler is None:
+        await _prewarm
+    return await get_tool_handler().handle_tool(name, arguments)
 
 
 async def main() -> None:
@@ -70,6 +93,12 @@ async def main() -> None:
     except Exception as e:
         logger.error(f"Server error: {e}", exc_info=True)
         raise
+    finally:
+        # Pools and shared memory can only exist once a tool has run
+        if _tool_handler is not None:
+            from offload import offloader
+
+            offloader.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""
+In-process metrics for Cell Tower Signal Intelligence MCP Server
+Per-tool and per-phase latency histograms, backend status counters and payload sizes
+"""
+
+import contextvars
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from config import METRICS_BYTE_BUCKETS, METRICS_ENABLED, METRICS_LATENCY_BUCKETS
+
+LabelSet = tuple[tuple[str, str], ...]
+
+# Name of the tool being executed, so phases timed deep inside the client or
+# the serializer are attributed to the tool that triggered them
+current_tool: contextvars.ContextVar[str] = contextvars.ContextVar("current_tool", default="none")
+
+_NUMERIC_SEGMENT = re.compile(r"^-?\d+$")
+
+
+def route_label(endpoint: str) -> str:
+    """Low-cardinality route for an API path, e.g. "/radio/LTE" -> "/radio/{value}" """
+    segments = [segment for segment in endpoint.strip("/").split("/") if segment]
+    if not segments:
+        return "/"
+    if _NUMERIC_SEGMENT.match(segments[0]):
+        return "/{id}"
+    return "/" + "/".join([segments[0]] + ["{value}"] * (len(segments) - 1))
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative export"""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per upper bound plus the +Inf overflow bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by metric name and label set
+
+    Updates mostly come from the event loop thread, but offloaded work records
+    phases from pool threads, so mutations and exports share a lock.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.counters: dict[str, dict[LabelSet, float]] = {}
+        self.histograms: dict[str, dict[LabelSet, Histogram]] = {}
+        self.help: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, text: str) -> None:
+        self.help[name] = text
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def observe_bytes(self, name: str, size: int, **labels: str) -> None:
+        self.observe(name, size, buckets=METRICS_BYTE_BUCKETS, **labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Record the duration of the block in seconds"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time one phase of the current tool call"""
+        with self.timer("phase_seconds", tool=current_tool.get(), phase=phase):
+            yield
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Nested JSON view: metric -> label string -> value or histogram summary"""
+        with self._lock:
+            return self._to_dict()
+
+    def _to_dict(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": {
+                name: {_label_text(key): value for key, value in sorted(series.items())}
+                for name, series in sorted(self.counters.items())
+            },
+            "histograms": {
+                name: {_label_text(key): histogram.to_dict() for key, histogram in sorted(series.items())}
+                for name, series in sorted(self.histograms.items())
+            },
+        }
+
+    def to_prometheus(self, gauges: dict[str, float] | None = None, prefix: str = "celltower_mcp_") -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            return self._to_prometheus(gauges or {}, prefix)
+
+    def _to_prometheus(self, gauges: dict[str, float], prefix: str) -> str:
+        lines: list[str] = []
+        for name, series in sorted(self.counters.items()):
+            metric = f"{prefix}{name}"
+            lines += self._header(name, metric, "counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{metric}{_prom_labels(key)} {_prom_number(value)}")
+        for name, series in sorted(self.histograms.items()):
+            metric = f"{prefix}{name}"
+            lines += self._header(name, metric, "histogram")
+            for key, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_prom_labels(key, le=_prom_number(bound))} {cumulative}")
+                lines.append(f"{metric}_bucket{_prom_labels(key, le='+Inf')} {histogram.count}")
+                lines.append(f"{metric}_sum{_prom_labels(key)} {_prom_number(histogram.sum)}")
+                lines.append(f"{metric}_count{_prom_labels(key)} {histogram.count}")
+        for name, value in sorted(gauges.items()):
+            metric = f"{prefix}{name}"
+            lines += self._header(name, metric, "gauge")
+            lines.append(f"{metric} {_prom_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name: str, metric: str, kind: str) -> list[str]:
+        lines = [f"# HELP {metric} {self.help[name]}"] if name in self.help else []
+        return lines + [f"# TYPE {metric} {kind}"]
+
+
+def _label_text(key: LabelSet) -> str:
+    return ",".join(f"{k}={v}" for k, v in key) or "all"
+
+
+def _prom_labels(key: LabelSet, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _prom_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+metrics.describe("tool_calls_total", "Tool invocations by tool and outcome")
+metrics.describe("tool_seconds", "End-to-end tool latency in seconds")
+metrics.describe("tool_response_bytes", "Size of the text returned by a tool")
+metrics.describe("phase_seconds", "Time spent per tool in backend, decode, local_query, analysis and serialize phases")
+metrics.describe("backend_requests_total", "Backend HTTP requests by method, route and status")
+metrics.describe("backend_retries_total", "Backend GET retries after transient failures")
+metrics.describe("backend_request_seconds", "Backend HTTP round-trip latency in seconds")
+metrics.describe("backend_response_bytes", "Backend response body size")
+metrics.describe("snapshot_refresh_seconds", "Duration of full snapshot reloads in seconds")
+metrics.describe("snapshot_sync_seconds", "Duration of incremental snapshot syncs in seconds")
+metrics.describe("snapshot_sync_rows", "Rows upserted or deleted by incremental snapshot syncs")
+metrics.describe("offload_wait_seconds", "Time offloaded work waited for a free pool slot")
+metrics.describe("offload_seconds", "Time offloaded work spent in a thread or process pool")
+metrics.describe("neighbor_graph_build_seconds", "Duration of full tower neighbor graph builds in seconds")
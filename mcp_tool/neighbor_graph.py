@@ -0,0 +1,382 @@
+"""
+Neighbor graph for Cell Tower Signal Intelligence MCP Server
+Range-overlap edges between towers of one network in CSR form, kept current from snapshot syncs
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import numpy as np
+
+from config import (
+    NEIGHBOR_BUILD_CHUNK_CELLS,
+    NEIGHBOR_CELL_DEG,
+    NEIGHBOR_CLUSTER_LIMIT,
+    NEIGHBOR_CLUSTER_MAX_IDS,
+    NEIGHBOR_DELTA_MAX_ROWS,
+)
+from coverage_grid import clip_ranges
+from metrics import metrics
+from offload import offloader
+from spatial_index import METERS_PER_DEGREE_LAT, haversine_m
+from tower_model import TowerColumns
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Bits per code in the packed (radio, mcc, net) network key; larger or null codes share the top value
+_CODE_BITS = 20
+
+
+def network_keys(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """One int64 per row identifying its (radio, mcc, net) network"""
+    top = (1 << _CODE_BITS) - 1
+    key = columns["radio"].astype(np.int64)
+    for field in ("mcc", "net"):
+        codes = columns[field]
+        key = (key << _CODE_BITS) | np.where((codes < 0) | (codes > top), top, codes)
+    return key
+
+
+def neighbor_pairs(
+    columns: dict[str, np.ndarray], sources: np.ndarray | None = None, cell_deg: float = NEIGHBOR_CELL_DEG
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row pairs of one network lying within each other's range, with their distance
+
+    Tower points are bucketed by (network, lon/lat cell). Each source tower's
+    range circle looks up the buckets its bounding box covers, so the work
+    follows the candidates near each circle rather than n². A pair is within
+    both ranges only if it is within the smaller one, so over the whole table
+    each pair is found once, from its smaller circle. Given `sources` (after
+    an edit), only their pairs are found, each once.
+    """
+    lon, lat = columns["lon"], columns["lat"]
+    ranges = clip_ranges(columns["range"])
+    network = network_keys(columns)
+    located = ~(np.isnan(lon) | np.isnan(lat))
+    width = int(np.ceil(360 / cell_deg)) + 1
+    height = int(np.ceil(180 / cell_deg)) + 1
+
+    def cell_keys(rows: np.ndarray, cell_y: np.ndarray, cell_x: np.ndarray) -> np.ndarray:
+        return (network[rows] * height + np.clip(cell_y, 0, height - 1)) * width + np.clip(cell_x, 0, width - 1)
+
+    points = np.flatnonzero(located)
+    point_x = np.floor((lon[points] + 180) / cell_deg).astype(np.int64)
+    point_y = np.floor((lat[points] + 90) / cell_deg).astype(np.int64)
+    keys = cell_keys(points, point_y, point_x)
+    order = np.argsort(keys, kind="stable")
+    bucket_keys, bucket_rows = keys[order], points[order]
+
+    whole_table = sources is None
+    if whole_table:
+        sources = np.flatnonzero(located & (ranges > 0))
+    else:
+        is_source = np.zeros(len(lon), dtype=bool)
+        is_source[sources] = True
+        sources = sources[located[sources] & (ranges[sources] > 0)]
+    reach_lat = ranges[sources] / METERS_PER_DEGREE_LAT
+    reach_lon = reach_lat / np.maximum(np.cos(np.radians(lat[sources])), 1e-6)
+    x0 = np.floor((lon[sources] - reach_lon + 180) / cell_deg).astype(np.int64)
+    x1 = np.floor((lon[sources] + reach_lon + 180) / cell_deg).astype(np.int64)
+    y0 = np.floor((lat[sources] - reach_lat + 90) / cell_deg).astype(np.int64)
+    y1 = np.floor((lat[sources] + reach_lat + 90) / cell_deg).astype(np.int64)
+    columns_spanned = x1 - x0 + 1
+    cells = columns_spanned * (y1 - y0 + 1)
+
+    # Sources are processed in chunks of about NEIGHBOR_BUILD_CHUNK_CELLS circle cells to bound memory
+    ends = np.cumsum(cells)
+    total = int(ends[-1]) if len(ends) else 0
+    bounds = np.searchsorted(ends, np.arange(NEIGHBOR_BUILD_CHUNK_CELLS, total, NEIGHBOR_BUILD_CHUNK_CELLS))
+    firsts, seconds, distances = [], [], []
+    for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(sources)]):
+        if start == stop:
+            continue
+        owner, offset = _expand(cells[start:stop])
+        owner += start
+        circle = sources[owner]
+        wanted = cell_keys(
+            circle, y0[owner] + offset // columns_spanned[owner], x0[owner] + offset % columns_spanned[owner]
+        )
+        low = np.searchsorted(bucket_keys, wanted, side="left")
+        high = np.searchsorted(bucket_keys, wanted, side="right")
+        match, step = _expand(high - low)
+        first, second = circle[match], bucket_rows[low[match] + step]
+        if whole_table:
+            keep = (ranges[second] > ranges[first]) | ((ranges[second] == ranges[first]) & (second > first))
+        else:
+            # Pairs of two sources are kept from the lower position only
+            keep = (second != first) & ~(is_source[second] & (second < first))
+        first, second = first[keep], second[keep]
+        distance = haversine_m(lon[first], lat[first], lon[second], lat[second])
+        keep = distance < np.minimum(ranges[first], ranges[second])
+        firsts.append(first[keep])
+        seconds.append(second[keep])
+        distances.append(distance[keep].astype(np.float32))
+    if not firsts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+    return np.concatenate(firsts), np.concatenate(seconds), np.concatenate(distances)
+
+
+class NeighborGraph:
+    """Undirected neighbor edges in CSR form over tower ids
+
+    `ids` are the snapshot's tower ids in ascending order; the neighbors of
+    ids[k] are neighbors[indptr[k]:indptr[k + 1]], nearest first, with their
+    distances in metres.
+    """
+
+    __slots__ = ("ids", "indptr", "neighbors", "distances", "version")
+
+    def __init__(
+        self, ids: np.ndarray, indptr: np.ndarray, neighbors: np.ndarray, distances: np.ndarray, version: int
+    ):
+        self.ids = ids
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.distances = distances
+        self.version = version
+
+    @classmethod
+    def build(cls, columns: dict[str, np.ndarray], version: int) -> "NeighborGraph":
+        first, second, distance = neighbor_pairs(columns)
+        ids = columns["id"]
+        source, target, distance = _sorted_edges(*_directed(ids[first], ids[second], distance))
+        return cls(ids, _indptr(ids, source), target, distance, version)
+
+    def __len__(self) -> int:
+        """Number of undirected edges"""
+        return len(self.neighbors) // 2
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.neighbors.nbytes + self.distances.nbytes
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors_of(self, tower_id: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """Neighbor ids and distances of one tower, nearest first; None if it is not in the graph"""
+        node = int(np.searchsorted(self.ids, tower_id))
+        if node == len(self.ids) or self.ids[node] != tower_id:
+            return None
+        edges = slice(self.indptr[node], self.indptr[node + 1])
+        return self.neighbors[edges], self.distances[edges]
+
+    def with_delta(self, columns: dict[str, np.ndarray], version: int, touched: np.ndarray) -> "NeighborGraph":
+        """The graph after a sync merge that rewrote or deleted the towers with ids `touched`
+
+        Their old edges are dropped and the current ones found from their own
+        range circles. Only the lists that gain an edge are re-sorted; they are
+        inserted among the untouched lists, which keep their order, so a small
+        edit costs a linear pass rather than a sort of every edge.
+        """
+        degrees = self.degrees()
+        source = np.repeat(self.ids, degrees)
+        keep = ~(np.repeat(np.isin(self.ids, touched), degrees) | np.isin(self.neighbors, touched))
+        source, target, distance = source[keep], self.neighbors[keep], self.distances[keep]
+
+        ids = columns["id"]
+        positions = np.searchsorted(ids, touched)
+        present = positions < len(ids)
+        present[present] = ids[positions[present]] == touched[present]
+        first, second, added = neighbor_pairs(columns, positions[present])
+        added_source, added_target, added = _directed(ids[first], ids[second], added)
+
+        regroup = np.isin(source, added_source)
+        moved_source, moved_target, moved = _sorted_edges(
+            np.concatenate([source[regroup], added_source]),
+            np.concatenate([target[regroup], added_target]),
+            np.concatenate([distance[regroup], added]),
+        )
+        rest = ~regroup
+        at = np.searchsorted(source[rest], moved_source)
+        source = np.insert(source[rest], at, moved_source)
+        return NeighborGraph(
+            ids,
+            _indptr(ids, source),
+            np.insert(target[rest], at, moved_target),
+            np.insert(distance[rest], at, moved),
+            version,
+        )
+
+    def components(self) -> np.ndarray:
+        """Per node, the lowest node index of its connected component
+
+        Vectorized union-find: each round hooks the larger of two differing
+        roots under the smaller, then compresses paths to their roots.
+        """
+        parent = np.arange(len(self.ids))
+        source = np.repeat(parent, self.degrees())
+        target = np.searchsorted(self.ids, self.neighbors)
+        while True:
+            root_source, root_target = parent[source], parent[target]
+            differ = root_source != root_target
+            if not differ.any():
+                return parent
+            np.minimum.at(
+                parent, np.maximum(root_source, root_target)[differ], np.minimum(root_source, root_target)[differ]
+            )
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+
+
+class NeighborGraphCache:
+    """The neighbor graph of a snapshot: built on first use, then moved forward by sync deltas
+
+    A reload, or a delta touching more than NEIGHBOR_DELTA_MAX_ROWS towers,
+    leaves the graph behind the snapshot version and it is rebuilt on the
+    next request.
+    """
+
+    def __init__(self, snapshot: TowerSnapshot):
+        self.snapshot = snapshot
+        self.graph: NeighborGraph | None = None
+        self.builds = 0
+        self.deltas = 0
+        self._lock = asyncio.Lock()
+        snapshot.add_delta_listener(self._apply_delta)
+
+    async def get(self) -> NeighborGraph:
+        """The graph at the current snapshot version, whose node order is the snapshot's row order"""
+        async with self._lock:
+            # A sync landing during a build leaves the result behind, so build again
+            while self.graph is None or self.graph.version != self.snapshot.version:
+                started = time.perf_counter()
+                # Columns are replaced, never written, so the worker reads a consistent table
+                self.graph = await offloader.thread(
+                    NeighborGraph.build, self.snapshot.columns, self.snapshot.version, rows=len(self.snapshot)
+                )
+                self.builds += 1
+                elapsed = time.perf_counter() - started
+                metrics.observe("neighbor_graph_build_seconds", elapsed)
+                logger.info(f"Neighbor graph built: {len(self.graph)} edges in {elapsed * 1000:.0f} ms")
+            return self.graph
+
+    def stats(self) -> dict[str, int]:
+        graph = self.graph
+        return {
+            "current": int(graph is not None and graph.version == self.snapshot.version),
+            "edges": len(graph) if graph is not None else 0,
+            "bytes": graph.nbytes if graph is not None else 0,
+            "builds": self.builds,
+            "deltas": self.deltas,
+        }
+
+    def _apply_delta(self, version: int, before: TowerColumns, after: TowerColumns) -> None:
+        if self.graph is None or self.graph.version != version:
+            return
+        touched = np.union1d(before.columns["id"], after.columns["id"])
+        if len(touched) > NEIGHBOR_DELTA_MAX_ROWS:
+            return
+        self.graph = self.graph.with_delta(self.snapshot.columns, self.snapshot.version, touched)
+        self.deltas += 1
+
+
+def tower_neighbors(snapshot: TowerSnapshot, graph: NeighborGraph, tower_id: int, limit: int) -> dict[str, Any]:
+    """One tower and up to `limit` of its neighbors, nearest first"""
+    found = graph.neighbors_of(tower_id)
+    if found is None:
+        raise ValueError(f"Tower {tower_id} not found")
+    neighbor_ids, distances = found
+    tower = snapshot.find_by_id(tower_id)
+    neighbors = snapshot.rows(np.searchsorted(graph.ids, neighbor_ids[:limit]))
+    for neighbor, distance in zip(neighbors, distances[:limit].tolist()):
+        neighbor["distance_m"] = round(distance, 1)
+    return {
+        "tower": tower,
+        "degree": len(neighbor_ids),
+        "returned": len(neighbors),
+        "neighbors": neighbors,
+    }
+
+
+def interference_clusters(
+    snapshot: TowerSnapshot,
+    graph: NeighborGraph,
+    radio: str | None = None,
+    net: int | None = None,
+    min_size: int = 2,
+    limit: int = NEIGHBOR_CLUSTER_LIMIT,
+) -> dict[str, Any]:
+    """Connected components of the neighbor graph, largest first
+
+    Edges only join towers of one network, so every cluster has a single
+    radio, mcc and net and the filters apply to whole clusters.
+    """
+    roots = graph.components()
+    sizes = np.bincount(roots, minlength=len(roots))
+    selected = np.flatnonzero(sizes >= max(min_size, 2))
+    if radio is not None:
+        selected = selected[snapshot.mask_radio(radio)[selected]]
+    if net is not None:
+        selected = selected[snapshot.columns["net"][selected] == int(net)]
+    selected = selected[np.argsort(-sizes[selected], kind="stable")]
+
+    lon, lat = snapshot.columns["lon"], snapshot.columns["lat"]
+    degrees = graph.degrees()
+    # Members of the returned clusters grouped by root, in id order within each
+    shown = selected[:limit]
+    rank = np.full(len(roots), -1)
+    rank[shown] = np.arange(len(shown))
+    members = np.flatnonzero(rank[roots] >= 0)
+    members = members[np.argsort(rank[roots[members]], kind="stable")]
+    starts = np.r_[0, np.cumsum(sizes[shown])]
+
+    results = []
+    for i, root in enumerate(shown.tolist()):
+        nodes = members[starts[i]:starts[i + 1]]
+        first = snapshot.rows(nodes[:1], fields=["radio", "mcc", "net"])[0]
+        results.append({
+            **first,
+            "size": int(sizes[root]),
+            "edges": int(degrees[nodes].sum()) // 2,
+            "centroid": {"lon": round(float(lon[nodes].mean()), 6), "lat": round(float(lat[nodes].mean()), 6)},
+            "bounds": {
+                "min_lon": float(lon[nodes].min()),
+                "max_lon": float(lon[nodes].max()),
+                "min_lat": float(lat[nodes].min()),
+                "max_lat": float(lat[nodes].max()),
+            },
+            "tower_ids": graph.ids[nodes[:NEIGHBOR_CLUSTER_MAX_IDS]].tolist(),
+        })
+    logger.info(f"Neighbor graph: {len(selected)} clusters of at least {min_size} towers")
+    return {
+        "clusters": len(selected),
+        "towers": int(sizes[selected].sum()),
+        "edges": len(graph),
+        "returned": len(results),
+        "truncated": len(selected) > limit,
+        "results": results,
+    }
+
+
+def _directed(
+    first: np.ndarray, second: np.ndarray, distance: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Both directions of undirected edges"""
+    return np.concatenate([first, second]), np.concatenate([second, first]), np.concatenate([distance, distance])
+
+
+def _sorted_edges(
+    source: np.ndarray, target: np.ndarray, distance: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Directed edges ordered by source, then distance, then target"""
+    order = np.lexsort((target, distance, source))
+    return source[order], target[order], distance[order]
+
+
+def _indptr(ids: np.ndarray, source: np.ndarray) -> np.ndarray:
+    # Every source is one of `ids`, so a node's edges end where the next node's begin
+    return np.append(np.searchsorted(source, ids), len(source))
+
+
+def _expand(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """For counts [2, 3]: owners [0, 0, 1, 1, 1] and offsets [0, 1, 0, 1, 2]"""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    return owner, np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
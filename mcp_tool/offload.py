@@ -0,0 +1,258 @@
+"""
+Executor layer for Cell Tower Signal Intelligence MCP Server
+Moves CPU-heavy steps off the event loop into bounded thread and process pools
+"""
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+import numpy as np
+
+from config import (
+    OFFLOAD_MAX_PENDING,
+    OFFLOAD_MIN_ROWS,
+    OFFLOAD_MODE,
+    OFFLOAD_PROCESS_WORKERS,
+    OFFLOAD_START_METHOD,
+    OFFLOAD_THREAD_WORKERS,
+)
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+OFFLOAD_MODES: tuple[str, ...] = ("auto", "thread", "inline")
+
+# (name, dtype, shape, byte offset) of each array in a shared block
+ArrayLayout = tuple[tuple[str, str, tuple[int, ...], int], ...]
+SharedHandle = tuple[str, ArrayLayout]
+
+_ALIGNMENT = 64
+
+
+class SharedArrays:
+    """Numpy arrays packed into one shared-memory block
+
+    The owner builds it with `create` and passes the small picklable `handle`
+    to workers instead of the arrays; `attach` maps the same block into the
+    worker as zero-copy read-only views. Only the owner unlinks the block.
+    """
+
+    __slots__ = ("shm", "arrays", "layout", "owner")
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: ArrayLayout, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays: dict[str, np.ndarray] = {}
+        for name, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            if not owner:
+                view.flags.writeable = False
+            self.arrays[name] = view
+
+    @classmethod
+    def create(cls, arrays: dict[str, np.ndarray]) -> "SharedArrays":
+        layout = []
+        size = 0
+        for name, array in arrays.items():
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm, tuple(layout), owner=True)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedHandle) -> "SharedArrays":
+        """Map a block created by another process, reusing this process's last mapping"""
+        name, layout = handle
+        shared = _attached.get(name)
+        if shared is None:
+            # Workers only ever need the newest block, so older mappings are dropped
+            for stale in _attached.values():
+                stale.close()
+            _attached.clear()
+            shared = _attached[name] = cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+        return shared
+
+    @property
+    def handle(self) -> SharedHandle:
+        return self.shm.name, self.layout
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def close(self) -> None:
+        """Release the mapping; the owner also removes the block"""
+        self.arrays.clear()
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes when it does
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+_attached: dict[str, SharedArrays] = {}
+
+
+class Offloader:
+    """Runs blocking work on a thread or process pool with bounded queueing
+
+    `thread` suits Python loops over dicts, which the interpreter interleaves
+    with the event loop; `process` suits work on bytes or numpy arrays, whose
+    arguments and results pickle cheaply. Work below OFFLOAD_MIN_ROWS rows
+    runs inline, where a pool hop would cost more than it saves. Each pool
+    admits OFFLOAD_MAX_PENDING tasks; `submit` waits for a slot, so a producer
+    feeding the pool slows down instead of piling up queued payloads.
+    """
+
+    def __init__(
+        self,
+        mode: str = OFFLOAD_MODE,
+        min_rows: int = OFFLOAD_MIN_ROWS,
+        thread_workers: int = OFFLOAD_THREAD_WORKERS,
+        process_workers: int = OFFLOAD_PROCESS_WORKERS,
+        max_pending: int = OFFLOAD_MAX_PENDING,
+        start_method: str = OFFLOAD_START_METHOD,
+    ):
+        if mode not in OFFLOAD_MODES:
+            logger.warning(f"Unknown OFFLOAD_MODE {mode!r}, running work inline")
+            mode = "inline"
+        self.mode = mode
+        self.min_rows = min_rows
+        self.thread_workers = max(thread_workers, 1)
+        self.process_workers = max(process_workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self.start_method = start_method
+        self._executors: dict[str, Executor] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._shared: dict[str, SharedArrays] = {}
+        self._pending = {"thread": 0, "process": 0}
+        self._completed = {"inline": 0, "thread": 0, "process": 0}
+
+    @property
+    def process_parallelism(self) -> int:
+        """Worker processes available to split array work across"""
+        return self.process_workers if self.mode == "auto" else 1
+
+    def pool_for(self, kind: str, rows: int | None) -> str:
+        """Where work of `kind` ("thread" or "process") over `rows` rows runs; None rows = always heavy"""
+        if self.mode == "inline" or (rows is not None and rows < self.min_rows):
+            return "inline"
+        return "process" if kind == "process" and self.mode == "auto" else "thread"
+
+    async def thread(self, func: Callable, *args: Any, rows: int | None = None) -> Any:
+        return await (await self.submit("thread", func, *args, rows=rows))
+
+    async def process(self, func: Callable, *args: Any, rows: int | None = None) -> Any:
+        """Run a picklable module-level function; arguments should be bytes, arrays or handles"""
+        return await (await self.submit("process", func, *args, rows=rows))
+
+    async def submit(self, kind: str, func: Callable, *args: Any, rows: int | None = None) -> asyncio.Future:
+        """Queue work once a slot is free and return its future without waiting for the result"""
+        loop = asyncio.get_running_loop()
+        pool = self.pool_for(kind, rows)
+        if pool == "inline":
+            future = loop.create_future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            self._completed["inline"] += 1
+            return future
+
+        if loop is not self._loop:
+            # Semaphores belong to one event loop
+            self._loop = loop
+            self._slots.clear()
+        slots = self._slots.get(pool)
+        if slots is None:
+            slots = self._slots[pool] = asyncio.Semaphore(self.max_pending)
+        queued = time.perf_counter()
+        await slots.acquire()
+        metrics.observe("offload_wait_seconds", time.perf_counter() - queued, pool=pool)
+        self._pending[pool] += 1
+        try:
+            call = partial(func, *args)
+            if pool == "thread":
+                # Keep the tool label for metrics recorded inside the worker thread
+                call = partial(contextvars.copy_context().run, call)
+            future = loop.run_in_executor(self._executor(pool), call)
+        except BaseException:
+            self._release(pool, slots)
+            raise
+        started = time.perf_counter()
+
+        def done(_: asyncio.Future) -> None:
+            metrics.observe("offload_seconds", time.perf_counter() - started, pool=pool)
+            self._completed[pool] += 1
+            self._release(pool, slots)
+
+        future.add_done_callback(done)
+        return future
+
+    def _release(self, pool: str, slots: asyncio.Semaphore) -> None:
+        self._pending[pool] -= 1
+        slots.release()
+
+    def _executor(self, pool: str) -> Executor:
+        executor = self._executors.get(pool)
+        if executor is None:
+            if pool == "process":
+                context = multiprocessing.get_context(self.start_method or None)
+                executor = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=context)
+                logger.info(f"Offload process pool started with {self.process_workers} workers ({context.get_start_method()})")
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="offload")
+            self._executors[pool] = executor
+        return executor
+
+    def share(self, arrays: dict[str, np.ndarray]) -> SharedArrays:
+        """Copy arrays into a shared block that lives until `release` or `shutdown`"""
+        shared = SharedArrays.create(arrays)
+        self._shared[shared.shm.name] = shared
+        return shared
+
+    def release(self, shared: SharedArrays) -> None:
+        self._shared.pop(shared.shm.name, None)
+        shared.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "min_rows": self.min_rows,
+            "max_pending": self.max_pending,
+            "pools_started": sorted(self._executors),
+            "pending": dict(self._pending),
+            "completed": dict(self._completed),
+            "shared_blocks": len(self._shared),
+            "shared_bytes": sum(shared.nbytes for shared in self._shared.values()),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads and processes and remove shared blocks"""
+        for executor in self._executors.values():
+            executor.shutdown(cancel_futures=True)
+        self._executors.clear()
+        self._slots.clear()
+        for shared in list(self._shared.values()):
+            self.release(shared)
+
+
+offloader = Offloader()
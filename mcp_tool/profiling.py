@@ -0,0 +1,160 @@
+"""
+Runtime profiler hooks for Cell Tower Signal Intelligence MCP Server
+cProfile or a low-overhead stack sampler, switched on and off while the server runs
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from config import PROFILER_SAMPLE_INTERVAL, PROFILER_TOP_FUNCTIONS
+
+logger = logging.getLogger(__name__)
+
+PROFILER_MODES: tuple[str, ...] = ("cprofile", "sampling")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Periodically captures the stack of one thread from a background thread
+
+    Costs one stack walk per interval instead of a hook on every call, so it
+    can stay on under production load.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILER_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.self_counts: Counter[str] = Counter()
+        self.total_counts: Counter[str] = Counter()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.samples += 1
+            self.self_counts[labels[0]] += 1
+            self.total_counts.update(set(labels))
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def report(self, top: int) -> dict[str, Any]:
+        def share(count: int) -> float:
+            return round(100.0 * count / self.samples, 2) if self.samples else 0.0
+
+        return {
+            "samples": self.samples,
+            "interval_seconds": self.interval,
+            "top_self": [
+                {"function": label, "samples": count, "percent": share(count)}
+                for label, count in self.self_counts.most_common(top)
+            ],
+            "top_cumulative": [
+                {"function": label, "samples": count, "percent": share(count)}
+                for label, count in self.total_counts.most_common(top)
+            ],
+            # Collapsed "a;b;c count" lines, ready for flamegraph tooling
+            "collapsed_stacks": [f"{stack} {count}" for stack, count in self.stacks.most_common(top)],
+        }
+
+
+class Profiler:
+    """Single active profiling session, started and stopped at runtime"""
+
+    def __init__(self):
+        self.mode: str | None = None
+        self.started_at: float | None = None
+        self._profile: cProfile.Profile | None = None
+        self._sampler: SamplingProfiler | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.mode is not None
+
+    def start(self, mode: str) -> dict[str, Any]:
+        """Begin profiling the calling (event loop) thread"""
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler mode '{mode}'. Expected one of: {', '.join(PROFILER_MODES)}")
+        if self.running:
+            raise ValueError(f"Profiler already running in {self.mode} mode")
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = SamplingProfiler(threading.get_ident())
+            self._sampler.start()
+        self.mode = mode
+        self.started_at = time.perf_counter()
+        logger.info(f"Profiler started in {mode} mode")
+        return self.status()
+
+    def stop(self, top: int = PROFILER_TOP_FUNCTIONS) -> dict[str, Any]:
+        """End the session and return its report"""
+        if not self.running:
+            raise ValueError("Profiler is not running")
+        duration = time.perf_counter() - self.started_at
+        if self._profile is not None:
+            self._profile.disable()
+            report = self._cprofile_report(self._profile, top)
+        else:
+            self._sampler.stop()
+            report = self._sampler.report(top)
+        report = {"mode": self.mode, "duration_seconds": round(duration, 3), **report}
+        logger.info(f"Profiler stopped after {duration:.1f}s")
+        self.mode = None
+        self.started_at = None
+        self._profile = None
+        self._sampler = None
+        return report
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "mode": self.mode,
+            "elapsed_seconds": round(time.perf_counter() - self.started_at, 3) if self.running else None,
+        }
+
+    @staticmethod
+    def _cprofile_report(profile: cProfile.Profile, top: int) -> dict[str, Any]:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        return {
+            "total_calls": stats.total_calls,
+            "total_seconds": round(stats.total_tt, 6),
+            "top_cumulative": [
+                {
+                    "function": f"{name} ({filename}:{line})",
+                    "calls": calls,
+                    "self_seconds": round(self_time, 6),
+                    "cumulative_seconds": round(cumulative, 6),
+                }
+                for (filename, line, name), (_, calls, self_time, cumulative, _) in rows
+            ],
+        }
+
+
+profiler = Profiler()
@@ -0,0 +1,429 @@
+"""
+Query planner for Cell Tower Signal Intelligence MCP Server
+Evaluates conjunctive tower predicates with projection, sort and limit
+"""
+
+import heapq
+import logging
+import math
+from typing import Any, AsyncGenerator
+
+import numpy as np
+
+from api_client import APIClient
+from config import QUERY_SCAN_PAGE_SIZE
+from metrics import metrics
+from tower_model import INT_NULL, RADIO_NULL
+from tower_schema import FIELD_ORDER, FLOAT_FIELDS, QUERY_FIELDS, QUERY_OPERATORS
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+_SYMBOLS = {"eq": "=", "ne": "!=", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+# Fraction of the table each predicate is assumed to keep when no snapshot is
+# loaded to count it exactly. Only the ordering matters: a cell id is nearly
+# unique, a bounding box is usually a city, and the seed data is one country.
+_PRIOR_SELECTIVITY = {"cell": 0.001, "id": 0.001, "area": 0.02, "bbox": 0.05, "net": 0.2, "radio": 0.3}
+_DEFAULT_SELECTIVITY = 0.5
+
+# (value, inclusive) pairs bounding a closed/open interval of column values
+Interval = tuple[tuple[Any, bool], tuple[Any, bool]]
+
+
+def _radio_name(value: Any) -> str:
+    return str(value).strip().upper()
+
+
+class FieldPredicate:
+    """One `field <op> value` condition; nulls never match, as in SQL"""
+
+    __slots__ = ("field", "op", "value")
+
+    def __init__(self, field: str, op: str, value: Any):
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Unknown query field '{field}'. Expected one of: {', '.join(QUERY_FIELDS)}")
+        if op not in QUERY_OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'. Expected one of: {', '.join(QUERY_OPERATORS)}")
+        if field == "radio" and op not in ("eq", "ne", "in"):
+            raise ValueError("radio only supports the eq, ne and in operators")
+        self.field = field
+        self.op = op
+        self.value = self._normalize(field, op, value)
+
+    @staticmethod
+    def _normalize(field: str, op: str, value: Any) -> Any:
+        # Radio names are stored upper-case, so "lte" must match (and push down as) LTE
+        convert = _radio_name if field == "radio" else float if field in FLOAT_FIELDS else int
+        try:
+            if op == "between":
+                if not isinstance(value, list) or len(value) != 2:
+                    raise ValueError
+                low, high = convert(value[0]), convert(value[1])
+                return (low, high) if low <= high else (high, low)
+            if op == "in":
+                if not isinstance(value, list) or not value:
+                    raise ValueError
+                return tuple(dict.fromkeys(convert(item) for item in value))
+            if value is None or isinstance(value, (list, dict, bool)):
+                raise ValueError
+            number = convert(value)
+        except (TypeError, ValueError):
+            shape = "a [low, high] pair" if op == "between" else "a non-empty list" if op == "in" else "a value"
+            raise ValueError(f"{field} {op} expects {shape}") from None
+        if isinstance(number, float) and not math.isfinite(number):
+            raise ValueError(f"{field} {op} expects a finite number")
+        return number
+
+    def describe(self) -> str:
+        if self.op == "between":
+            return f"{self.field} between {self.value[0]} and {self.value[1]}"
+        if self.op == "in":
+            return f"{self.field} in ({', '.join(map(str, self.value))})"
+        return f"{self.field} {_SYMBOLS[self.op]} {self.value}"
+
+    def test(self, tower: dict) -> bool:
+        """Row-at-a-time check used on backend results"""
+        value = tower.get(self.field)
+        if value is None:
+            return False
+        op, target = self.op, self.value
+        if op == "eq":
+            return value == target
+        if op == "ne":
+            return value != target
+        if op == "lt":
+            return value < target
+        if op == "lte":
+            return value <= target
+        if op == "gt":
+            return value > target
+        if op == "gte":
+            return value >= target
+        if op == "between":
+            return target[0] <= value <= target[1]
+        return value in target
+
+    def intervals(self, snapshot: TowerSnapshot) -> list[Interval]:
+        """Value intervals matched by this predicate in the snapshot's column encoding"""
+        value = self.value
+        if self.field == "radio":
+            names = snapshot.radio_names
+            wanted = value if self.op == "in" else (value,)
+            codes = [names.index(name) for name in wanted if name in names and name != RADIO_NULL]
+            if self.op == "ne":
+                codes = [code for code, name in enumerate(names) if code not in codes and name != RADIO_NULL]
+            return [((code, True), (code, True)) for code in codes]
+
+        # The lower default skips INT_NULL / sorts below real values; NaN sorts above +inf
+        low = (-math.inf, True) if self.field in FLOAT_FIELDS else (INT_NULL, False)
+        high = (math.inf, True)
+        if self.op == "eq":
+            return [((value, True), (value, True))]
+        if self.op == "ne":
+            return [(low, (value, False)), ((value, False), high)]
+        if self.op == "lt":
+            return [(low, (value, False))]
+        if self.op == "lte":
+            return [(low, (value, True))]
+        if self.op == "gt":
+            return [((value, False), high)]
+        if self.op == "gte":
+            return [((value, True), high)]
+        if self.op == "between":
+            return [((value[0], True), (value[1], True))]
+        return [((item, True), (item, True)) for item in sorted(value)]
+
+    def count(self, snapshot: TowerSnapshot) -> int:
+        return snapshot.column_index(self.field).count(self.intervals(snapshot))
+
+    def positions(self, snapshot: TowerSnapshot) -> np.ndarray:
+        return snapshot.column_index(self.field).positions(self.intervals(snapshot))
+
+    def mask(self, snapshot: TowerSnapshot, positions: np.ndarray) -> np.ndarray:
+        """Which of the given rows satisfy the predicate"""
+        values = snapshot.columns[self.field][positions]
+        keep = np.zeros(len(positions), dtype=bool)
+        for (low, low_inclusive), (high, high_inclusive) in self.intervals(snapshot):
+            above = values >= low if low_inclusive else values > low
+            below = values <= high if high_inclusive else values < high
+            keep |= above & below
+        return keep
+
+    def prior(self) -> float:
+        if self.op in ("eq", "in"):
+            selectivity = _PRIOR_SELECTIVITY.get(self.field, _DEFAULT_SELECTIVITY / 5)
+            return min(selectivity * (len(self.value) if self.op == "in" else 1), 1.0)
+        if self.op == "between" and self.field == "averageSignal":
+            # Signals spread over roughly 100 dBm
+            return min(max((self.value[1] - self.value[0] + 1) / 100, 0.01), 1.0)
+        if self.op == "ne":
+            return 1.0
+        return _DEFAULT_SELECTIVITY
+
+    def endpoint(self) -> tuple[str, dict | None] | None:
+        """Backend route answering exactly this predicate, if there is one"""
+        field, op, value = self.field, self.op, self.value
+        if op == "eq" and field in ("radio", "mcc"):
+            return f"/{field}/{value}", None
+        if field == "averageSignal" and op in ("eq", "between"):
+            low, high = (value, value) if op == "eq" else value
+            return "/signal", {"minSignal": low, "maxSignal": high}
+        if field == "samples" and op in ("gt", "gte"):
+            # /samples/{n} is strictly greater than n
+            return f"/samples/{value if op == 'gt' else value - 1}", None
+        return None
+
+
+class BoxPredicate:
+    """Inclusive lon/lat bounding box, answered by the grid index or /location"""
+
+    __slots__ = ("min_lon", "max_lon", "min_lat", "max_lat")
+
+    field = "bbox"
+
+    def __init__(self, min_lon: float, max_lon: float, min_lat: float, max_lat: float):
+        self.min_lon = float(min_lon)
+        self.max_lon = float(max_lon)
+        self.min_lat = float(min_lat)
+        self.max_lat = float(max_lat)
+
+    def describe(self) -> str:
+        return f"bbox [{self.min_lon}, {self.max_lon}] x [{self.min_lat}, {self.max_lat}]"
+
+    def test(self, tower: dict) -> bool:
+        lon, lat = tower.get("lon"), tower.get("lat")
+        if lon is None or lat is None:
+            return False
+        return self.min_lon <= lon <= self.max_lon and self.min_lat <= lat <= self.max_lat
+
+    def count(self, snapshot: TowerSnapshot) -> int:
+        return len(self.positions(snapshot))
+
+    def positions(self, snapshot: TowerSnapshot) -> np.ndarray:
+        return snapshot.spatial_index.bbox(self.min_lon, self.max_lon, self.min_lat, self.max_lat)
+
+    def mask(self, snapshot: TowerSnapshot, positions: np.ndarray) -> np.ndarray:
+        lon = snapshot.columns["lon"][positions]
+        lat = snapshot.columns["lat"][positions]
+        return (lon >= self.min_lon) & (lon <= self.max_lon) & (lat >= self.min_lat) & (lat <= self.max_lat)
+
+    def prior(self) -> float:
+        return _PRIOR_SELECTIVITY["bbox"]
+
+    def endpoint(self) -> tuple[str, dict | None]:
+        return "/location", {
+            "minLon": self.min_lon,
+            "maxLon": self.max_lon,
+            "minLat": self.min_lat,
+            "maxLat": self.max_lat,
+        }
+
+
+Predicate = FieldPredicate | BoxPredicate
+
+
+class TowerQuery:
+    """Conjunction of predicates plus projection, sort order and row limit"""
+
+    def __init__(
+        self,
+        predicates: list[Predicate],
+        fields: list[str] | None = None,
+        sort_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+    ):
+        for field in fields or ():
+            if field not in FIELD_ORDER:
+                raise ValueError(f"Unknown field '{field}' in fields")
+        if sort_by is not None and sort_by not in QUERY_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Expected one of: {', '.join(QUERY_FIELDS)}")
+        self.predicates = predicates
+        self.fields = list(dict.fromkeys(fields)) if fields else None
+        self.sort_by = sort_by
+        self.descending = descending
+        self.limit = limit
+
+    @classmethod
+    def from_args(cls, args: dict, limit: int | None = None) -> "TowerQuery":
+        """Build from query_towers tool arguments"""
+        predicates: list[Predicate] = [
+            FieldPredicate(item["field"], item["op"], item.get("value"))
+            for item in args.get("where", [])
+        ]
+        box = args.get("bbox")
+        if box is not None:
+            predicates.append(BoxPredicate(box["min_lon"], box["max_lon"], box["min_lat"], box["max_lat"]))
+        return cls(
+            predicates,
+            fields=args.get("fields"),
+            sort_by=args.get("sort_by"),
+            descending=args.get("sort_direction", "asc") == "desc",
+            limit=args.get("limit", limit),
+        )
+
+    def project(self, tower: dict) -> dict:
+        if self.fields is None:
+            return tower
+        return {field: tower.get(field) for field in self.fields}
+
+
+class QueryPlanner:
+    """Chooses the most selective predicate to drive a query, then filters the rest
+
+    With a snapshot, every predicate's match count is read exactly from the
+    sorted column indexes (or the grid index for boxes); the smallest one
+    yields the candidate rows and the others are applied as masks, cheapest
+    first. Without a snapshot, the predicate with the lowest prior selectivity
+    that maps onto a backend filter endpoint is pushed down; when none does,
+    the paged endpoint is scanned and filtered page by page, stopping early
+    once an unsorted limit is reached.
+    """
+
+    def __init__(self, api_client: APIClient | None = None):
+        self.api_client = api_client or APIClient()
+
+    def run_local(self, query: TowerQuery, snapshot: TowerSnapshot) -> dict[str, Any]:
+        """Evaluate a query against the snapshot's column and grid indexes"""
+        plan, positions, matched = self.match_local(query, snapshot)
+        return self._result(plan, snapshot.rows(positions, query.fields), matched)
+
+    def match_local(self, query: TowerQuery, snapshot: TowerSnapshot) -> tuple[dict[str, Any], np.ndarray, int]:
+        """Plan, matching row positions (sorted and limited) and total match count on the snapshot"""
+        estimates = sorted(
+            ((predicate.count(snapshot), index, predicate) for index, predicate in enumerate(query.predicates)),
+            key=lambda item: item[:2],
+        )
+        if estimates:
+            _, _, driver = estimates[0]
+            positions = driver.positions(snapshot)
+            for _, _, predicate in estimates[1:]:
+                if not len(positions):
+                    break
+                positions = positions[predicate.mask(snapshot, positions)]
+        else:
+            driver = None
+            positions = np.arange(len(snapshot))
+
+        matched = len(positions)
+        if query.sort_by is not None:
+            positions = self._sort_positions(snapshot, positions, query.sort_by, query.descending, query.limit)
+        if query.limit is not None:
+            positions = positions[:query.limit]
+
+        plan = {
+            "source": "snapshot",
+            "driver": driver.describe() if driver is not None else "full scan",
+            "access": "grid index" if isinstance(driver, BoxPredicate) else "sorted column index" if driver else "scan",
+            "estimates": {predicate.describe(): count for count, _, predicate in estimates},
+        }
+        return plan, positions, matched
+
+    async def run_remote(self, query: TowerQuery) -> dict[str, Any]:
+        """Evaluate a query against the backend, pushing down one predicate"""
+        pushable = [
+            (predicate.prior(), index, predicate)
+            for index, predicate in enumerate(query.predicates)
+            if predicate.endpoint() is not None
+        ]
+        driver = min(pushable, key=lambda item: item[:2])[2] if pushable else None
+        residual = [predicate for predicate in query.predicates if predicate is not driver]
+        # Cheap, selective checks first so most rows are rejected early
+        residual.sort(key=lambda predicate: predicate.prior())
+
+        if driver is not None:
+            endpoint, params = driver.endpoint()
+            logger.info(f"Query pushdown: {endpoint} {params or ''}")
+            pages = self._single_page(endpoint, params)
+            source = f"backend {endpoint}"
+        else:
+            pages = self.api_client.iter_pages(page_size=QUERY_SCAN_PAGE_SIZE)
+            source = "backend /paged scan"
+
+        towers, matched = await self._collect(pages, residual, query, stop_early=driver is None)
+        plan = {
+            "source": source,
+            "driver": driver.describe() if driver is not None else "full scan",
+            "residual": [predicate.describe() for predicate in residual],
+        }
+        return self._result(plan, [query.project(tower) for tower in towers], matched)
+
+    async def _single_page(self, endpoint: str, params: dict | None) -> AsyncGenerator[list[dict], None]:
+        yield await self.api_client.get(endpoint, params=params)
+
+    @staticmethod
+    async def _collect(
+        pages: AsyncGenerator[list[dict], None],
+        residual: list[Predicate],
+        query: TowerQuery,
+        stop_early: bool,
+    ) -> tuple[list[dict], int | None]:
+        """Filter pages as they arrive, keeping at most `limit` rows when sorting
+
+        Returns the kept rows and the number of matches, which is None when an
+        unsorted scan (`stop_early`) stopped reading before the end of the table.
+        """
+        limit, sort_by = query.limit, query.sort_by
+        kept: list[dict] = []
+        matched = 0
+        async for page in pages:
+            with metrics.phase("local_query"):
+                hits = [tower for tower in page if all(predicate.test(tower) for predicate in residual)]
+                matched += len(hits)
+                if sort_by is None:
+                    kept.extend(hits)
+                    if stop_early and limit is not None and len(kept) >= limit:
+                        await pages.aclose()
+                        return kept[:limit], None
+                elif limit is None:
+                    kept.extend(hits)
+                else:
+                    kept = _top(kept + hits, sort_by, query.descending, limit)
+        if sort_by is not None and limit is None:
+            kept = _top(kept, sort_by, query.descending, None)
+        return kept if limit is None else kept[:limit], matched
+
+    @staticmethod
+    def _sort_positions(
+        snapshot: TowerSnapshot, positions: np.ndarray, field: str, descending: bool, limit: int | None
+    ) -> np.ndarray:
+        """Stable sort of row positions by one column, nulls last in either direction"""
+        values = snapshot.columns[field][positions]
+        if field in FLOAT_FIELDS:
+            nulls = np.isnan(values)
+            keys = np.where(nulls, 0.0, values)
+        else:
+            nulls = values == INT_NULL if values.dtype == np.int64 else np.zeros(len(values), dtype=bool)
+            keys = np.where(nulls, 0, values).astype(np.int64)
+        if descending:
+            keys = -keys
+        order = np.lexsort((keys, nulls))
+        if limit is not None:
+            order = order[:limit]
+        return positions[order]
+
+    @staticmethod
+    def _result(plan: dict, towers: list[dict], matched: int | None) -> dict[str, Any]:
+        return {
+            "plan": plan,
+            "matched": matched,
+            "returned": len(towers),
+            "truncated": matched is None or len(towers) < matched,
+            "towers": towers,
+        }
+
+
+def _top(towers: list[dict], field: str, descending: bool, limit: int | None) -> list[dict]:
+    """Rows ordered by `field` with nulls last, cut to `limit`"""
+    present = [tower for tower in towers if tower.get(field) is not None]
+    missing = [tower for tower in towers if tower.get(field) is None]
+    key = lambda tower: tower[field]
+    if limit is None:
+        present.sort(key=key, reverse=descending)
+    elif descending:
+        present = heapq.nlargest(limit, present, key=key)
+    else:
+        present = heapq.nsmallest(limit, present, key=key)
+    ordered = present + missing
+    return ordered if limit is None else ordered[:limit]
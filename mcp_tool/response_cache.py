@@ -0,0 +1,146 @@
+"""
+Response cache for Cell Tower Signal Intelligence MCP Server
+TTL + LRU cache of GET responses with in-flight request coalescing
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from config import CACHE_DEFAULT_TTL, CACHE_ENDPOINT_TTLS, CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+# Endpoints addressing a single tower by database id, e.g. "/42"
+_TOWER_ID_PATH = re.compile(r"^/\d+$")
+
+
+class ResponseCache:
+    """Size-bounded LRU of parsed GET responses with per-endpoint TTLs
+
+    Concurrent requests for the same key share one backend call. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        default_ttl: float = CACHE_DEFAULT_TTL,
+        endpoint_ttls: dict[str, float] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(CACHE_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls)
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[CacheKey, asyncio.Future] = {}
+        # Bumped on every invalidation so responses that were in flight during
+        # a write are not stored afterwards
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict | None = None) -> CacheKey:
+        """Normalize endpoint and query parameters into a hashable key"""
+        path = "/" + endpoint.strip("/") if endpoint.strip("/") else ""
+        normalized = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return path, normalized
+
+    def ttl_for(self, path: str) -> float:
+        """TTL configured for the first path segment, e.g. "/radio" for "/radio/LTE" """
+        segment = "/" + path.strip("/").split("/", 1)[0] if path.strip("/") else ""
+        return self.endpoint_ttls.get(segment, self.default_ttl)
+
+    async def get_or_fetch(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a fresh cached value or run `fetch` once for all concurrent callers"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            pending = asyncio.ensure_future(self._fetch(key, fetch))
+            pending.add_done_callback(_consume_exception)
+            self._in_flight[key] = pending
+        # The fetch is its own task: a cancelled caller stops waiting without cancelling it for the others
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        try:
+            value = await fetch()
+        finally:
+            self._in_flight.pop(key, None)
+        if generation == self._generation:
+            self._store(key, value)
+        return value
+
+    def invalidate(self, endpoint: str | None = None) -> None:
+        """Drop entries a write may have changed
+
+        Every collection query may include the written tower, so all of them
+        are dropped; single-tower entries for other ids are kept.
+        """
+        target = self.make_key(endpoint)[0] if endpoint is not None else None
+        stale = [
+            key for key in self._entries
+            if not _TOWER_ID_PATH.match(key[0]) or key[0] == target
+        ]
+        for key in stale:
+            del self._entries[key]
+        self._generation += 1
+        self.invalidations += 1
+        logger.debug(f"Cache invalidated for {endpoint or 'all queries'}: {len(stale)} entries dropped")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for tuning cache size and TTLs"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _consume_exception(task: asyncio.Future) -> None:
+    # Mark a failure retrieved so an error whose callers were all cancelled is not reported
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,132 @@
+"""
+Response encoding for Cell Tower Signal Intelligence MCP Server
+Serializes tool results as pretty/compact JSON, columnar JSON, CSV or a summary preview
+"""
+
+import csv
+import io
+import json
+from typing import Any
+
+from config import DEFAULT_RESPONSE_FORMAT, SUMMARY_PREVIEW_ROWS
+from metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+RESPONSE_FORMATS: tuple[str, ...] = ("json", "compact", "columnar", "csv", "summary")
+
+
+def dumps(data: Any, pretty: bool = False) -> str:
+    """JSON-encode with orjson when installed, falling back to the stdlib"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option).decode()
+    if pretty:
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(",", ":"))
+
+
+def format_payload(data: Any, fmt: str | None = None) -> str:
+    """Render a tool result in the requested format"""
+    with metrics.phase("serialize"):
+        return _render(data, fmt or DEFAULT_RESPONSE_FORMAT)
+
+
+async def render_payload(data: Any, fmt: str | None = None) -> str:
+    """format_payload, moved to the offload thread pool when the result holds a large tower list"""
+    # Imported on first use: tool_definitions imports this module while the
+    # server builds its tool list, before numpy is needed
+    from offload import offloader
+
+    rows = find_table(data)
+    return await offloader.thread(format_payload, data, fmt, rows=len(rows) if rows else 0)
+
+
+def _render(data: Any, fmt: str) -> str:
+    if fmt == "json":
+        return dumps(data, pretty=True)
+    if fmt == "compact":
+        return dumps(data)
+    if fmt == "columnar":
+        return dumps(_map_tables(data, to_columnar))
+    if fmt == "csv":
+        rows = find_table(data)
+        return to_csv(rows) if rows is not None else dumps(data)
+    if fmt == "summary":
+        return dumps(_map_tables(data, summarize))
+    raise ValueError(f"Unknown format '{fmt}'. Expected one of: {', '.join(RESPONSE_FORMATS)}")
+
+
+def to_columnar(rows: list[dict]) -> dict[str, Any]:
+    """One key list plus row arrays instead of repeating keys per row"""
+    columns = _columns(rows)
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+    }
+
+
+def to_csv(rows: list[dict]) -> str:
+    columns = _columns(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows([row.get(column) for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+def summarize(rows: list[dict]) -> dict[str, Any]:
+    """Total count plus the first few rows"""
+    return {
+        "total_count": len(rows),
+        "fields": _columns(rows),
+        "preview": rows[:SUMMARY_PREVIEW_ROWS],
+    }
+
+
+def _is_table(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(row, dict) for row in value)
+
+
+def _map_tables(data: Any, transform) -> Any:
+    """Apply `transform` to the result itself or to its top-level tower lists"""
+    if _is_table(data):
+        return transform(data)
+    if isinstance(data, dict):
+        return {key: transform(value) if _is_table(value) else value for key, value in data.items()}
+    return data
+
+
+def find_table(data: Any) -> list[dict] | None:
+    """The tower list of a result: the result itself or its first list-of-objects value"""
+    if _is_table(data):
+        return data
+    if isinstance(data, dict):
+        for value in data.values():
+            if _is_table(value):
+                return value
+    return None
+
+
+def replace_table(data: Any, rows: list[dict]) -> Any:
+    """`data` with its tower list (see find_table) swapped for `rows`"""
+    if _is_table(data):
+        return rows
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if _is_table(value):
+                return {**data, key: rows}
+    return data
+
+
+def _columns(rows: list[dict]) -> list[str]:
+    """Union of keys in first-seen order (rows may carry extra keys such as distance_m)"""
+    columns: dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
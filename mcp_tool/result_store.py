@@ -0,0 +1,174 @@
+"""
+Result store for Cell Tower Signal Intelligence MCP Server
+Keeps large tower results server-side behind handles that fetch_result_page reads slices from
+"""
+
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from config import RESULT_HANDLE_TTL, RESULT_STORE_MAX_BYTES, RESULT_STORE_MAX_ENTRIES
+from tower_model import TowerColumns
+from tower_schema import FIELD_ORDER
+
+logger = logging.getLogger(__name__)
+
+# Rough per-element cost of values kept in object arrays (pointer plus a small object)
+_OBJECT_BYTES = 64
+
+
+class ResultTable:
+    """A tower list held as columns
+
+    Backend fields live in TowerColumns; keys the tools add, such as
+    distance_m, are kept as extra arrays. `fields` is the key order of the
+    original rows, so a projected result pages back with the same keys.
+    """
+
+    __slots__ = ("towers", "fields", "extras")
+
+    def __init__(self, towers: TowerColumns, fields: list[str], extras: dict[str, np.ndarray] | None = None):
+        self.towers = towers
+        self.fields = fields
+        self.extras = extras or {}
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "ResultTable":
+        fields = list(dict.fromkeys(key for row in rows[:1] for key in row))
+        extras = {}
+        for key in fields:
+            if key not in FIELD_ORDER:
+                values = np.asarray([row.get(key) for row in rows])
+                if values.ndim != 1:
+                    values = np.empty(len(rows), dtype=object)
+                    values[:] = [row.get(key) for row in rows]
+                extras[key] = values
+        return cls(TowerColumns.from_dicts(rows), fields, extras)
+
+    def __len__(self) -> int:
+        return len(self.towers)
+
+    @property
+    def nbytes(self) -> int:
+        size = self.towers.nbytes
+        for values in self.extras.values():
+            size += values.nbytes + (len(values) * _OBJECT_BYTES if values.dtype == object else 0)
+        return size
+
+    def rows(self, start: int, stop: int) -> list[dict[str, Any]]:
+        """Rows [start, stop) in the original key order"""
+        indices = np.arange(start, min(stop, len(self)))
+        tower_fields = [field for field in self.fields if field in FIELD_ORDER]
+        rows = self.towers.rows(indices, fields=tower_fields)
+        if self.extras:
+            for key, values in self.extras.items():
+                for row, value in zip(rows, values[indices].tolist()):
+                    row[key] = value
+            rows = [{key: row[key] for key in self.fields} for row in rows]
+        return rows
+
+    def summary(self) -> dict[str, Any]:
+        """Radio mix and bounding box of the whole result"""
+        columns = self.towers.columns
+        counts = np.bincount(columns["radio"], minlength=len(self.towers.radio_names))
+        radio_counts: dict[str, int] = {}
+        for name, count in zip(self.towers.radio_labels, counts.tolist()):
+            if count:
+                radio_counts[name] = radio_counts.get(name, 0) + count
+        summary: dict[str, Any] = {"fields": self.fields, "radio_counts": radio_counts}
+        lon, lat = columns["lon"], columns["lat"]
+        located = ~(np.isnan(lon) | np.isnan(lat))
+        if located.any():
+            summary["bounds"] = {
+                "min_lon": float(lon[located].min()),
+                "max_lon": float(lon[located].max()),
+                "min_lat": float(lat[located].min()),
+                "max_lat": float(lat[located].max()),
+            }
+        return summary
+
+
+class ResultStore:
+    """LRU of ResultTables keyed by opaque handles
+
+    Bounded by entry count and total bytes, evicting the least recently read
+    results first. A result also expires RESULT_HANDLE_TTL seconds after it
+    was stored, so pages never come from data much older than the query.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_STORE_MAX_ENTRIES,
+        max_bytes: int = RESULT_STORE_MAX_BYTES,
+        ttl: float = RESULT_HANDLE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, ResultTable]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def put(self, table: ResultTable) -> str | None:
+        """Store a result and return its handle; None when it alone exceeds the byte budget"""
+        size = table.nbytes
+        if size > self.max_bytes:
+            self.rejected += 1
+            logger.warning(f"Result of {len(table)} rows ({size} bytes) exceeds the result store budget")
+            return None
+        self._expire()
+        while self._entries and (len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+        handle = f"res_{uuid.uuid4().hex[:16]}"
+        self._entries[handle] = (time.monotonic() + self.ttl, table)
+        self._bytes += size
+        return handle
+
+    def get(self, handle: str) -> ResultTable | None:
+        self._expire()
+        entry = self._entries.get(handle)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(handle)
+        self.hits += 1
+        return entry[1]
+
+    def expires_in(self, handle: str) -> float:
+        entry = self._entries.get(handle)
+        return max(entry[0] - time.monotonic(), 0.0) if entry else 0.0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for handle in [handle for handle, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            self._drop(handle)
+            self.expirations += 1
+
+    def _drop(self, handle: str) -> None:
+        _, table = self._entries.pop(handle)
+        self._bytes -= table.nbytes
@@ -0,0 +1,126 @@
+"""
+Spatial index for Cell Tower Signal Intelligence MCP Server
+Uniform lon/lat grid over tower coordinates for bounding-box and proximity queries
+"""
+
+import math
+
+import numpy as np
+
+from config import SPATIAL_CELL_SIZE_DEG
+
+EARTH_RADIUS_M: float = 6_371_008.8
+METERS_PER_DEGREE_LAT: float = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def haversine_m(
+    lon1: float | np.ndarray, lat1: float | np.ndarray, lon2: np.ndarray, lat2: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance in metres from one point to many, or between paired points"""
+    lon1_r, lat1_r = np.radians(lon1), np.radians(lat1)
+    lon2_r, lat2_r = np.radians(lon2), np.radians(lat2)
+    a = (
+        np.sin((lat2_r - lat1_r) / 2.0) ** 2
+        + np.cos(lat1_r) * np.cos(lat2_r) * np.sin((lon2_r - lon1_r) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """Points bucketed into fixed-size grid cells, stored sorted by cell key
+
+    Each grid row is a contiguous key range, so a bounding box resolves to one
+    binary search per grid row followed by an exact check of the candidates.
+    """
+
+    def __init__(self, lon: np.ndarray, lat: np.ndarray, cell_size: float = SPATIAL_CELL_SIZE_DEG):
+        self.lon = lon
+        self.lat = lat
+        self.cell_size = cell_size
+
+        valid = np.flatnonzero(~(np.isnan(lon) | np.isnan(lat)))
+        if len(valid):
+            self.origin_lon = float(lon[valid].min())
+            self.origin_lat = float(lat[valid].min())
+            self.n_cols = int((lon[valid].max() - self.origin_lon) // cell_size) + 1
+            self.n_rows = int((lat[valid].max() - self.origin_lat) // cell_size) + 1
+        else:
+            self.origin_lon = self.origin_lat = 0.0
+            self.n_cols = self.n_rows = 0
+
+        keys = self._col(lon[valid]) + self._row(lat[valid]) * self.n_cols
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.order = valid[order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def bbox(self, min_lon: float, max_lon: float, min_lat: float, max_lat: float) -> np.ndarray:
+        """Row indices of points inside the box (inclusive), in ascending order"""
+        candidates = self._candidates(min_lon, max_lon, min_lat, max_lat)
+        lon = self.lon[candidates]
+        lat = self.lat[candidates]
+        inside = (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+        return np.sort(candidates[inside])
+
+    def within_radius(self, lon: float, lat: float, radius_m: float) -> tuple[np.ndarray, np.ndarray]:
+        """Row indices and distances of points within `radius_m` metres, nearest first"""
+        dlat = radius_m / METERS_PER_DEGREE_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlon = min(dlat / cos_lat, 180.0)
+        candidates = self._candidates(lon - dlon, lon + dlon, lat - dlat, lat + dlat)
+        distances = haversine_m(lon, lat, self.lon[candidates], self.lat[candidates])
+        keep = distances <= radius_m
+        candidates, distances = candidates[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def nearest(self, lon: float, lat: float, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """The `k` nearest points to (lon, lat), nearest first"""
+        if k <= 0 or not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        k = min(k, len(self))
+
+        # Grow a square window of grid cells until it holds k points, then
+        # settle the exact answer with a radius query at the k-th distance.
+        ring = 1
+        max_ring = max(self.n_cols, self.n_rows)
+        while True:
+            half = ring * self.cell_size
+            candidates = self._candidates(lon - half, lon + half, lat - half, lat + half)
+            if len(candidates) >= k or ring > max_ring:
+                break
+            ring *= 2
+
+        if len(candidates) < k:
+            candidates = self.order
+        distances = haversine_m(lon, lat, self.lon[candidates], self.lat[candidates])
+        kth = float(np.partition(distances, k - 1)[k - 1])
+        indices, distances = self.within_radius(lon, lat, kth)
+        return indices[:k], distances[:k]
+
+    def _col(self, lon: np.ndarray | float) -> np.ndarray:
+        return np.floor((np.asarray(lon) - self.origin_lon) / self.cell_size).astype(np.int64)
+
+    def _row(self, lat: np.ndarray | float) -> np.ndarray:
+        return np.floor((np.asarray(lat) - self.origin_lat) / self.cell_size).astype(np.int64)
+
+    def _candidates(self, min_lon: float, max_lon: float, min_lat: float, max_lat: float) -> np.ndarray:
+        """Row indices of every point in the grid cells overlapping the box"""
+        if not len(self) or min_lon > max_lon or min_lat > max_lat:
+            return np.empty(0, dtype=np.int64)
+        col0 = max(int(self._col(min_lon)), 0)
+        col1 = min(int(self._col(max_lon)), self.n_cols - 1)
+        row0 = max(int(self._row(min_lat)), 0)
+        row1 = min(int(self._row(max_lat)), self.n_rows - 1)
+        if col0 > col1 or row0 > row1:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(row0, row1 + 1, dtype=np.int64)
+        starts = np.searchsorted(self.keys, rows * self.n_cols + col0, side="left")
+        stops = np.searchsorted(self.keys, rows * self.n_cols + col1, side="right")
+        slices = [self.order[start:stop] for start, stop in zip(starts, stops) if stop > start]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(slices)
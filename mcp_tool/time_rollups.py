@@ -0,0 +1,196 @@
+"""
+Time rollups for Cell Tower Signal Intelligence MCP Server
+Per-bucket tower counts and sample/signal aggregates over created/updated times
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from config import TIMESERIES_MAX_BUCKETS
+from tower_model import INT_NULL, TowerColumns
+from tower_schema import ROLLUP_DIMENSIONS
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+# numpy datetime unit of each granularity
+BUCKET_UNITS: dict[str, str] = {"day": "D", "month": "M"}
+
+
+class Rollup:
+    """Aggregates of one time field at one granularity, keyed on (bucket, *dimensions)
+
+    Each group holds [towers, samples, signal sum, signal count]; null samples
+    and signals are left out of their sums. Updates are signed, so a delta is
+    applied by subtracting the old rows and adding the new ones.
+    """
+
+    def __init__(self, field: str, granularity: str, dimensions: tuple[str, ...]):
+        self.field = field
+        self.granularity = granularity
+        self.dimensions = dimensions
+        self.groups: dict[tuple, list[float]] = {}
+        # Towers per bucket over all groups, for the series bounds
+        self.bucket_counts: dict[int, int] = {}
+
+    def update(self, table: TowerColumns, sign: int = 1) -> "Rollup":
+        times = table.columns[self.field]
+        valid = np.flatnonzero(~np.isnat(times))
+        if not len(valid):
+            return self
+        buckets = times[valid].astype(f"datetime64[{BUCKET_UNITS[self.granularity]}]").astype(np.int64)
+        keys = np.stack(
+            [buckets] + [table.columns[field][valid].astype(np.int64) for field in self.dimensions], axis=1
+        )
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        count = len(groups)
+        samples = table.columns["samples"][valid]
+        signal = table.columns["averageSignal"][valid]
+        has_samples, has_signal = samples != INT_NULL, signal != INT_NULL
+        totals = np.stack([
+            np.bincount(inverse, minlength=count),
+            np.bincount(inverse, weights=np.where(has_samples, samples, 0), minlength=count),
+            np.bincount(inverse, weights=np.where(has_signal, signal, 0), minlength=count),
+            np.bincount(inverse, weights=has_signal, minlength=count),
+        ], axis=1) * sign
+
+        radio = self.dimensions.index("radio") + 1 if "radio" in self.dimensions else None
+        for key, values in zip(groups.tolist(), totals.tolist()):
+            if radio is not None:
+                key[radio] = table.radio_labels[key[radio]]
+            key = tuple(key)
+            entry = self.groups.get(key)
+            if entry is None:
+                entry = self.groups[key] = [0, 0, 0, 0]
+            for i, value in enumerate(values):
+                entry[i] += value
+            if entry[0] <= 0:
+                del self.groups[key]
+            bucket_total = self.bucket_counts.get(key[0], 0) + int(values[0])
+            if bucket_total > 0:
+                self.bucket_counts[key[0]] = bucket_total
+            else:
+                self.bucket_counts.pop(key[0], None)
+        return self
+
+    def series(self, values: tuple, start: int | None, end: int | None) -> list[dict[str, Any]]:
+        """One entry per non-empty bucket up to `end`, one dict lookup per bucket
+
+        The cumulative count also covers buckets before `start`.
+        """
+        if not self.bucket_counts:
+            return []
+        first, last = min(self.bucket_counts), max(self.bucket_counts)
+        if end is not None:
+            last = min(last, end)
+        unit = BUCKET_UNITS[self.granularity]
+        series = []
+        cumulative = 0
+        for bucket in range(first, last + 1):
+            entry = self.groups.get((bucket, *values))
+            if entry is None:
+                continue
+            towers, samples, signal_sum, signal_count = entry
+            cumulative += int(towers)
+            if start is not None and bucket < start:
+                continue
+            series.append({
+                "bucket": str(np.datetime64(bucket, unit)),
+                "towers": int(towers),
+                "cumulative": cumulative,
+                "samples": int(samples),
+                "mean_signal": round(signal_sum / signal_count, 2) if signal_count else None,
+            })
+            if len(series) > TIMESERIES_MAX_BUCKETS:
+                raise ValueError(
+                    f"More than {TIMESERIES_MAX_BUCKETS} buckets; use a coarser granularity or a narrower range"
+                )
+        return series
+
+
+class TimeRollups:
+    """Rollups over a snapshot, built on first use and kept current from its sync deltas
+
+    A rollup exists per (time field, granularity, filtered dimensions), so a
+    query filtering on radio and net reads a (bucket, radio, net) table
+    directly. Sync merges are applied as signed deltas; a reload invalidates
+    everything and the next query rebuilds what it needs in one pass.
+    """
+
+    def __init__(self, snapshot: TowerSnapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        self._rollups: dict[tuple, Rollup] = {}
+        self.builds = 0
+        self.deltas = 0
+        snapshot.add_delta_listener(self._apply_delta)
+
+    def rollup(self, field: str, granularity: str, dimensions: tuple[str, ...]) -> Rollup:
+        if self.version != self.snapshot.version:
+            self._rollups.clear()
+            self.version = self.snapshot.version
+        key = (field, granularity, dimensions)
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            rollup = self._rollups[key] = Rollup(field, granularity, dimensions).update(self.snapshot)
+            self.builds += 1
+        return rollup
+
+    def timeseries(
+        self,
+        field: str,
+        granularity: str,
+        filters: dict[str, Any],
+        start: str | None = None,
+        end: str | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+    ) -> dict[str, Any]:
+        """Bucketed series for towers matching `filters` (radio/net/area) and an optional bbox
+
+        Without a bbox the answer comes from a rollup; a bbox is not part of
+        any rollup key, so those towers are aggregated in one pass instead.
+        """
+        dimensions = tuple(field_name for field_name in ROLLUP_DIMENSIONS if filters.get(field_name) is not None)
+        values = tuple(filters[field_name] for field_name in dimensions)
+        if bbox is None:
+            rollup = self.rollup(field, granularity, dimensions)
+            source = "rollup"
+        else:
+            towers = self.snapshot.subset(self.snapshot.mask_bbox(*bbox))
+            rollup = Rollup(field, granularity, dimensions).update(towers)
+            source = "scan"
+        series = rollup.series(values, self._bucket(start, granularity), self._bucket(end, granularity))
+        return {
+            "time_field": field,
+            "granularity": granularity,
+            "filters": {key: value for key, value in filters.items() if value is not None},
+            "source": source,
+            "bucket_count": len(series),
+            "towers": sum(entry["towers"] for entry in series),
+            "buckets": series,
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {"rollups": len(self._rollups), "builds": self.builds, "deltas": self.deltas}
+
+    def _apply_delta(self, version: int, before: TowerColumns, after: TowerColumns) -> None:
+        """Move built rollups past one sync merge; ignored when they were already behind"""
+        if version != self.version:
+            return
+        for rollup in self._rollups.values():
+            rollup.update(before, -1).update(after, 1)
+        self.version = self.snapshot.version
+        self.deltas += 1
+
+    @staticmethod
+    def _bucket(value: str | None, granularity: str) -> int | None:
+        if value is None:
+            return None
+        try:
+            moment = np.datetime64(value)
+        except ValueError:
+            raise ValueError(f"Invalid date '{value}'; expected ISO-8601 such as 2024-01 or 2024-01-31")
+        return int(moment.astype(f"datetime64[{BUCKET_UNITS[granularity]}]").astype(np.int64))
@@ -3,8 +3,113 @@ Tool definitions for Cell Tower Signal Intelligence MCP Server
 Defines all available MCP tools and their schemas
 """
 
+from functools import cache
+
 import mcp.types as types
 
+from config import (
+    COVERAGE_GAP_RESOLUTION_DEG,
+    COVERAGE_REGION_LIMIT,
+    DUPLICATE_CONFLICT_DISTANCE_M,
+    DUPLICATE_GROUP_LIMIT,
+    GRID_DEFAULT_RESOLUTION_DEG,
+    LOCATE_MAX_OBSERVATIONS,
+    NEIGHBOR_CLUSTER_LIMIT,
+    NEIGHBOR_DEFAULT_LIMIT,
+    QUERY_DEFAULT_LIMIT,
+    QUERY_MAX_LIMIT,
+    RESULT_HANDLE_MIN_ROWS,
+    RESULT_HANDLE_TTL,
+    RESULT_PAGE_MAX_ROWS,
+    RESULT_PAGE_ROWS,
+)
+from response_format import RESPONSE_FORMATS
+from tower_schema import (
+    DEFAULT_GRID_LAYERS,
+    FIELD_ORDER,
+    GRID_LAYERS,
+    QUERY_FIELDS,
+    QUERY_OPERATORS,
+    TIMESERIES_FIELDS,
+    TIMESERIES_GRANULARITIES,
+)
+
+# Shared output-format argument accepted by every tool that returns data
+FORMAT_PROPERTY: dict = {
+    "type": "string",
+    "enum": list(RESPONSE_FORMATS),
+    "description": (
+        "Output format: json (indented, default), compact (minified JSON), columnar "
+        "(one column list plus row arrays), csv, or summary (total count and a short preview)"
+    ),
+    "default": "json",
+}
+
+# Coordinate bounds checked by the compiled argument validators
+LONGITUDE: dict = {"type": "number", "minimum": -180, "maximum": 180}
+LATITUDE: dict = {"type": "number", "minimum": -90, "maximum": 90}
+
+# Pre-insert identity check accepted by the create tools
+CHECK_DUPLICATES_PROPERTY: dict = {
+    "type": "boolean",
+    "description": (
+        "Reject towers whose (radio, mcc, net, area, cell) identity already exists or repeats "
+        "within the request, checked against the local snapshot's identity index"
+    ),
+    "default": False,
+}
+
+# Shared arguments of the duplicate and conflict tools
+DUPLICATE_PROPERTIES: dict = {
+    "match_radio": {
+        "type": "boolean",
+        "description": "Include radio in the identity; false groups on (mcc, net, area, cell) across radio types",
+        "default": True,
+    },
+    "limit": {
+        "type": "integer",
+        "description": "Maximum number of groups to return",
+        "default": DUPLICATE_GROUP_LIMIT,
+        "minimum": 1,
+    },
+}
+
+# Optional bounding box of the coverage gap, overlap and timeseries tools
+BBOX_PROPERTIES: dict = {
+    "min_lon": {**LONGITUDE, "description": "Optional: Minimum longitude (default: extent of all towers)"},
+    "max_lon": {**LONGITUDE, "description": "Optional: Maximum longitude"},
+    "min_lat": {**LATITUDE, "description": "Optional: Minimum latitude"},
+    "max_lat": {**LATITUDE, "description": "Optional: Maximum latitude"},
+}
+
+# Shared arguments of the coverage gap and overlap tools
+REGION_PROPERTIES: dict = {
+    **BBOX_PROPERTIES,
+    "resolution": {
+        "type": "number",
+        "description": "Grid cell edge in degrees (0.01 is about 1.1 km)",
+        "default": COVERAGE_GAP_RESOLUTION_DEG,
+        "minimum": 0.001,
+        "maximum": 5,
+    },
+    "min_cells": {
+        "type": "integer",
+        "description": "Ignore regions smaller than this many cells",
+        "default": 1,
+        "minimum": 1,
+    },
+    "limit": {
+        "type": "integer",
+        "description": "Number of largest regions to list",
+        "default": COVERAGE_REGION_LIMIT,
+        "minimum": 0,
+    },
+    "parallel": {
+        "type": "boolean",
+        "description": "Force (true) or disable (false) the process pool; by default it is used for large regions",
+    },
+}
+
 
 class ToolDefinitions:
     """Tool definitions for cell tower analysis"""
@@ -14,10 +119,26 @@ class ToolDefinitions:
         """Retrieve all cell towers in the database"""
         return types.Tool(
             name="get_all_towers",
-            description="Retrieve all cell towers in the database. Use with caution for large datasets.",
+            description=(
+                "Retrieve all cell towers in the database. Use with caution for large datasets; "
+                "set stream=true to receive compact NDJSON in one content block per page."
+            ),
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Walk the paged endpoint and return NDJSON chunks",
+                        "default": False,
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": "Towers per chunk when streaming",
+                        "default": 1000,
+                        "minimum": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
             },
         )
 
@@ -30,10 +151,11 @@ class ToolDefinitions:
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "page": {"type": "integer", "description": "Page number (0-indexed)", "default": 0},
-                    "size": {"type": "integer", "description": "Items per page", "default": 50},
+                    "page": {"type": "integer", "description": "Page number (0-indexed)", "default": 0, "minimum": 0},
+                    "size": {"type": "integer", "description": "Items per page", "default": 50, "minimum": 1},
                     "sort_by": {"type": "string", "description": "Field to sort by (e.g., averageSignal, mcc)", "default": "id"},
                     "sort_direction": {"type": "string", "enum": ["asc", "desc"], "default": "asc"},
+                    "format": FORMAT_PROPERTY,
                 },
             },
         )
@@ -48,11 +170,115 @@ class ToolDefinitions:
                 "type": "object",
                 "properties": {
                     "id": {"type": "integer", "description": "Database ID of the tower"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["id"],
             },
         )
 
+    @staticmethod
+    def get_towers_by_ids() -> types.Tool:
+        """Get many cell towers by database ID in one call"""
+        return types.Tool(
+            name="get_towers_by_ids",
+            description="Get many cell towers by database ID in one call (duplicates removed, up to 500 ids)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ids": {
+                        "type": "array",
+                        "description": "Database IDs of the towers",
+                        "items": {"type": "integer"},
+                        "minItems": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["ids"],
+            },
+        )
+
+    @staticmethod
+    def get_towers_by_cell_identity() -> types.Tool:
+        """Resolve cell identities (radio, mcc, net, area, cell) to towers"""
+        return types.Tool(
+            name="get_towers_by_cell_identity",
+            description=(
+                "Resolve many cell identities (radio, mcc, net, area, cell) to towers in one call. "
+                "Only cell is required; omitted components match any value."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cells": {
+                        "type": "array",
+                        "description": "Cell identities to resolve",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "radio": {"type": "string", "description": "Radio type"},
+                                "mcc": {"type": "integer", "description": "Mobile Country Code"},
+                                "net": {"type": "integer", "description": "Network code"},
+                                "area": {"type": "integer", "description": "Location Area Code"},
+                                "cell": {"type": "integer", "description": "Cell ID"},
+                            },
+                            "required": ["cell"],
+                        },
+                        "minItems": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["cells"],
+            },
+        )
+
+    @staticmethod
+    def locate_from_cells() -> types.Tool:
+        """Estimate device positions from observed cell identities"""
+        return types.Tool(
+            name="locate_from_cells",
+            description=(
+                "Estimate the position of one or many devices from the cells each one observes. "
+                "Cells are resolved in one batch through a cell-identity hash index; each position is "
+                "a centroid of the matched towers weighted by signal strength and inverse range, with "
+                f"an accuracy radius in metres. Up to {LOCATE_MAX_OBSERVATIONS} observations per call."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "devices": {
+                        "type": "array",
+                        "description": "Devices to locate, each with the cells it observed",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "description": "Optional: Device label echoed in the result"},
+                                "cells": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "radio": {"type": "string", "description": "Optional: Radio type"},
+                                            "mcc": {"type": "integer", "description": "Mobile Country Code"},
+                                            "net": {"type": "integer", "description": "Network code"},
+                                            "area": {"type": "integer", "description": "Location Area Code"},
+                                            "cell": {"type": "integer", "description": "Cell ID"},
+                                            "signal": {"type": "number", "description": "Optional: Received signal in dBm"},
+                                        },
+                                        "required": ["mcc", "net", "area", "cell"],
+                                    },
+                                    "minItems": 1,
+                                },
+                            },
+                            "required": ["cells"],
+                        },
+                        "minItems": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["devices"],
+            },
+        )
+
     @staticmethod
     def get_towers_by_radio() -> types.Tool:
         """Filter cell towers by radio technology type"""
@@ -63,6 +289,7 @@ class ToolDefinitions:
                 "type": "object",
                 "properties": {
                     "radio": {"type": "string", "description": "Radio type: LTE, GSM, UMTS, or CDMA"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["radio"],
             },
@@ -78,6 +305,7 @@ class ToolDefinitions:
                 "type": "object",
                 "properties": {
                     "mcc": {"type": "integer", "description": "Mobile Country Code (e.g., 655 for South Africa)"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["mcc"],
             },
@@ -92,15 +320,52 @@ class ToolDefinitions:
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "min_lon": {"type": "number", "description": "Minimum longitude"},
-                    "max_lon": {"type": "number", "description": "Maximum longitude"},
-                    "min_lat": {"type": "number", "description": "Minimum latitude"},
-                    "max_lat": {"type": "number", "description": "Maximum latitude"},
+                    "min_lon": {**LONGITUDE, "description": "Minimum longitude"},
+                    "max_lon": {**LONGITUDE, "description": "Maximum longitude"},
+                    "min_lat": {**LATITUDE, "description": "Minimum latitude"},
+                    "max_lat": {**LATITUDE, "description": "Maximum latitude"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["min_lon", "max_lon", "min_lat", "max_lat"],
             },
         )
 
+    @staticmethod
+    def get_nearest_towers() -> types.Tool:
+        """Find the towers closest to a point"""
+        return types.Tool(
+            name="get_nearest_towers",
+            description="Find the N cell towers closest to a point, ordered by great-circle distance (distance_m)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "lon": {**LONGITUDE, "description": "Longitude of the point"},
+                    "lat": {**LATITUDE, "description": "Latitude of the point"},
+                    "limit": {"type": "integer", "description": "Number of towers to return", "default": 10, "minimum": 1},
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["lon", "lat"],
+            },
+        )
+
+    @staticmethod
+    def get_towers_within_radius() -> types.Tool:
+        """Find towers within a radius of a point"""
+        return types.Tool(
+            name="get_towers_within_radius",
+            description="Find cell towers within a radius (in metres) of a point, nearest first",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "lon": {**LONGITUDE, "description": "Longitude of the point"},
+                    "lat": {**LATITUDE, "description": "Latitude of the point"},
+                    "radius_m": {"type": "number", "description": "Search radius in metres", "minimum": 0},
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["lon", "lat", "radius_m"],
+            },
+        )
+
     @staticmethod
     def get_towers_by_signal_range() -> types.Tool:
         """Filter towers by signal strength range"""
@@ -112,6 +377,7 @@ class ToolDefinitions:
                 "properties": {
                     "min_signal": {"type": "integer", "description": "Minimum signal strength in dBm"},
                     "max_signal": {"type": "integer", "description": "Maximum signal strength in dBm"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["min_signal", "max_signal"],
             },
@@ -127,11 +393,104 @@ class ToolDefinitions:
                 "type": "object",
                 "properties": {
                     "min_samples": {"type": "integer", "description": "Minimum number of samples"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["min_samples"],
             },
         )
 
+    @staticmethod
+    def query_towers() -> types.Tool:
+        """Query towers with combined filters, projection, sort and limit"""
+        return types.Tool(
+            name="query_towers",
+            description=(
+                "Query towers with any combination of conditions in one call, e.g. LTE towers in a "
+                "bounding box with averageSignal >= -85 and samples >= 10. All conditions must hold. "
+                "The most selective condition is answered by a backend filter or local index and the "
+                "rest are applied while results stream in. Supports field projection, sorting and a "
+                "row limit; the response includes the chosen plan and the total match count."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "where": {
+                        "type": "array",
+                        "description": "Conditions that must all hold",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "field": {"type": "string", "enum": list(QUERY_FIELDS)},
+                                "op": {
+                                    "type": "string",
+                                    "enum": list(QUERY_OPERATORS),
+                                    "description": "between takes [low, high] (inclusive), in takes a list",
+                                },
+                                "value": {"description": "Comparison value, [low, high] pair or list"},
+                            },
+                            "required": ["field", "op", "value"],
+                        },
+                    },
+                    "bbox": {
+                        "type": "object",
+                        "description": "Optional bounding box (inclusive)",
+                        "properties": {
+                            "min_lon": {**LONGITUDE, "description": "Minimum longitude"},
+                            "max_lon": {**LONGITUDE, "description": "Maximum longitude"},
+                            "min_lat": {**LATITUDE, "description": "Minimum latitude"},
+                            "max_lat": {**LATITUDE, "description": "Maximum latitude"},
+                        },
+                        "required": ["min_lon", "max_lon", "min_lat", "max_lat"],
+                    },
+                    "fields": {
+                        "type": "array",
+                        "description": "Fields to return per tower (default: all)",
+                        "items": {"type": "string", "enum": list(FIELD_ORDER)},
+                        "minItems": 1,
+                    },
+                    "sort_by": {"type": "string", "enum": list(QUERY_FIELDS), "description": "Field to sort by (nulls last)"},
+                    "sort_direction": {"type": "string", "enum": ["asc", "desc"], "default": "asc"},
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum towers to return",
+                        "default": QUERY_DEFAULT_LIMIT,
+                        "minimum": 1,
+                        "maximum": QUERY_MAX_LIMIT,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def fetch_result_page() -> types.Tool:
+        """Read more rows of a large result kept server-side"""
+        return types.Tool(
+            name="fetch_result_page",
+            description=(
+                f"Read a slice of a large result. Tower lists longer than {RESULT_HANDLE_MIN_ROWS} rows "
+                f"come back as a handle with a summary and the first {RESULT_PAGE_ROWS} rows; pass the "
+                "handle and next_offset here to continue without re-running the query. Handles expire "
+                f"after {RESULT_HANDLE_TTL:g} seconds or when the server needs the memory."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "handle": {"type": "string", "description": "Result handle returned by the original tool"},
+                    "offset": {"type": "integer", "description": "First row to return", "default": 0, "minimum": 0},
+                    "limit": {
+                        "type": "integer",
+                        "description": "Rows to return",
+                        "default": RESULT_PAGE_ROWS,
+                        "minimum": 1,
+                        "maximum": RESULT_PAGE_MAX_ROWS,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["handle"],
+            },
+        )
+
     @staticmethod
     def create_tower() -> types.Tool:
         """Create a new cell tower entry"""
@@ -146,16 +505,55 @@ class ToolDefinitions:
                     "net": {"type": "integer", "description": "Network code"},
                     "area": {"type": "integer", "description": "Location Area Code"},
                     "cell": {"type": "integer", "description": "Cell ID"},
-                    "lon": {"type": "number", "description": "Longitude"},
-                    "lat": {"type": "number", "description": "Latitude"},
+                    "lon": {**LONGITUDE, "description": "Longitude"},
+                    "lat": {**LATITUDE, "description": "Latitude"},
                     "range": {"type": "integer", "description": "Range in meters"},
                     "samples": {"type": "integer", "description": "Number of samples"},
                     "averageSignal": {"type": "integer", "description": "Average signal strength in dBm"},
+                    "check_duplicates": CHECK_DUPLICATES_PROPERTY,
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["radio", "mcc", "net", "area", "cell", "lon", "lat"],
             },
         )
 
+    @staticmethod
+    def bulk_create_towers() -> types.Tool:
+        """Create many cell towers through the batch endpoint"""
+        return types.Tool(
+            name="bulk_create_towers",
+            description=(
+                "Create many cell towers at once from an array of tower objects or OpenCelliD-format "
+                "CSV text (radio,mcc,net,area,cell,unit,lon,lat,range,samples,changeable,created,"
+                "updated,averageSignal). Rows are validated, sent in concurrent batches and per-row "
+                "failures are reported."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "towers": {
+                        "type": "array",
+                        "description": "Tower objects with the same fields as create_tower",
+                        "items": {"type": "object"},
+                    },
+                    "csv": {"type": "string", "description": "OpenCelliD-format CSV text (header row optional)"},
+                    "batch_size": {
+                        "type": "integer",
+                        "description": "Towers per /batch request",
+                        "default": 1000,
+                        "minimum": 1,
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "Only validate the rows, do not create anything",
+                        "default": False,
+                    },
+                    "check_duplicates": CHECK_DUPLICATES_PROPERTY,
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
     @staticmethod
     def update_tower() -> types.Tool:
         """Update specific fields of an existing cell tower"""
@@ -167,6 +565,7 @@ class ToolDefinitions:
                 "properties": {
                     "id": {"type": "integer", "description": "Database ID of the tower"},
                     "updates": {"type": "object", "description": "Fields to update (e.g., {averageSignal: -80})"},
+                    "format": FORMAT_PROPERTY,
                 },
                 "required": ["id", "updates"],
             },
@@ -192,7 +591,10 @@ class ToolDefinitions:
         """Analyze tower coverage statistics"""
         return types.Tool(
             name="analyze_coverage",
-            description="Analyze tower coverage statistics by radio type and location",
+            description=(
+                "Analyze tower coverage statistics by radio type and location: counts, signal "
+                "mean/stddev/percentiles, sample totals and per-radio, per-net and per-area breakdowns"
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -201,24 +603,280 @@ class ToolDefinitions:
                     "max_lon": {"type": "number", "description": "Optional: Maximum longitude"},
                     "min_lat": {"type": "number", "description": "Optional: Minimum latitude"},
                     "max_lat": {"type": "number", "description": "Optional: Maximum latitude"},
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def coverage_grid() -> types.Tool:
+        """Rasterize towers into a coverage grid"""
+        return types.Tool(
+            name="coverage_grid",
+            description=(
+                "Rasterize towers into a lon/lat grid (dense 2D arrays, row 0 = south) or geohash "
+                "cells (sparse, keyed by geohash) for heatmaps: per-cell tower count, radio mix, "
+                "mean/max averageSignal and whether the cell centre lies inside any tower's range "
+                "(coverage) or how many (coverage_depth). Defaults to the extent of all towers."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "min_lon": {**LONGITUDE, "description": "Optional: Minimum longitude"},
+                    "max_lon": {**LONGITUDE, "description": "Optional: Maximum longitude"},
+                    "min_lat": {**LATITUDE, "description": "Optional: Minimum latitude"},
+                    "max_lat": {**LATITUDE, "description": "Optional: Maximum latitude"},
+                    "grid": {"type": "string", "enum": ["lonlat", "geohash"], "default": "lonlat"},
+                    "resolution": {
+                        "type": "number",
+                        "description": "Cell edge in degrees for the lonlat grid",
+                        "default": GRID_DEFAULT_RESOLUTION_DEG,
+                        "minimum": 0.001,
+                        "maximum": 45,
+                    },
+                    "precision": {
+                        "type": "integer",
+                        "description": "Geohash length for the geohash grid (5 is about 4.9 x 4.9 km)",
+                        "default": 5,
+                        "minimum": 1,
+                        "maximum": 8,
+                    },
+                    "radio": {"type": "string", "description": "Optional: Only towers of this radio type"},
+                    "layers": {
+                        "type": "array",
+                        "description": f"Layers to return (default: {', '.join(DEFAULT_GRID_LAYERS)})",
+                        "items": {"type": "string", "enum": list(GRID_LAYERS)},
+                        "minItems": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def find_coverage_gaps() -> types.Tool:
+        """Find areas outside every tower's range"""
+        return types.Tool(
+            name="find_coverage_gaps",
+            description=(
+                "Find coverage gaps: connected areas of a bounding box whose grid cells lie outside "
+                "every tower's range circle (optionally only counting one radio type). Returns the "
+                "uncovered share and area plus the largest gap regions with their bounds, centroid "
+                "and area in km2."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **REGION_PROPERTIES,
+                    "radio": {"type": "string", "description": "Optional: Only count coverage by this radio type"},
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def find_coverage_overlap() -> types.Tool:
+        """Find areas covered by many towers of the same radio"""
+        return types.Tool(
+            name="find_coverage_overlap",
+            description=(
+                "Find coverage overlap: connected areas covered by more than min_towers towers of the "
+                "same radio type, per radio. Returns overlap share and area, the highest tower count "
+                "and the largest overlap regions."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **REGION_PROPERTIES,
+                    "min_towers": {
+                        "type": "integer",
+                        "description": "Report cells covered by more than this many towers",
+                        "default": 3,
+                        "minimum": 1,
+                    },
+                    "radio": {"type": "string", "description": "Optional: Only this radio type (default: each radio)"},
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def find_duplicate_towers() -> types.Tool:
+        """Towers sharing a cell identity"""
+        return types.Tool(
+            name="find_duplicate_towers",
+            description=(
+                "Find towers that share a cell identity (radio, mcc, net, area, cell), which should be "
+                "unique. Groups are listed largest first with how far apart their copies are."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **DUPLICATE_PROPERTIES,
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def find_conflicting_towers() -> types.Tool:
+        """Same-identity towers whose locations disagree"""
+        return types.Tool(
+            name="find_conflicting_towers",
+            description=(
+                "Find towers that share a cell identity but disagree on location: groups whose copies "
+                "lie more than min_distance_m apart, most spread first."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "min_distance_m": {
+                        "type": "number",
+                        "description": "Report groups whose copies are further apart than this",
+                        "default": DUPLICATE_CONFLICT_DISTANCE_M,
+                        "minimum": 0,
+                    },
+                    **DUPLICATE_PROPERTIES,
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def coverage_timeseries() -> types.Tool:
+        """Tower counts per day or month from precomputed rollups"""
+        return types.Tool(
+            name="coverage_timeseries",
+            description=(
+                "How coverage evolved over time: towers per day or month by created or updated time, "
+                "with a running total, total samples and mean signal per bucket. Filters on radio, net "
+                "and area are answered from rollups kept current as towers change; a bounding box "
+                "aggregates the towers inside it in one pass."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "time_field": {
+                        "type": "string",
+                        "enum": list(TIMESERIES_FIELDS),
+                        "description": "Timestamp to bucket on: created (towers added) or updated",
+                        "default": "created",
+                    },
+                    "granularity": {
+                        "type": "string",
+                        "enum": list(TIMESERIES_GRANULARITIES),
+                        "description": "Bucket size",
+                        "default": "month",
+                    },
+                    "radio": {"type": "string", "description": "Optional: Only this radio type"},
+                    "net": {"type": "integer", "description": "Optional: Only this network code"},
+                    "area": {"type": "integer", "description": "Optional: Only this Location Area Code"},
+                    "start": {"type": "string", "description": "Optional: First bucket, ISO date (e.g. 2016-01)"},
+                    "end": {"type": "string", "description": "Optional: Last bucket, ISO date (e.g. 2024-12-31)"},
+                    **BBOX_PROPERTIES,
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def get_tower_neighbors() -> types.Tool:
+        """Towers of the same network within each other's range"""
+        return types.Tool(
+            name="get_tower_neighbors",
+            description=(
+                "List a tower's neighbors: towers of the same radio, MCC and net that lie within each "
+                "other's range, nearest first. Read from a precomputed neighbor graph kept current as "
+                "towers change."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "description": "Database ID of the tower"},
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum neighbors to return",
+                        "default": NEIGHBOR_DEFAULT_LIMIT,
+                        "minimum": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+                "required": ["id"],
+            },
+        )
+
+    @staticmethod
+    def interference_clusters() -> types.Tool:
+        """Connected groups of mutually neighboring towers"""
+        return types.Tool(
+            name="interference_clusters",
+            description=(
+                "Find interference clusters: connected groups of towers linked by the neighbor graph "
+                "(same radio, MCC and net, within each other's range). Largest clusters first, with "
+                "their edge count, centroid and bounds."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "radio": {"type": "string", "description": "Optional: Only clusters of this radio type"},
+                    "net": {"type": "integer", "description": "Optional: Only clusters of this network code"},
+                    "min_size": {
+                        "type": "integer",
+                        "description": "Smallest cluster to report",
+                        "default": 2,
+                        "minimum": 2,
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum clusters to return",
+                        "default": NEIGHBOR_CLUSTER_LIMIT,
+                        "minimum": 1,
+                    },
+                    "format": FORMAT_PROPERTY,
+                },
+            },
+        )
+
+    @staticmethod
+    def get_server_metrics() -> types.Tool:
+        """Report server metrics and control the profiler"""
+        return types.Tool(
+            name="get_server_metrics",
+            description=(
+                "Report in-process server metrics: per-tool and per-phase (backend, decode, "
+                "local_query, analysis, serialize) latency histograms, backend status counts, "
+                "payload sizes and response cache stats. Can also start or stop a cProfile or "
+                "sampling profiler."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "prometheus": {
+                        "type": "boolean",
+                        "description": "Return Prometheus text exposition format instead of JSON",
+                        "default": False,
+                    },
+                    "reset": {
+                        "type": "boolean",
+                        "description": "Clear counters and histograms after reporting",
+                        "default": False,
+                    },
+                    "profiler": {
+                        "type": "string",
+                        "enum": ["cprofile", "sampling", "stop"],
+                        "description": "Start a profiler in the given mode, or stop it and include its report",
+                    },
+                    "format": FORMAT_PROPERTY,
                 },
             },
         )
 
     @classmethod
+    @cache
     def get_all_tools(cls) -> list[types.Tool]:
-        """Get all tool definitions"""
+        """Get all tool definitions, in declaration order (built once, then shared)"""
         return [
-            cls.get_all_towers(),
-            cls.get_towers_paged(),
-            cls.get_tower_by_id(),
-            cls.get_towers_by_radio(),
-            cls.get_towers_by_mcc(),
-            cls.get_towers_by_location(),
-            cls.get_towers_by_signal_range(),
-            cls.get_towers_by_min_samples(),
-            cls.create_tower(),
-            cls.update_tower(),
-            cls.delete_tower(),
-            cls.analyze_coverage(),
+            member.__func__()
+            for member in vars(cls).values()
+            if isinstance(member, staticmethod)
         ]
@@ -3,13 +3,54 @@ Tool handlers for Cell Tower Signal Intelligence MCP Server
 Implements the business logic for each MCP tool
 """
 
-import json
+import asyncio
 import logging
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Callable
 
+import httpx
 import mcp.types as types
 
 from api_client import APIClient
+from bulk_ingest import BulkIngestor, parse_csv
+from config import (
+    BULK_BATCH_SIZE,
+    COVERAGE_GAP_RESOLUTION_DEG,
+    COVERAGE_PUSHDOWN_ENABLED,
+    COVERAGE_REGION_LIMIT,
+    DEFAULT_NEAREST_LIMIT,
+    DUPLICATE_CONFLICT_DISTANCE_M,
+    DUPLICATE_GROUP_LIMIT,
+    FANOUT_MAX_IDS,
+    GRID_DEFAULT_RESOLUTION_DEG,
+    LOCATE_MAX_OBSERVATIONS,
+    NEIGHBOR_CLUSTER_LIMIT,
+    NEIGHBOR_DEFAULT_LIMIT,
+    QUERY_DEFAULT_LIMIT,
+    RESULT_HANDLE_MIN_ROWS,
+    RESULT_HANDLES_ENABLED,
+    RESULT_PAGE_ROWS,
+    SNAPSHOT_ENABLED,
+    STREAM_PAGE_SIZE,
+)
+from coverage_gaps import find_coverage_gaps, find_coverage_overlap
+from coverage_grid import CoverageGridCache, GridSpec, coverage_grid
+from coverage_stats import CoverageAggregator, aggregate_page
+from geolocation import locate_devices
+from metrics import current_tool, metrics
+from neighbor_graph import NeighborGraphCache, interference_clusters, tower_neighbors
+from offload import offloader
+from profiling import profiler
+from query_planner import BoxPredicate, FieldPredicate, QueryPlanner, TowerQuery
+from response_format import dumps, find_table, format_payload, render_payload, replace_table
+from result_store import ResultStore, ResultTable
+from time_rollups import TimeRollups
+from tool_definitions import ToolDefinitions
+from tool_registry import ToolRegistry, tool
+from tower_duplicates import duplicate_errors, find_duplicates
+from tower_model import TowerColumns
+from tower_schema import DEFAULT_GRID_LAYERS, FIELD_ORDER, ROLLUP_DIMENSIONS
+from tower_snapshot import TowerSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -19,47 +60,61 @@ class ToolHandler:
 
     def __init__(self):
         self.api_client = APIClient()
+        self.snapshot = TowerSnapshot(self.api_client)
+        self.bulk_ingestor = BulkIngestor(self.api_client)
+        self.query_planner = QueryPlanner(self.api_client)
+        self.grid_cache = CoverageGridCache()
+        self.result_store = ResultStore()
+        self.time_rollups = TimeRollups(self.snapshot)
+        self.neighbor_graph = NeighborGraphCache(self.snapshot)
+        # Cleared the first time the backend turns out not to support /stats
+        self._stats_endpoint_available = True
+        self.registry = ToolRegistry.from_handler(self)
 
     async def handle_tool(
         self, name: str, arguments: dict | None
     ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        """Route tool execution based on tool name"""
+        """Route tool execution with per-call timing and outcome metrics"""
+        # Unknown names share one label so bad requests cannot grow the metric set
+        label = name if name in self.registry else "unknown"
+        token = current_tool.set(label)
+        started = time.perf_counter()
+        outcome = "ok"
         try:
-            if name == "get_all_towers":
-                return await self.get_all_towers()
-            elif name == "get_towers_paged":
-                return await self.get_towers_paged(arguments or {})
-            elif name == "get_tower_by_id":
-                return await self.get_tower_by_id(arguments or {})
-            elif name == "get_towers_by_radio":
-                return await self.get_towers_by_radio(arguments or {})
-            elif name == "get_towers_by_mcc":
-                return await self.get_towers_by_mcc(arguments or {})
-            elif name == "get_towers_by_location":
-                return await self.get_towers_by_location(arguments or {})
-            elif name == "get_towers_by_signal_range":
-                return await self.get_towers_by_signal_range(arguments or {})
-            elif name == "get_towers_by_min_samples":
-                return await self.get_towers_by_min_samples(arguments or {})
-            elif name == "create_tower":
-                return await self.create_tower(arguments or {})
-            elif name == "update_tower":
-                return await self.update_tower(arguments or {})
-            elif name == "delete_tower":
-                return await self.delete_tower(arguments or {})
-            elif name == "analyze_coverage":
-                return await self.analyze_coverage(arguments or {})
-            else:
-                raise ValueError(f"Unknown tool: {name}")
+            result = await self.registry.dispatch(name, arguments)
         except Exception as e:
-            return self._error_response(e)
+            outcome = "error"
+            result = self._error_response(e)
+        finally:
+            current_tool.reset(token)
+        metrics.observe("tool_seconds", time.perf_counter() - started, tool=label)
+        metrics.increment("tool_calls_total", tool=label, outcome=outcome)
+        metrics.observe_bytes(
+            "tool_response_bytes",
+            sum(len(item.text) for item in result if isinstance(item, types.TextContent)),
+            tool=label,
+        )
+        return result
 
-    async def get_all_towers(self) -> list[types.TextContent]:
+    @tool(ToolDefinitions.get_all_towers)
+    async def get_all_towers(self, args: dict) -> list[types.TextContent]:
         """Retrieve all cell towers"""
+        if args.get("stream"):
+            return await self._stream_all_towers(args.get("page_size", STREAM_PAGE_SIZE))
         logger.info("Fetching all towers")
-        data = await self.api_client.get("")
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query("", lambda snapshot: snapshot.all_towers())
+        return await self._respond(data, args)
+
+    async def _stream_all_towers(self, page_size: int) -> list[types.TextContent]:
+        """Return all towers as compact NDJSON, one content block per page"""
+        logger.info(f"Streaming all towers in pages of {page_size}")
+        chunks = []
+        async for page in self._stream_towers(page_size):
+            text = "\n".join(dumps(tower) for tower in page)
+            chunks.append(types.TextContent(type="text", text=text))
+        return chunks
 
+    @tool(ToolDefinitions.get_towers_paged)
     async def get_towers_paged(self, args: dict) -> list[types.TextContent]:
         """Get towers with pagination and sorting"""
         logger.info(f"Fetching towers with pagination: {args}")
@@ -70,41 +125,140 @@ class ToolHandler:
             "sortDirection": args.get("sort_direction", "asc"),
         }
         data = await self.api_client.get("/paged", params=params)
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
 
+    @tool(ToolDefinitions.get_tower_by_id)
     async def get_tower_by_id(self, args: dict) -> list[types.TextContent]:
         """Retrieve a specific tower by ID"""
-        tower_id = args.get("id")
-        if tower_id is None:
-            raise ValueError("id parameter is required")
+        tower_id = args["id"]
         logger.info(f"Fetching tower {tower_id}")
-        data = await self.api_client.get(f"/{tower_id}")
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = None
+        if SNAPSHOT_ENABLED:
+            snapshot = await self.snapshot.ensure_fresh()
+            data = snapshot.find_by_id(tower_id)
+        if data is None:
+            data = await self.api_client.get(f"/{tower_id}")
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.get_towers_by_ids)
+    async def get_towers_by_ids(self, args: dict) -> list[types.TextContent]:
+        """Retrieve many towers by ID in one call"""
+        unique_ids = list(dict.fromkeys(args["ids"]))
+        if len(unique_ids) > FANOUT_MAX_IDS:
+            raise ValueError(f"At most {FANOUT_MAX_IDS} distinct ids per call")
+
+        logger.info(f"Fetching {len(unique_ids)} towers by id")
+        found: dict[int, dict] = {}
+        if not self.snapshot.is_stale:
+            found = self.snapshot.find_by_ids(unique_ids)
+
+        missing = [tower_id for tower_id in unique_ids if tower_id not in found]
+        not_found: list[int] = []
+        errors: dict[str, str] = {}
+        results = await self.api_client.get_many([f"/{tower_id}" for tower_id in missing])
+        for tower_id, result in zip(missing, results):
+            if self._is_not_found(result):
+                not_found.append(tower_id)
+            elif isinstance(result, Exception):
+                errors[str(tower_id)] = str(result)
+            else:
+                found[tower_id] = result
+
+        data = {
+            "towers": [found[tower_id] for tower_id in unique_ids if tower_id in found],
+            "not_found": not_found,
+            "errors": errors,
+        }
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.get_towers_by_cell_identity)
+    async def get_towers_by_cell_identity(self, args: dict) -> list[types.TextContent]:
+        """Resolve many (radio, mcc, net, area, cell) identities in one call"""
+        identities = list(dict.fromkeys(
+            (item.get("radio"), item.get("mcc"), item.get("net"), item.get("area"), item["cell"])
+            for item in args["cells"]
+        ))
+        if len(identities) > FANOUT_MAX_IDS:
+            raise ValueError(f"At most {FANOUT_MAX_IDS} distinct identities per call")
+
+        logger.info(f"Resolving {len(identities)} cell identities")
+        matches: dict[tuple, list[dict]] = {}
+        errors: dict[str, str] = {}
+        if SNAPSHOT_ENABLED or not self.snapshot.is_stale:
+            snapshot = await self.snapshot.ensure_fresh()
+            with metrics.phase("local_query"):
+                matches = dict(zip(identities, snapshot.find_by_identities(identities)))
+        else:
+            # The backend /cell route matches on cell id only; check the rest locally
+            cell_ids = list(dict.fromkeys(identity[4] for identity in identities))
+            results = await self.api_client.get_many([f"/cell/{cell_id}" for cell_id in cell_ids])
+            by_cell = dict(zip(cell_ids, results))
+            for identity in identities:
+                result = by_cell[identity[4]]
+                if isinstance(result, Exception) and not self._is_not_found(result):
+                    errors[self._identity_label(identity)] = str(result)
+                    continue
+                candidates = [] if isinstance(result, Exception) else result
+                matches[identity] = [
+                    tower for tower in candidates
+                    if all(
+                        expected is None or tower.get(field) == expected
+                        for field, expected in zip(("radio", "mcc", "net", "area"), identity[:4])
+                    )
+                ]
 
+        data = {
+            "results": [
+                {"identity": self._identity_label(identity), "towers": towers}
+                for identity, towers in matches.items()
+            ],
+            "not_found": [self._identity_label(identity) for identity, towers in matches.items() if not towers],
+            "errors": errors,
+        }
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @staticmethod
+    def _is_not_found(result: Any) -> bool:
+        return isinstance(result, httpx.HTTPStatusError) and result.response.status_code == 404
+
+    @staticmethod
+    def _identity_label(identity: tuple) -> str:
+        return "/".join("*" if part is None else str(part) for part in identity)
+
+    @tool(ToolDefinitions.locate_from_cells)
+    async def locate_from_cells(self, args: dict) -> list[types.TextContent]:
+        """Estimate device positions from the cells they observed"""
+        devices = args["devices"]
+        observations = sum(len(device["cells"]) for device in devices)
+        if observations > LOCATE_MAX_OBSERVATIONS:
+            raise ValueError(f"At most {LOCATE_MAX_OBSERVATIONS} observations per call, got {observations}")
+        logger.info(f"Locating {len(devices)} devices from {observations} observations")
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("local_query"):
+            data = locate_devices(snapshot, devices)
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.get_towers_by_radio)
     async def get_towers_by_radio(self, args: dict) -> list[types.TextContent]:
         """Filter towers by radio type"""
-        radio = args.get("radio")
-        if not radio:
-            raise ValueError("radio parameter is required")
+        radio = args["radio"]
         logger.info(f"Fetching towers with radio type: {radio}")
-        data = await self.api_client.get(f"/radio/{radio}")
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query(
+            f"/radio/{radio}", lambda snapshot: snapshot.filter_by_radio(radio)
+        )
+        return await self._respond(data, args)
 
+    @tool(ToolDefinitions.get_towers_by_mcc)
     async def get_towers_by_mcc(self, args: dict) -> list[types.TextContent]:
         """Filter towers by Mobile Country Code"""
-        mcc = args.get("mcc")
-        if mcc is None:
-            raise ValueError("mcc parameter is required")
+        mcc = args["mcc"]
         logger.info(f"Fetching towers with MCC: {mcc}")
-        data = await self.api_client.get(f"/mcc/{mcc}")
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query(f"/mcc/{mcc}", lambda snapshot: snapshot.filter_by_mcc(mcc))
+        return await self._respond(data, args)
 
+    @tool(ToolDefinitions.get_towers_by_location)
     async def get_towers_by_location(self, args: dict) -> list[types.TextContent]:
         """Get towers within a geographic bounding box"""
-        required_params = ["min_lon", "max_lon", "min_lat", "max_lat"]
-        if not all(param in args for param in required_params):
-            raise ValueError(f"All parameters required: {required_params}")
-        
         logger.info(f"Fetching towers by location: {args}")
         params = {
             "minLon": args["min_lon"],
@@ -112,124 +266,530 @@ class ToolHandler:
             "minLat": args["min_lat"],
             "maxLat": args["max_lat"],
         }
-        data = await self.api_client.get("/location", params=params)
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query(
+            "/location",
+            lambda snapshot: snapshot.filter_by_location(
+                args["min_lon"], args["max_lon"], args["min_lat"], args["max_lat"]
+            ),
+            params=params,
+        )
+        return await self._respond(data, args)
+
+    @tool(ToolDefinitions.get_nearest_towers)
+    async def get_nearest_towers(self, args: dict) -> list[types.TextContent]:
+        """Find the towers closest to a point using the spatial index"""
+        limit = args.get("limit", DEFAULT_NEAREST_LIMIT)
+        logger.info(f"Finding {limit} towers nearest to ({args['lon']}, {args['lat']})")
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("local_query"):
+            data = snapshot.nearest(args["lon"], args["lat"], limit)
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.get_towers_within_radius)
+    async def get_towers_within_radius(self, args: dict) -> list[types.TextContent]:
+        """Find towers within a radius of a point using the spatial index"""
+        logger.info(f"Finding towers within {args['radius_m']} m of ({args['lon']}, {args['lat']})")
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("local_query"):
+            data = snapshot.within_radius(args["lon"], args["lat"], args["radius_m"])
+        return await self._respond(data, args)
 
+    @tool(ToolDefinitions.get_towers_by_signal_range)
     async def get_towers_by_signal_range(self, args: dict) -> list[types.TextContent]:
         """Filter towers by signal strength range"""
-        required_params = ["min_signal", "max_signal"]
-        if not all(param in args for param in required_params):
-            raise ValueError(f"All parameters required: {required_params}")
-        
         logger.info(f"Fetching towers by signal range: {args}")
         params = {
             "minSignal": args["min_signal"],
             "maxSignal": args["max_signal"],
         }
-        data = await self.api_client.get("/signal", params=params)
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query(
+            "/signal",
+            lambda snapshot: snapshot.filter_by_signal_range(args["min_signal"], args["max_signal"]),
+            params=params,
+        )
+        return await self._respond(data, args)
 
+    @tool(ToolDefinitions.get_towers_by_min_samples)
     async def get_towers_by_min_samples(self, args: dict) -> list[types.TextContent]:
         """Filter towers by minimum number of samples"""
-        min_samples = args.get("min_samples")
-        if min_samples is None:
-            raise ValueError("min_samples parameter is required")
+        min_samples = args["min_samples"]
         logger.info(f"Fetching towers with min samples: {min_samples}")
-        data = await self.api_client.get(f"/samples/{min_samples}")
-        return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+        data = await self._query(
+            f"/samples/{min_samples}",
+            lambda snapshot: snapshot.filter_by_min_samples(min_samples),
+        )
+        return await self._respond(data, args)
+
+    @tool(ToolDefinitions.query_towers)
+    async def query_towers(self, args: dict) -> list[types.TextContent]:
+        """Evaluate combined filters through the query planner"""
+        query = TowerQuery.from_args(args, limit=QUERY_DEFAULT_LIMIT)
+        logger.info(f"Querying towers where {[predicate.describe() for predicate in query.predicates]}")
+        data = await self._run_query(query)
+        return await self._respond(data, args)
+
+    @tool(ToolDefinitions.fetch_result_page)
+    async def fetch_result_page(self, args: dict) -> list[types.TextContent]:
+        """Serve a slice of a result kept in the result store"""
+        handle = args["handle"]
+        offset = args.get("offset", 0)
+        result = self.result_store.get(handle)
+        if result is None:
+            raise ValueError(f"Result handle '{handle}' is unknown or has expired; run the original query again")
+        if offset > len(result):
+            raise ValueError(f"offset {offset} is past the end of the result ({len(result)} rows)")
+        page = result.rows(offset, offset + args.get("limit", RESULT_PAGE_ROWS))
+        return await self._page_response(handle, result, offset, page, args.get("format"))
 
+    @tool(ToolDefinitions.create_tower)
     async def create_tower(self, args: dict) -> list[types.TextContent]:
         """Create a new tower entry"""
-        required_params = ["radio", "mcc", "net", "area", "cell", "lon", "lat"]
-        if not all(param in args for param in required_params):
-            raise ValueError(f"All parameters required: {required_params}")
-        
-        logger.info(f"Creating new tower: {args}")
-        data = await self.api_client.post("", json_data=args)
+        tower = {key: value for key, value in args.items() if key not in ("format", "check_duplicates")}
+        logger.info(f"Creating new tower: {tower}")
+        if args.get("check_duplicates"):
+            snapshot = await self.snapshot.ensure_fresh()
+            error = duplicate_errors(snapshot, [tower])[0]
+            if error:
+                raise ValueError(f"Tower not created: {error}")
+        data = await self.api_client.post("", json_data=tower)
+        self.snapshot.invalidate()
         return [types.TextContent(
             type="text",
-            text=f"Tower created successfully:\n{json.dumps(data, indent=2)}"
+            text=f"Tower created successfully:\n{format_payload(data, args.get('format'))}"
         )]
 
+    @tool(ToolDefinitions.bulk_create_towers)
+    async def bulk_create_towers(self, args: dict) -> list[types.TextContent]:
+        """Create many towers through the batch endpoint"""
+        towers = args.get("towers")
+        csv_text = args.get("csv")
+        if (towers is None) == (csv_text is None):
+            raise ValueError("Exactly one of towers or csv parameters is required")
+
+        rows = parse_csv(csv_text) if csv_text is not None else towers
+        logger.info(f"Bulk creating {len(rows)} towers")
+        dedup = None
+        if args.get("check_duplicates"):
+            snapshot = await self.snapshot.ensure_fresh()
+            dedup = lambda valid: duplicate_errors(snapshot, valid)
+        report = await self.bulk_ingestor.ingest(
+            rows,
+            batch_size=args.get("batch_size", BULK_BATCH_SIZE),
+            dry_run=args.get("dry_run", False),
+            dedup=dedup,
+        )
+        if report["created"]:
+            self.snapshot.invalidate()
+        return [types.TextContent(type="text", text=format_payload(report, args.get("format")))]
+
+    @tool(ToolDefinitions.update_tower)
     async def update_tower(self, args: dict) -> list[types.TextContent]:
         """Update an existing tower"""
-        tower_id = args.get("id")
-        updates = args.get("updates")
-        
-        if tower_id is None or updates is None:
-            raise ValueError("id and updates parameters are required")
-        
+        tower_id = args["id"]
+        updates = args["updates"]
         logger.info(f"Updating tower {tower_id}: {updates}")
         data = await self.api_client.patch(f"/{tower_id}", json_data=updates)
+        self.snapshot.invalidate()
         return [types.TextContent(
             type="text",
-            text=f"Tower updated successfully:\n{json.dumps(data, indent=2)}"
+            text=f"Tower updated successfully:\n{format_payload(data, args.get('format'))}"
         )]
 
+    @tool(ToolDefinitions.delete_tower)
     async def delete_tower(self, args: dict) -> list[types.TextContent]:
         """Delete a tower"""
-        tower_id = args.get("id")
-        if tower_id is None:
-            raise ValueError("id parameter is required")
-        
+        tower_id = args["id"]
         logger.info(f"Deleting tower {tower_id}")
         await self.api_client.delete(f"/{tower_id}")
+        self.snapshot.invalidate()
         return [types.TextContent(type="text", text=f"Tower {tower_id} deleted successfully")]
 
+    @tool(ToolDefinitions.analyze_coverage)
     async def analyze_coverage(self, args: dict) -> list[types.TextContent]:
         """Analyze tower coverage statistics"""
         logger.info(f"Analyzing coverage with filters: {args}")
-        
-        # Determine which filter to apply
-        if "radio" in args:
-            towers = await self.api_client.get(f"/radio/{args['radio']}")
-        elif all(k in args for k in ["min_lon", "max_lon", "min_lat", "max_lat"]):
-            params = {
-                "minLon": args["min_lon"],
-                "maxLon": args["max_lon"],
-                "minLat": args["min_lat"],
-                "maxLat": args["max_lat"],
-            }
-            towers = await self.api_client.get("/location", params=params)
+
+        if COVERAGE_PUSHDOWN_ENABLED and not SNAPSHOT_ENABLED and self._stats_endpoint_available:
+            analysis = await self._coverage_from_backend(args)
+            if analysis is not None:
+                if not analysis:
+                    return [types.TextContent(type="text", text="No towers found matching the criteria")]
+                return [types.TextContent(type="text", text=format_payload(analysis, args.get("format")))]
+
+        predicates = self._coverage_predicates(args)
+        if predicates and SNAPSHOT_ENABLED:
+            # Aggregate the matching snapshot rows in place, without building dicts
+            snapshot = await self.snapshot.ensure_fresh()
+            with metrics.phase("analysis"):
+                _, positions, _ = self.query_planner.match_local(TowerQuery(predicates), snapshot)
+                analysis = CoverageAggregator().update_columns(snapshot, positions).to_dict()
+            if not analysis:
+                return [types.TextContent(type="text", text="No towers found matching the criteria")]
+            return [types.TextContent(type="text", text=format_payload(analysis, args.get("format")))]
+        if predicates:
+            # Radio and bounding box combine instead of the radio filter winning
+            towers = (await self._run_query(TowerQuery(predicates)))["towers"]
         else:
-            towers = await self.api_client.get("")
-        
+            # Whole table: fold page by page instead of materializing every tower
+            aggregator = await self._aggregate_all_towers()
+            if not aggregator.count:
+                return [types.TextContent(type="text", text="No towers found matching the criteria")]
+            analysis = aggregator.to_dict()
+            return [types.TextContent(type="text", text=format_payload(analysis, args.get("format")))]
+
         # Analyze the data
         if not towers:
             return [types.TextContent(type="text", text="No towers found matching the criteria")]
         
-        analysis = self._compute_coverage_analysis(towers)
-        return [types.TextContent(type="text", text=json.dumps(analysis, indent=2))]
+        with metrics.phase("analysis"):
+            analysis = await offloader.thread(self._compute_coverage_analysis, towers, rows=len(towers))
+        return [types.TextContent(type="text", text=format_payload(analysis, args.get("format")))]
+
+    async def _aggregate_all_towers(self) -> CoverageAggregator:
+        """Coverage aggregate of the whole table, computed off the event loop
+
+        The snapshot is folded column-wise in place. Backend pages are handed
+        to the process pool as raw bodies, decoded into columns and folded
+        there, and only the small partial aggregates come back to be merged.
+        """
+        if SNAPSHOT_ENABLED:
+            snapshot = await self.snapshot.ensure_fresh()
+            with metrics.phase("analysis"):
+                return CoverageAggregator().update_columns(snapshot)
+
+        parts: list[asyncio.Future] = []
+        try:
+            async for body in self.api_client.iter_pages(page_size=STREAM_PAGE_SIZE, raw=True):
+                parts.append(await offloader.submit("process", aggregate_page, body))
+            aggregator = CoverageAggregator()
+            with metrics.phase("analysis"):
+                for part in await asyncio.gather(*parts):
+                    aggregator.merge(part)
+            return aggregator
+        finally:
+            for part in parts:
+                part.cancel()
+
+    async def _coverage_from_backend(self, args: dict) -> dict[str, Any] | None:
+        """Coverage analysis from the backend /stats GROUP BY endpoint
+
+        Returns None when the endpoint cannot answer, so the caller falls back
+        to aggregating towers locally.
+        """
+        params = {}
+        for predicate in self._coverage_predicates(args):
+            if isinstance(predicate, BoxPredicate):
+                params.update(predicate.endpoint()[1])
+            else:
+                params["radio"] = predicate.value
+
+        try:
+            by_radio, by_net, by_area, by_signal = await asyncio.gather(*(
+                self.api_client.get("/stats", params={**params, "groupBy": group_by})
+                for group_by in ("radio", "net", "area", "signal")
+            ))
+        except httpx.HTTPStatusError as e:
+            # Older backends route /stats to /{id} and answer 400 (or 404/405)
+            if e.response.status_code in (400, 404, 405):
+                logger.info("Backend has no /stats endpoint; analysing coverage locally from now on")
+                self._stats_endpoint_available = False
+            else:
+                logger.warning(f"Coverage pushdown failed, analysing locally: {e}")
+            return None
+        except httpx.TransportError as e:
+            logger.warning(f"Coverage pushdown failed, analysing locally: {e}")
+            return None
+
+        with metrics.phase("analysis"):
+            return CoverageAggregator.from_group_rows(by_radio, by_net, by_area, by_signal).to_dict()
+
+    @staticmethod
+    def _coverage_predicates(args: dict) -> list[FieldPredicate | BoxPredicate]:
+        """Optional radio and bounding-box filters of analyze_coverage"""
+        predicates: list[FieldPredicate | BoxPredicate] = []
+        if "radio" in args:
+            predicates.append(FieldPredicate("radio", "eq", args["radio"]))
+        if all(k in args for k in ["min_lon", "max_lon", "min_lat", "max_lat"]):
+            predicates.append(BoxPredicate(args["min_lon"], args["max_lon"], args["min_lat"], args["max_lat"]))
+        return predicates
+
+    @tool(ToolDefinitions.coverage_grid)
+    async def coverage_grid(self, args: dict) -> list[types.TextContent]:
+        """Rasterize towers into a grid of per-cell coverage statistics"""
+        logger.info(f"Building coverage grid: {args}")
+        bbox = self._optional_bbox(args)
+        if args.get("grid", "lonlat") == "geohash":
+            spec = GridSpec.geohash(args.get("precision", 5))
+        else:
+            spec = GridSpec.lonlat(args.get("resolution", GRID_DEFAULT_RESOLUTION_DEG))
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("analysis"):
+            data = coverage_grid(
+                snapshot,
+                self.grid_cache,
+                spec,
+                bbox=bbox,
+                radio=args.get("radio"),
+                layers=tuple(dict.fromkeys(args.get("layers", DEFAULT_GRID_LAYERS))),
+            )
+        if not data:
+            return [types.TextContent(type="text", text="No towers found matching the criteria")]
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.find_coverage_gaps)
+    async def find_coverage_gaps(self, args: dict) -> list[types.TextContent]:
+        """Find regions outside every tower's range"""
+        logger.info(f"Finding coverage gaps: {args}")
+        bbox = self._optional_bbox(args)
+        snapshot = await self.snapshot.ensure_fresh()
+        data = await find_coverage_gaps(
+            snapshot,
+            GridSpec.lonlat(args.get("resolution", COVERAGE_GAP_RESOLUTION_DEG)),
+            bbox=bbox,
+            radio=args.get("radio"),
+            min_cells=args.get("min_cells", 1),
+            limit=args.get("limit", COVERAGE_REGION_LIMIT),
+            parallel=args.get("parallel"),
+        )
+        if not data:
+            return [types.TextContent(type="text", text="No towers found matching the criteria")]
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.find_coverage_overlap)
+    async def find_coverage_overlap(self, args: dict) -> list[types.TextContent]:
+        """Find regions covered by more than N towers of the same radio"""
+        logger.info(f"Finding coverage overlap: {args}")
+        bbox = self._optional_bbox(args)
+        snapshot = await self.snapshot.ensure_fresh()
+        data = await find_coverage_overlap(
+            snapshot,
+            GridSpec.lonlat(args.get("resolution", COVERAGE_GAP_RESOLUTION_DEG)),
+            min_towers=args.get("min_towers", 3),
+            bbox=bbox,
+            radio=args.get("radio"),
+            min_cells=args.get("min_cells", 1),
+            limit=args.get("limit", COVERAGE_REGION_LIMIT),
+            parallel=args.get("parallel"),
+        )
+        if not data:
+            return [types.TextContent(type="text", text="No towers found matching the criteria")]
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.find_duplicate_towers)
+    async def find_duplicate_towers(self, args: dict) -> list[types.TextContent]:
+        """List groups of towers sharing a cell identity"""
+        logger.info(f"Finding duplicate towers: {args}")
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("analysis"):
+            data = find_duplicates(
+                snapshot,
+                match_radio=args.get("match_radio", True),
+                limit=args.get("limit", DUPLICATE_GROUP_LIMIT),
+            )
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.find_conflicting_towers)
+    async def find_conflicting_towers(self, args: dict) -> list[types.TextContent]:
+        """List same-identity towers whose locations disagree"""
+        logger.info(f"Finding conflicting towers: {args}")
+        snapshot = await self.snapshot.ensure_fresh()
+        with metrics.phase("analysis"):
+            data = find_duplicates(
+                snapshot,
+                min_spread_m=args.get("min_distance_m", DUPLICATE_CONFLICT_DISTANCE_M),
+                match_radio=args.get("match_radio", True),
+                limit=args.get("limit", DUPLICATE_GROUP_LIMIT),
+            )
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.coverage_timeseries)
+    async def coverage_timeseries(self, args: dict) -> list[types.TextContent]:
+        """Bucket tower counts by created or updated time"""
+        logger.info(f"Building coverage timeseries: {args}")
+        bbox = self._optional_bbox(args)
+        await self.snapshot.ensure_fresh()
+        with metrics.phase("local_query"):
+            data = self.time_rollups.timeseries(
+                args.get("time_field", "created"),
+                args.get("granularity", "month"),
+                {field: args.get(field) for field in ROLLUP_DIMENSIONS},
+                start=args.get("start"),
+                end=args.get("end"),
+                bbox=bbox,
+            )
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.get_tower_neighbors)
+    async def get_tower_neighbors(self, args: dict) -> list[types.TextContent]:
+        """List towers of the same network within each other's range"""
+        logger.info(f"Fetching tower neighbors: {args}")
+        snapshot = await self.snapshot.ensure_fresh()
+        graph = await self.neighbor_graph.get()
+        with metrics.phase("local_query"):
+            data = tower_neighbors(snapshot, graph, args["id"], args.get("limit", NEIGHBOR_DEFAULT_LIMIT))
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @tool(ToolDefinitions.interference_clusters)
+    async def interference_clusters(self, args: dict) -> list[types.TextContent]:
+        """List connected groups of neighboring towers"""
+        logger.info(f"Finding interference clusters: {args}")
+        snapshot = await self.snapshot.ensure_fresh()
+        graph = await self.neighbor_graph.get()
+        with metrics.phase("analysis"):
+            data = interference_clusters(
+                snapshot,
+                graph,
+                radio=args.get("radio"),
+                net=args.get("net"),
+                min_size=args.get("min_size", 2),
+                limit=args.get("limit", NEIGHBOR_CLUSTER_LIMIT),
+            )
+        return [types.TextContent(type="text", text=format_payload(data, args.get("format")))]
+
+    @staticmethod
+    def _optional_bbox(args: dict) -> tuple[float, float, float, float] | None:
+        """The min/max lon/lat arguments as a tuple, or None when none are given"""
+        keys = ("min_lon", "max_lon", "min_lat", "max_lat")
+        given = [key in args for key in keys]
+        if not any(given):
+            return None
+        if not all(given):
+            raise ValueError("min_lon, max_lon, min_lat and max_lat must be given together")
+        return tuple(args[key] for key in keys)
+
+    @tool(ToolDefinitions.get_server_metrics)
+    async def get_server_metrics(self, args: dict) -> list[types.TextContent]:
+        """Report in-process metrics and optionally control the profiler"""
+        action = args.get("profiler")
+        profile = None
+        if action == "stop":
+            profile = profiler.stop()
+        elif action is not None:
+            profiler.start(action)
+
+        cache = self.api_client.cache_stats()
+        if args.get("prometheus"):
+            gauges = {f"cache_{key}": value for key, value in cache.items()}
+            gauges["snapshot_rows"] = 0 if self.snapshot.is_stale else len(self.snapshot)
+            gauges["circuit_open"] = int(self.api_client.circuit_stats()["state"] == "open")
+            gauges.update({f"grid_cache_{key}": value for key, value in self.grid_cache.stats().items()})
+            gauges.update({f"result_store_{key}": value for key, value in self.result_store.stats().items()})
+            gauges.update({f"time_rollups_{key}": value for key, value in self.time_rollups.stats().items()})
+            gauges.update({f"neighbor_graph_{key}": value for key, value in self.neighbor_graph.stats().items()})
+            offload = offloader.stats()
+            gauges.update({f"offload_pending_{pool}": count for pool, count in offload["pending"].items()})
+            gauges["offload_shared_bytes"] = offload["shared_bytes"]
+            text = metrics.to_prometheus(gauges)
+            if profile is not None:
+                text += "\n" + format_payload(profile, args.get("format"))
+        else:
+            data = {
+                **metrics.to_dict(),
+                "cache": cache,
+                "circuit_breaker": self.api_client.circuit_stats(),
+                "coverage_grid_cache": self.grid_cache.stats(),
+                "result_store": self.result_store.stats(),
+                "time_rollups": self.time_rollups.stats(),
+                "neighbor_graph": self.neighbor_graph.stats(),
+                "offload": offloader.stats(),
+                "snapshot": {
+                    "enabled": SNAPSHOT_ENABLED,
+                    "loaded": not self.snapshot.is_stale,
+                    "rows": len(self.snapshot),
+                    "version": self.snapshot.version,
+                    "watermark": self.snapshot.watermark,
+                },
+                "profiler": profiler.status(),
+            }
+            if profile is not None:
+                data["profile"] = profile
+            text = format_payload(data, args.get("format"))
+        if args.get("reset"):
+            metrics.reset()
+        return [types.TextContent(type="text", text=text)]
+
+    async def _respond(self, data: Any, args: dict) -> list[types.TextContent]:
+        """Render a read result, keeping a large tower list in the result store behind a handle"""
+        fmt = args.get("format")
+        table = data if isinstance(data, TowerColumns) else None
+        rows = None if table is not None else find_table(data)
+        count = len(table) if table is not None else len(rows or ())
+        if not RESULT_HANDLES_ENABLED or fmt == "summary" or count <= RESULT_HANDLE_MIN_ROWS:
+            if table is not None:
+                data = await offloader.thread(table.rows, rows=count)
+            return [types.TextContent(type="text", text=await render_payload(data, fmt))]
+
+        if table is not None:
+            result = ResultTable(table, list(FIELD_ORDER))
+        else:
+            result = await offloader.thread(ResultTable.from_rows, rows, rows=count)
+        handle = self.result_store.put(result)
+        page = result.rows(0, RESULT_PAGE_ROWS)
+        return await self._page_response(
+            handle, result, 0, page if table is not None else replace_table(data, page), fmt, summary=True
+        )
+
+    async def _page_response(
+        self, handle: str | None, result: ResultTable, offset: int, page: Any, fmt: str | None, summary: bool = False
+    ) -> list[types.TextContent]:
+        """Handle metadata followed by the rows of one page"""
+        returned = len(find_table(page) or ())
+        next_offset = offset + returned if offset + returned < len(result) else None
+        meta: dict[str, Any] = {
+            "handle": handle,
+            "total_count": len(result),
+            "offset": offset,
+            "returned": returned,
+            "next_offset": next_offset,
+            "expires_in_s": round(self.result_store.expires_in(handle)) if handle else 0,
+        }
+        if summary:
+            meta["summary"] = result.summary()
+        if next_offset is not None:
+            meta["hint"] = (
+                f"Call fetch_result_page with handle '{handle}' and offset {next_offset} for more rows"
+                if handle else "Result too large to keep server-side; narrow the query to see more rows"
+            )
+        return [
+            types.TextContent(type="text", text=format_payload(meta, fmt)),
+            types.TextContent(type="text", text=await render_payload(page, fmt)),
+        ]
+
+    async def _stream_towers(self, page_size: int) -> AsyncIterator[list[dict]]:
+        """Yield every tower in id order, one page at a time"""
+        if SNAPSHOT_ENABLED:
+            snapshot = await self.snapshot.ensure_fresh()
+            for chunk in snapshot.iter_chunks(page_size):
+                yield chunk
+        else:
+            async for page in self.api_client.iter_pages(page_size=page_size):
+                yield page
+
+    async def _run_query(self, query: TowerQuery) -> dict[str, Any]:
+        """Plan and run a tower query on the snapshot when enabled, else on the backend"""
+        if SNAPSHOT_ENABLED:
+            snapshot = await self.snapshot.ensure_fresh()
+            with metrics.phase("local_query"):
+                return self.query_planner.run_local(query, snapshot)
+        return await self.query_planner.run_remote(query)
+
+    async def _query(
+        self,
+        endpoint: str,
+        local: Callable[[TowerSnapshot], list[dict] | TowerColumns],
+        params: dict | None = None,
+    ) -> list[dict] | TowerColumns:
+        """Answer a read query from the local snapshot when enabled, else from the API"""
+        if SNAPSHOT_ENABLED:
+            snapshot = await self.snapshot.ensure_fresh()
+            with metrics.phase("local_query"):
+                return local(snapshot)
+        return await self.api_client.get(endpoint, params=params)
 
     @staticmethod
     def _compute_coverage_analysis(towers: list[dict]) -> dict[str, Any]:
         """Compute coverage statistics from tower data"""
-        if not towers:
-            return {}
-        
-        signal_values = [t.get("averageSignal", 0) for t in towers]
-        sample_values = [t.get("samples", 0) for t in towers]
-        
-        analysis = {
-            "total_towers": len(towers),
-            "radio_distribution": {},
-            "signal_stats": {
-                "average": sum(signal_values) / len(signal_values),
-                "strongest": max(signal_values),
-                "weakest": min(signal_values),
-            },
-            "sample_stats": {
-                "total_samples": sum(sample_values),
-                "avg_samples_per_tower": sum(sample_values) / len(towers),
-            },
-        }
-        
-        # Calculate radio distribution
-        for tower in towers:
-            radio = tower.get("radio", "Unknown")
-            analysis["radio_distribution"][radio] = analysis["radio_distribution"].get(radio, 0) + 1
-        
-        return analysis
+        return CoverageAggregator().update(towers).to_dict()
 
     @staticmethod
     def _error_response(error: Exception) -> list[types.TextContent]:
@@ -0,0 +1,221 @@
+"""
+Tool registry for Cell Tower Signal Intelligence MCP Server
+Dispatch table, cached tool list and argument validators compiled from JSON schemas
+"""
+
+import logging
+import math
+from typing import Any, Awaitable, Callable
+
+import mcp.types as types
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Any, str], Any]
+ToolResult = list[types.TextContent | types.ImageContent | types.EmbeddedResource]
+Handler = Callable[[dict], Awaitable[ToolResult]]
+
+_TRUE_STRINGS = frozenset({"true", "1", "yes"})
+_FALSE_STRINGS = frozenset({"false", "0", "no"})
+
+
+def tool(definition: Callable[[], types.Tool]) -> Callable[[Handler], Handler]:
+    """Mark a handler method as the implementation of a ToolDefinitions entry"""
+    def mark(handler: Handler) -> Handler:
+        handler.tool_definition = definition
+        return handler
+    return mark
+
+
+def _coerce_integer(value: Any, path: str) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"{path} must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"{path} must be an integer")
+
+
+def _coerce_number(value: Any, path: str) -> int | float:
+    if isinstance(value, bool):
+        raise ValueError(f"{path} must be a number")
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"{path} must be a finite number")
+        return value
+    if isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            pass
+        else:
+            if math.isfinite(number):
+                return number
+    raise ValueError(f"{path} must be a number")
+
+
+def _coerce_boolean(value: Any, path: str) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS | _FALSE_STRINGS:
+        return value.strip().lower() in _TRUE_STRINGS
+    raise ValueError(f"{path} must be a boolean")
+
+
+def _coerce_string(value: Any, path: str) -> str:
+    if isinstance(value, str):
+        return value
+    raise ValueError(f"{path} must be a string")
+
+
+def _check_array(value: Any, path: str) -> list:
+    if isinstance(value, list):
+        return value
+    raise ValueError(f"{path} must be an array")
+
+
+def _check_object(value: Any, path: str) -> dict:
+    if isinstance(value, dict):
+        return value
+    raise ValueError(f"{path} must be an object")
+
+
+_TYPE_CHECKS: dict[str, Validator] = {
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+    "string": _coerce_string,
+    "array": _check_array,
+    "object": _check_object,
+}
+
+
+def compile_validator(schema: dict) -> Validator:
+    """Turn a JSON schema into a function that checks and coerces one value
+
+    Supports the subset the tool schemas use: type, enum, minimum, maximum,
+    minItems, maxItems, items, properties and required. Unknown properties are
+    passed through untouched.
+    """
+    steps: list[Validator] = []
+
+    type_check = _TYPE_CHECKS.get(schema.get("type"))
+    if type_check is not None:
+        steps.append(type_check)
+
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+
+        def check_enum(value: Any, path: str) -> Any:
+            if value not in allowed:
+                raise ValueError(f"{path} must be one of: {', '.join(map(str, allowed))}")
+            return value
+        steps.append(check_enum)
+
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    if minimum is not None or maximum is not None:
+        def check_range(value: Any, path: str) -> Any:
+            if minimum is not None and value < minimum:
+                raise ValueError(f"{path} must be >= {minimum}")
+            if maximum is not None and value > maximum:
+                raise ValueError(f"{path} must be <= {maximum}")
+            return value
+        steps.append(check_range)
+
+    min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+    if min_items is not None or max_items is not None:
+        def check_length(value: list, path: str) -> list:
+            if min_items is not None and len(value) < min_items:
+                raise ValueError(f"{path} requires at least {min_items} items")
+            if max_items is not None and len(value) > max_items:
+                raise ValueError(f"{path} allows at most {max_items} items")
+            return value
+        steps.append(check_length)
+
+    if "items" in schema:
+        item_validator = compile_validator(schema["items"])
+
+        def check_items(value: list, path: str) -> list:
+            return [item_validator(item, f"{path}[{i}]") for i, item in enumerate(value)]
+        steps.append(check_items)
+
+    if "properties" in schema or "required" in schema:
+        properties = {
+            key: compile_validator(subschema)
+            for key, subschema in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+
+        def check_properties(value: dict, path: str) -> dict:
+            missing = [key for key in required if value.get(key) is None]
+            if missing:
+                prefix = f"{path}." if path else ""
+                if len(missing) == 1:
+                    raise ValueError(f"{prefix}{missing[0]} parameter is required")
+                raise ValueError(f"All parameters required: {[prefix + key for key in required]}")
+            result = dict(value)
+            for key, validator in properties.items():
+                if result.get(key) is not None:
+                    result[key] = validator(result[key], f"{path}.{key}" if path else key)
+            return result
+        steps.append(check_properties)
+
+    if len(steps) == 1:
+        return steps[0]
+
+    def validate(value: Any, path: str = "") -> Any:
+        for step in steps:
+            value = step(value, path)
+        return value
+    return validate
+
+
+class RegisteredTool:
+    """A tool definition bound to its handler and compiled argument validator"""
+
+    __slots__ = ("definition", "handler", "validate")
+
+    def __init__(self, definition: types.Tool, handler: Handler):
+        self.definition = definition
+        self.handler = handler
+        self.validate = compile_validator(definition.inputSchema)
+
+
+class ToolRegistry:
+    """Name -> tool table built once at startup"""
+
+    def __init__(self):
+        self._tools: dict[str, RegisteredTool] = {}
+
+    @classmethod
+    def from_handler(cls, handler_object: object) -> "ToolRegistry":
+        """Register every @tool-marked method of `handler_object`, in class order"""
+        registry = cls()
+        for klass in reversed(type(handler_object).__mro__):
+            for name, member in vars(klass).items():
+                definition = getattr(member, "tool_definition", None)
+                if definition is not None:
+                    registry.register(definition(), getattr(handler_object, name))
+        return registry
+
+    def register(self, definition: types.Tool, handler: Handler) -> None:
+        if definition.name in self._tools:
+            raise ValueError(f"Tool already registered: {definition.name}")
+        self._tools[definition.name] = RegisteredTool(definition, handler)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    async def dispatch(self, name: str, arguments: dict | None) -> ToolResult:
+        """Validate `arguments` against the tool schema and run its handler"""
+        registered = self._tools.get(name)
+        if registered is None:
+            raise ValueError(f"Unknown tool: {name}")
+        args = registered.validate(arguments or {}, "")
+        return await registered.handler(args)
@@ -0,0 +1,102 @@
+"""
+Duplicate detection for Cell Tower Signal Intelligence MCP Server
+Finds towers sharing a cell identity and checks new towers against the snapshot before insert
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from spatial_index import haversine_m
+from tower_snapshot import TowerSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def find_duplicates(
+    snapshot: TowerSnapshot,
+    min_spread_m: float | None = None,
+    match_radio: bool = True,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Groups of towers sharing (radio, mcc, net, area, cell), largest and most spread first
+
+    `spread_m` is the greatest distance of a group member from its lowest-id
+    tower. With `min_spread_m`, only groups spread further apart than that are
+    kept: the conflicts, where copies disagree on where the cell is.
+    `match_radio=False` groups on (mcc, net, area, cell) alone.
+    """
+    groups = snapshot.identity_index.groups(snapshot.columns["radio"] if match_radio else None)
+    if groups:
+        sizes = np.array([len(group) for group in groups])
+        members = np.concatenate(groups)
+        labels = np.repeat(np.arange(len(groups)), sizes)
+        first = members[np.repeat(np.cumsum(sizes) - sizes, sizes)]
+        lon, lat = snapshot.columns["lon"], snapshot.columns["lat"]
+        distances = haversine_m(lon[first], lat[first], lon[members], lat[members])
+        # fmax ignores members without coordinates; a group with none stays NaN
+        spread = np.full(len(groups), np.nan)
+        np.fmax.at(spread, labels, distances)
+    else:
+        sizes = spread = np.empty(0)
+
+    selected = np.arange(len(groups))
+    if min_spread_m is not None:
+        selected = selected[spread > min_spread_m]
+        order = np.argsort(-spread[selected], kind="stable")
+    else:
+        order = np.lexsort((-np.nan_to_num(spread[selected], nan=-1.0), -sizes[selected]))
+    selected = selected[order]
+
+    identity_fields = ["radio", "mcc", "net", "area", "cell"] if match_radio else ["mcc", "net", "area", "cell"]
+    results = []
+    for i in selected[:limit].tolist():
+        towers = snapshot.rows(groups[i])
+        results.append({
+            "identity": "/".join(str(towers[0][field]) for field in identity_fields),
+            "count": len(towers),
+            "spread_m": None if np.isnan(spread[i]) else round(float(spread[i]), 1),
+            "towers": towers,
+        })
+    return {
+        "identity_fields": identity_fields,
+        "groups": len(selected),
+        "towers": int(sizes[selected].sum()),
+        "returned": len(results),
+        "truncated": len(selected) > limit,
+        "results": results,
+    }
+
+
+def duplicate_errors(snapshot: TowerSnapshot, towers: list[dict]) -> list[str | None]:
+    """Per new tower, why it duplicates an existing or earlier tower, else None
+
+    The whole batch is resolved in one identity index lookup.
+    """
+    if not towers:
+        return []
+    identities = [
+        (tower.get("radio"), tower["mcc"], tower["net"], tower["area"], tower["cell"])
+        for tower in towers
+    ]
+    query, positions = snapshot.match_identities(*zip(*identities))
+    existing: dict[int, int] = {}
+    for i, tower_id in zip(query.tolist(), snapshot.columns["id"][positions].tolist()):
+        existing.setdefault(i, tower_id)
+
+    errors: list[str | None] = []
+    seen: set[tuple] = set()
+    for i, identity in enumerate(identities):
+        label = "/".join(str(part) for part in identity)
+        if i in existing:
+            errors.append(f"cell identity {label} already exists as tower {existing[i]}")
+        elif identity in seen:
+            errors.append(f"cell identity {label} appears earlier in the request")
+        else:
+            seen.add(identity)
+            errors.append(None)
+    duplicates = sum(error is not None for error in errors)
+    if duplicates:
+        logger.info(f"Pre-insert check: {duplicates} of {len(towers)} towers duplicate a cell identity")
+    return errors
@@ -0,0 +1,198 @@
+"""
+Compact tower model for Cell Tower Signal Intelligence MCP Server
+Struct-of-arrays tower tables decoded from response bytes and turned into dicts only for output
+"""
+
+import json
+import logging
+from typing import Any, Iterable
+
+import numpy as np
+
+from tower_schema import FIELD_ORDER, FLOAT_FIELDS, INT_FIELDS, TIME_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Sentinel stored in integer columns for null values. It is smaller than any
+# real value, so range and equality masks never match a missing field.
+INT_NULL = np.iinfo(np.int64).min
+
+# LocalDateTime fields are held as datetime64 with NaT for null
+TIME_DTYPE = np.dtype("datetime64[us]")
+
+# Radio name interned for a null radio. It sorts before every real name,
+# `rows` writes it back as None and `radio_labels` shows it as "Unknown".
+RADIO_NULL = ""
+
+
+def parse_times(values: Iterable[str | None]) -> np.ndarray:
+    """ISO-8601 local date-times to datetime64[us]; None and unparseable values become NaT"""
+    values = ["NaT" if value is None else value for value in values]
+    try:
+        return np.array(values, dtype=TIME_DTYPE)
+    except ValueError:
+        parsed = np.empty(len(values), dtype=TIME_DTYPE)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, "us")
+            except ValueError:
+                logger.warning(f"Unparseable timestamp {value!r} stored as null")
+                parsed[i] = np.datetime64("NaT")
+        return parsed
+
+
+def format_times(values: np.ndarray) -> list[str | None]:
+    """datetime64 back to the backend's LocalDateTime text
+
+    Seconds are always written and a fraction only when non-zero, with
+    trailing zeros trimmed, like Java's ISO_LOCAL_DATE_TIME.
+    """
+    values = values.astype(TIME_DTYPE)
+    seconds = values.astype("datetime64[s]")
+    text = np.datetime_as_string(seconds).tolist()
+    missing = np.isnat(values)
+    micros = (values - seconds).astype(np.int64)
+    for i in np.flatnonzero(missing).tolist():
+        text[i] = None
+    for i in np.flatnonzero((micros != 0) & ~missing).tolist():
+        text[i] += f".{micros[i]:06d}".rstrip("0")
+    return text
+
+
+class TowerColumns:
+    """A tower table as one numpy array per field
+
+    Integer fields are int64 with INT_NULL for null, lon/lat float64 with NaN,
+    timestamps datetime64[us] with NaT, and radio a uint8 code into the
+    interned `radio_names` (RADIO_NULL for null). Rows cost about 120 bytes instead of the 1 KB+ of
+    a backend-shaped dict; `rows` builds dicts only at the output edge.
+    """
+
+    __slots__ = ("columns", "radio_names")
+
+    def __init__(self, columns: dict[str, np.ndarray] | None = None, radio_names: list[str] | None = None):
+        self.columns: dict[str, np.ndarray] = columns if columns is not None else self._empty_columns()
+        self.radio_names: list[str] = radio_names if radio_names is not None else []
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    @property
+    def radio_labels(self) -> list[str]:
+        """`radio_names` for display and grouping, with a null radio shown as Unknown"""
+        return [name if name != RADIO_NULL else "Unknown" for name in self.radio_names]
+
+    @classmethod
+    def from_dicts(cls, towers: list[dict]) -> "TowerColumns":
+        """Encode backend-shaped tower dicts"""
+        columns: dict[str, np.ndarray] = {}
+        for field in INT_FIELDS:
+            columns[field] = np.fromiter(
+                (INT_NULL if (v := t.get(field)) is None else v for t in towers),
+                dtype=np.int64,
+                count=len(towers),
+            )
+        for field in FLOAT_FIELDS:
+            columns[field] = np.fromiter(
+                (np.nan if (v := t.get(field)) is None else v for t in towers),
+                dtype=np.float64,
+                count=len(towers),
+            )
+        for field in TIME_FIELDS:
+            columns[field] = parse_times([t.get(field) for t in towers])
+        columns["radio"] = np.array([t.get("radio") or RADIO_NULL for t in towers], dtype=object)
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "TowerColumns":
+        """Decode a response body holding a tower list or a Spring page of towers
+
+        The parsed dicts live only for the duration of this call.
+        """
+        if not body:
+            return cls()
+        decoded = json.loads(body)
+        if isinstance(decoded, dict):
+            decoded = decoded.get("content") or []
+        return cls.from_dicts(decoded)
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, np.ndarray]) -> "TowerColumns":
+        """Adopt raw columns with radio as an array of names and timestamps as text or datetime64"""
+        columns = dict(columns)
+        for field in TIME_FIELDS:
+            if columns[field].dtype.kind != "M":
+                columns[field] = parse_times(columns[field].tolist())
+            else:
+                columns[field] = columns[field].astype(TIME_DTYPE)
+        radio = columns["radio"]
+        if radio.dtype == object:
+            radio = np.where(np.equal(radio, None), RADIO_NULL, radio)
+        names, codes = np.unique(radio.astype(str), return_inverse=True)
+        columns["radio"] = codes.astype(np.uint8)
+        return cls(columns, names.tolist())
+
+    @classmethod
+    def concat(cls, parts: list["TowerColumns"]) -> "TowerColumns":
+        """Join tables, re-coding radios against the union of their names"""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls()
+        names = sorted(set().union(*(part.radio_names for part in parts)))
+        lookup = {name: code for code, name in enumerate(names)}
+        radio = [
+            np.array([lookup[name] for name in part.radio_names], dtype=np.uint8)[part.columns["radio"]]
+            for part in parts
+        ]
+        columns = {
+            field: np.concatenate([part.columns[field] for part in parts])
+            for field in parts[0].columns if field != "radio"
+        }
+        columns["radio"] = np.concatenate(radio)
+        return cls(columns, names)
+
+    def take(self, positions: np.ndarray) -> "TowerColumns":
+        return TowerColumns({field: column[positions] for field, column in self.columns.items()}, self.radio_names)
+
+    def rows(self, indices: np.ndarray | None = None, fields: list[str] | None = None) -> list[dict[str, Any]]:
+        """Convert selected rows back to backend-shaped dicts (output edge only)
+
+        `fields` projects the output onto the given subset of FIELD_ORDER, in that order.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        fields = fields or FIELD_ORDER
+        values: dict[str, list] = {}
+        for field in fields:
+            column = self.columns[field][indices]
+            if field in INT_FIELDS:
+                values[field] = [None if v == INT_NULL else v for v in column.tolist()]
+            elif field in FLOAT_FIELDS:
+                values[field] = [None if v != v else v for v in column.tolist()]
+            elif field in TIME_FIELDS:
+                values[field] = format_times(column)
+            else:
+                names = [name if name != RADIO_NULL else None for name in self.radio_names]
+                values[field] = [names[code] for code in column.tolist()]
+
+        return [
+            {field: values[field][i] for field in fields}
+            for i in range(len(indices))
+        ]
+
+    @staticmethod
+    def _empty_columns() -> dict[str, np.ndarray]:
+        columns = {field: np.empty(0, dtype=np.int64) for field in INT_FIELDS}
+        columns.update({field: np.empty(0, dtype=np.float64) for field in FLOAT_FIELDS})
+        columns.update({field: np.empty(0, dtype=TIME_DTYPE) for field in TIME_FIELDS})
+        columns["radio"] = np.empty(0, dtype=np.uint8)
+        return columns
+
+
+def decode_page(body: bytes) -> TowerColumns:
+    """TowerColumns.from_body as a plain function, for worker processes"""
+    return TowerColumns.from_body(body)
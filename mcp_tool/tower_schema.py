@@ -0,0 +1,41 @@
+"""
+Tower schema vocabulary for Cell Tower Signal Intelligence MCP Server
+Field names and enumerations shared by the tool schemas and the data layer
+
+This module must stay free of heavy imports (numpy, httpx): the server builds
+its tool list from it before the first tool call loads anything else.
+"""
+
+# Field order of the backend CellTower JSON representation
+FIELD_ORDER: tuple[str, ...] = (
+    "id", "radio", "mcc", "net", "area", "cell", "unit", "lon", "lat",
+    "range", "samples", "changeable", "created", "updated", "averageSignal",
+)
+INT_FIELDS: tuple[str, ...] = (
+    "id", "mcc", "net", "area", "cell", "unit",
+    "range", "samples", "changeable", "averageSignal",
+)
+FLOAT_FIELDS: tuple[str, ...] = ("lon", "lat")
+# LocalDateTime fields
+TIME_FIELDS: tuple[str, ...] = ("created", "updated")
+
+# Numeric part of a cell identity; radio is matched separately
+IDENTITY_FIELDS: tuple[str, ...] = ("mcc", "net", "area", "cell")
+
+# Conditions accepted by query_towers
+QUERY_OPERATORS: tuple[str, ...] = ("eq", "ne", "lt", "lte", "gt", "gte", "between", "in")
+QUERY_FIELDS: tuple[str, ...] = (
+    "id", "radio", "mcc", "net", "area", "cell", "unit", "lon", "lat",
+    "range", "samples", "changeable", "averageSignal",
+)
+
+# Bucketing accepted by coverage_timeseries, and the dimensions its rollups key on
+TIMESERIES_FIELDS: tuple[str, ...] = ("created", "updated")
+TIMESERIES_GRANULARITIES: tuple[str, ...] = ("day", "month")
+ROLLUP_DIMENSIONS: tuple[str, ...] = ("radio", "net", "area")
+
+# Per-cell layers computed by coverage_grid
+GRID_LAYERS: tuple[str, ...] = (
+    "count", "radio_mix", "mean_signal", "max_signal", "coverage", "coverage_depth",
+)
+DEFAULT_GRID_LAYERS: tuple[str, ...] = ("count", "radio_mix", "mean_signal", "max_signal", "coverage")
@@ -0,0 +1,631 @@
+"""
+Local tower snapshot for Cell Tower Signal Intelligence MCP Server
+Keeps an in-process, column-oriented copy of the tower table for fast filtering
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Iterator
+
+import httpx
+import numpy as np
+
+from api_client import APIClient
+from config import (
+    SNAPSHOT_FULL_REFRESH_INTERVAL,
+    SNAPSHOT_PAGE_SIZE,
+    SNAPSHOT_REFRESH_INTERVAL,
+    SNAPSHOT_SYNC_ENABLED,
+    SNAPSHOT_SYNC_INTERVAL,
+    SNAPSHOT_SYNC_OVERLAP,
+    SNAPSHOT_SYNC_PAGE_SIZE,
+)
+from metrics import metrics
+from offload import SharedArrays, offloader
+from spatial_index import GridIndex
+from tower_model import TowerColumns, decode_page
+from tower_schema import IDENTITY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Columns mirrored into shared memory for worker processes
+SHARED_FIELDS: tuple[str, ...] = ("lon", "lat", "radio", "range")
+
+
+class ColumnIndex:
+    """Row positions of one column in value order, for range counts and lookups"""
+
+    __slots__ = ("order", "values")
+
+    def __init__(self, column: np.ndarray):
+        # Stable, so equal values keep id order; NaN sorts last, INT_NULL first
+        self.order = np.argsort(column, kind="stable")
+        self.values = column[self.order]
+
+    def _bounds(self, interval: tuple) -> tuple[int, int]:
+        (low, low_inclusive), (high, high_inclusive) = interval
+        start = int(np.searchsorted(self.values, low, side="left" if low_inclusive else "right"))
+        stop = int(np.searchsorted(self.values, high, side="right" if high_inclusive else "left"))
+        return start, max(start, stop)
+
+    def count(self, intervals: list[tuple]) -> int:
+        """Rows whose value lies in any of the (disjoint) intervals"""
+        return sum(stop - start for start, stop in map(self._bounds, intervals))
+
+    def positions(self, intervals: list[tuple]) -> np.ndarray:
+        """Ascending row positions whose value lies in any of the intervals"""
+        slices = [self.order[start:stop] for start, stop in map(self._bounds, intervals)]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(slices))
+
+
+def identity_hash(keys: list[np.ndarray]) -> np.ndarray:
+    """64-bit mix of the identity columns; equal hashes still need a field comparison"""
+    hashes = np.zeros(len(keys[0]), dtype=np.uint64)
+    for key in keys:
+        hashes = (hashes ^ key.astype(np.uint64)) * np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+class IdentityIndex:
+    """Row positions ordered by a hash of the cell identity (mcc, net, area, cell)
+
+    A batch of identities resolves with two vectorized binary searches over the
+    hashes; candidates are then compared field by field, so collisions never
+    produce false matches.
+    """
+
+    __slots__ = ("keys", "order", "hashes")
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.keys = [columns[field] for field in IDENTITY_FIELDS]
+        hashes = identity_hash(self.keys)
+        # Stable, so rows sharing an identity stay in id order
+        self.order = np.argsort(hashes, kind="stable")
+        self.hashes = hashes[self.order]
+
+    def lookup(self, identities: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """(query, row position) pairs for every row matching each queried identity"""
+        wanted = identity_hash(identities)
+        start = np.searchsorted(self.hashes, wanted, side="left")
+        counts = np.searchsorted(self.hashes, wanted, side="right") - start
+        query = np.repeat(np.arange(len(wanted)), counts)
+        offsets = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = self.order[start[query] + offsets]
+        same = np.ones(len(positions), dtype=bool)
+        for key, identity in zip(self.keys, identities):
+            same &= key[positions] == identity[query]
+        return query[same], positions[same]
+
+    def groups(self, radio: np.ndarray | None = None) -> list[np.ndarray]:
+        """Ascending row positions of every identity held by more than one row
+
+        Only rows whose hash repeats are compared exactly; passing the radio
+        column splits groups by radio type as well.
+        """
+        repeated = np.zeros(len(self.hashes), dtype=bool)
+        same = self.hashes[1:] == self.hashes[:-1]
+        repeated[1:] |= same
+        repeated[:-1] |= same
+        candidates = self.order[repeated]
+        if not len(candidates):
+            return []
+        keys = [key[candidates] for key in self.keys]
+        if radio is not None:
+            keys.append(radio[candidates].astype(np.int64))
+        _, inverse, counts = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        shared = counts[inverse] > 1
+        candidates, inverse = candidates[shared], inverse[shared]
+        order = np.lexsort((candidates, inverse))
+        candidates, inverse = candidates[order], inverse[order]
+        if not len(candidates):
+            return []
+        return np.split(candidates, np.flatnonzero(np.diff(inverse)) + 1)
+
+
+class TowerSnapshot(TowerColumns):
+    """Column arrays of every tower, loaded from the backend /paged endpoint
+
+    Once loaded, the snapshot is kept current through the /changes feed when
+    the backend has one: only rows written since the `watermark` (backend
+    server time) are fetched and merged by id.
+    """
+
+    def __init__(self, api_client: APIClient | None = None):
+        super().__init__()
+        self.api_client = api_client or APIClient()
+        # When the contents were last made current, by a reload or a sync
+        self.loaded_at: float | None = None
+        self.full_loaded_at: float | None = None
+        self.watermark: str | None = None
+        # Bumped whenever the contents change, for caches derived from them
+        self.version = 0
+        self._dirty = False
+        self._sync_supported = SNAPSHOT_SYNC_ENABLED
+        self._lock = asyncio.Lock()
+        self._spatial_index: GridIndex | None = None
+        self._column_indexes: dict[str, ColumnIndex] = {}
+        self._identity_index: IdentityIndex | None = None
+        self._delta_listeners: list[Callable[[int, TowerColumns, TowerColumns], None]] = []
+        self._shared: SharedArrays | None = None
+        # Previous generation, kept until the next reload for tasks still reading it
+        self._retired_shared: SharedArrays | None = None
+        self._clear()
+
+    @property
+    def spatial_index(self) -> GridIndex:
+        """Grid index over lon/lat, built on first use after each reload"""
+        if self._spatial_index is None:
+            self._spatial_index = GridIndex(self.columns["lon"], self.columns["lat"])
+        return self._spatial_index
+
+    def column_index(self, field: str) -> ColumnIndex:
+        """Sorted index over one column, built on first use after each reload"""
+        index = self._column_indexes.get(field)
+        if index is None:
+            index = self._column_indexes[field] = ColumnIndex(self.columns[field])
+        return index
+
+    @property
+    def identity_index(self) -> IdentityIndex:
+        """Hash index over the cell identity, built on first use after each reload"""
+        if self._identity_index is None:
+            self._identity_index = IdentityIndex(self.columns)
+        return self._identity_index
+
+    def add_delta_listener(self, listener: Callable[[int, TowerColumns, TowerColumns], None]) -> None:
+        """Call `listener(version, before, after)` after each sync merge
+
+        `before` holds the replaced and deleted rows as they were at `version`,
+        `after` the written rows. Reloads do not notify; listeners compare
+        `version` to notice them.
+        """
+        self._delta_listeners.append(listener)
+
+    def shared_columns(self) -> SharedArrays:
+        """SHARED_FIELDS in one shared-memory block, built on first use after each reload"""
+        if self._shared is None:
+            self._shared = offloader.share({field: self.columns[field] for field in SHARED_FIELDS})
+        return self._shared
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the snapshot needs to be loaded or brought up to date"""
+        if self.loaded_at is None or self._dirty:
+            return True
+        interval = SNAPSHOT_SYNC_INTERVAL if self.watermark is not None else SNAPSHOT_REFRESH_INTERVAL
+        return time.monotonic() - self.loaded_at >= interval
+
+    @property
+    def needs_reload(self) -> bool:
+        """Whether the next update must be a full reload rather than a sync"""
+        if self.loaded_at is None or self.watermark is None:
+            return True
+        return time.monotonic() - self.full_loaded_at >= SNAPSHOT_FULL_REFRESH_INTERVAL
+
+    def invalidate(self) -> None:
+        """Update the snapshot on next access (called after write operations)
+
+        With a change feed this costs one sync round instead of a reload.
+        """
+        self._dirty = True
+
+    async def ensure_fresh(self) -> "TowerSnapshot":
+        """Load or sync the snapshot if it is missing, written to or past its interval"""
+        if self.is_stale:
+            async with self._lock:
+                # Another caller may have refreshed while we waited for the lock
+                if self.is_stale:
+                    if self.needs_reload or not await self.sync():
+                        await self.refresh()
+        return self
+
+    async def refresh(self) -> None:
+        """Pull the full tower set through the paged endpoint"""
+        started = time.perf_counter()
+        # Cleared up front so a write made while the pages download marks it again
+        self._dirty = False
+        parts: list[asyncio.Future] = []
+        try:
+            # Taken first, so writes made while the pages download are synced later
+            watermark = await self._feed_watermark()
+            # Pages are decoded into columns in the offload pool while later pages
+            # download; the pool's slot limit throttles the fetch
+            async for body in self.api_client.iter_pages(page_size=SNAPSHOT_PAGE_SIZE, raw=True):
+                parts.append(await offloader.submit("process", decode_page, body, rows=SNAPSHOT_PAGE_SIZE))
+            chunks = await asyncio.gather(*parts)
+            self._assign(TowerColumns.concat(chunks))
+        except BaseException:
+            self._dirty = True
+            raise
+        finally:
+            for part in parts:
+                part.cancel()
+
+        self.loaded_at = self.full_loaded_at = time.monotonic()
+        self.watermark = watermark
+        elapsed = time.perf_counter() - started
+        metrics.observe("snapshot_refresh_seconds", elapsed)
+        elapsed_ms = elapsed * 1000
+        logger.info(f"Tower snapshot loaded: {len(self)} towers in {elapsed_ms:.0f} ms")
+
+    async def sync(self) -> bool:
+        """Merge the rows written and deleted since the watermark from /changes
+
+        Returns False when the feed cannot be used (none on the backend, or the
+        table was cleared) and the caller should reload in full instead.
+        """
+        if self.watermark is None:
+            return False
+        started = time.perf_counter()
+        self._dirty = False
+        since = np.datetime64(self.watermark, "us") - np.timedelta64(int(SNAPSHOT_SYNC_OVERLAP * 1e6), "us")
+        params: dict[str, Any] = {"since": str(since), "size": SNAPSHOT_SYNC_PAGE_SIZE}
+        parts: list[TowerColumns] = []
+        try:
+            first = page = await self._get_changes(params)
+            if page is None:
+                return False
+            if page.get("reset"):
+                logger.info("Tower table was cleared on the backend; reloading the snapshot")
+                return False
+            parts.append(TowerColumns.from_dicts(page.get("towers") or []))
+            while page.get("hasMore"):
+                params.update(since=page["nextSince"], afterId=page["nextAfterId"])
+                page = await self.api_client.get("/changes", cache=False, params=params)
+                parts.append(TowerColumns.from_dicts(page.get("towers") or []))
+        except BaseException:
+            self._dirty = True
+            raise
+
+        changed = TowerColumns.concat(parts)
+        deleted = np.asarray(first.get("deletedIds") or [], dtype=np.int64)
+        touched = self._apply(changed, deleted)
+        if touched:
+            # Non-snapshot reads may have cached the rows that just changed
+            self.api_client.cache.invalidate()
+        self.watermark = first["serverTime"]
+        self.loaded_at = time.monotonic()
+        elapsed = time.perf_counter() - started
+        metrics.observe("snapshot_sync_seconds", elapsed)
+        metrics.increment("snapshot_sync_rows", touched)
+        elapsed_ms = elapsed * 1000
+        logger.info(
+            f"Tower snapshot synced: {len(changed)} changed and {len(deleted)} deleted rows fetched, "
+            f"{touched} applied in {elapsed_ms:.0f} ms"
+        )
+        return True
+
+    def load(self, towers: list[dict]) -> None:
+        """Replace the snapshot contents with an already fetched tower list"""
+        self._assign(TowerColumns.from_dicts(towers))
+        self.loaded_at = self.full_loaded_at = time.monotonic()
+        self.watermark = None
+
+    def load_columns(self, columns: dict[str, np.ndarray]) -> None:
+        """Replace the snapshot contents with prebuilt columns
+
+        Expects every field of FIELD_ORDER, with radio as an array of names,
+        timestamps as ISO text or datetime64, and nulls encoded as INT_NULL / NaN.
+        """
+        self._assign(TowerColumns.from_columns(columns))
+        self.loaded_at = self.full_loaded_at = time.monotonic()
+        self.watermark = None
+
+    # ------------------------------------------------------------------
+    # Masks
+    # ------------------------------------------------------------------
+
+    def mask_radio(self, radio: str) -> np.ndarray:
+        """Rows whose radio type equals `radio`"""
+        try:
+            code = self.radio_names.index(radio)
+        except ValueError:
+            return np.zeros(len(self), dtype=bool)
+        return self.columns["radio"] == code
+
+    def mask_mcc(self, mcc: int) -> np.ndarray:
+        """Rows with the given Mobile Country Code"""
+        return self.columns["mcc"] == int(mcc)
+
+    def mask_bbox(self, min_lon: float, max_lon: float, min_lat: float, max_lat: float) -> np.ndarray:
+        """Rows inside the bounding box (inclusive, like the backend BETWEEN query)"""
+        lon = self.columns["lon"]
+        lat = self.columns["lat"]
+        return (
+            (lon >= float(min_lon)) & (lon <= float(max_lon))
+            & (lat >= float(min_lat)) & (lat <= float(max_lat))
+        )
+
+    def mask_signal(self, min_signal: int, max_signal: int) -> np.ndarray:
+        """Rows whose average signal lies in [min_signal, max_signal]"""
+        signal = self.columns["averageSignal"]
+        return (signal >= int(min_signal)) & (signal <= int(max_signal))
+
+    def mask_min_samples(self, min_samples: int) -> np.ndarray:
+        """Rows with strictly more samples than `min_samples`"""
+        return self.columns["samples"] > int(min_samples)
+
+    # ------------------------------------------------------------------
+    # Queries mirroring the backend endpoints
+    # ------------------------------------------------------------------
+
+    def all_towers(self) -> TowerColumns:
+        """The current contents as a table; syncs replace columns rather than write into them"""
+        return TowerColumns(self.columns, self.radio_names)
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+        """All towers in id order, materialized `chunk_size` rows at a time"""
+        for start in range(0, len(self), chunk_size):
+            yield self.rows(np.arange(start, min(start + chunk_size, len(self))))
+
+    def find_by_id(self, tower_id: int) -> dict[str, Any] | None:
+        """Binary search on the id column (the snapshot is loaded sorted by id)"""
+        ids = self.columns["id"]
+        pos = int(np.searchsorted(ids, int(tower_id)))
+        if pos < len(ids) and ids[pos] == int(tower_id):
+            return self.rows(np.array([pos]))[0]
+        return None
+
+    def find_by_ids(self, tower_ids: list[int]) -> dict[int, dict[str, Any]]:
+        """Vectorized id lookup; ids missing from the snapshot are left out"""
+        ids = self.columns["id"]
+        wanted = np.asarray(tower_ids, dtype=np.int64)
+        positions = np.searchsorted(ids, wanted)
+        found = positions < len(ids)
+        found[found] = ids[positions[found]] == wanted[found]
+        rows = self.rows(positions[found])
+        return {row["id"]: row for row in rows}
+
+    def find_by_identity(
+        self, radio: str | None, mcc: int | None, net: int | None, area: int | None, cell: int
+    ) -> list[dict[str, Any]]:
+        """Towers matching a cell identity; None components act as wildcards"""
+        if None not in (mcc, net, area):
+            _, positions = self.match_identities([radio], [mcc], [net], [area], [cell])
+            return self.rows(np.sort(positions))
+        mask = self.columns["cell"] == int(cell)
+        if radio is not None:
+            mask &= self.mask_radio(radio)
+        for field, value in (("mcc", mcc), ("net", net), ("area", area)):
+            if value is not None:
+                mask &= self.columns[field] == int(value)
+        return self.select(mask)
+
+    def find_by_identities(self, identities: list[tuple]) -> list[list[dict[str, Any]]]:
+        """Towers matching each (radio, mcc, net, area, cell) identity, in input order
+
+        Identities with mcc, net and area all given resolve in one batched
+        index lookup; the rest fall back to find_by_identity.
+        """
+        complete = [i for i, identity in enumerate(identities) if None not in identity[1:4]]
+        results: list[list[dict[str, Any]]] = [[] for _ in identities]
+        if complete:
+            query, positions = self.match_identities(*zip(*(identities[i] for i in complete)))
+            order = np.lexsort((positions, query))
+            query, positions = query[order], positions[order]
+            bounds = np.searchsorted(query, np.arange(len(complete) + 1))
+            for k, i in enumerate(complete):
+                results[i] = self.rows(positions[bounds[k]:bounds[k + 1]])
+        for i, identity in enumerate(identities):
+            if None in identity[1:4]:
+                results[i] = self.find_by_identity(*identity)
+        return results
+
+    def match_identities(
+        self, radios: list[str | None], mcc: list[int], net: list[int], area: list[int], cell: list[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(identity, row position) pairs for each row matching a batch of identities
+
+        Uses the identity hash index; a None radio matches any radio type.
+        """
+        identities = [np.asarray(values, dtype=np.int64) for values in (mcc, net, area, cell)]
+        query, positions = self.identity_index.lookup(identities)
+        codes = {name: code for code, name in enumerate(self.radio_names)}
+        # -1 matches any radio, 256 (an unknown name) none
+        wanted = np.array([-1 if radio is None else codes.get(radio, 256) for radio in radios], dtype=np.int16)[query]
+        keep = (wanted < 0) | (self.columns["radio"][positions] == wanted)
+        return query[keep], positions[keep]
+
+    def filter_by_radio(self, radio: str) -> TowerColumns:
+        return self.subset(self.mask_radio(radio))
+
+    def filter_by_mcc(self, mcc: int) -> TowerColumns:
+        return self.subset(self.mask_mcc(mcc))
+
+    def filter_by_location(
+        self, min_lon: float, max_lon: float, min_lat: float, max_lat: float
+    ) -> TowerColumns:
+        indices = self.spatial_index.bbox(
+            float(min_lon), float(max_lon), float(min_lat), float(max_lat)
+        )
+        return self.take(indices)
+
+    def nearest(self, lon: float, lat: float, limit: int) -> list[dict[str, Any]]:
+        """The `limit` towers closest to a point, with their distance in metres"""
+        indices, distances = self.spatial_index.nearest(float(lon), float(lat), int(limit))
+        return self._with_distance(indices, distances)
+
+    def within_radius(self, lon: float, lat: float, radius_m: float) -> list[dict[str, Any]]:
+        """Towers within `radius_m` metres of a point, nearest first"""
+        indices, distances = self.spatial_index.within_radius(float(lon), float(lat), float(radius_m))
+        return self._with_distance(indices, distances)
+
+    def filter_by_signal_range(self, min_signal: int, max_signal: int) -> TowerColumns:
+        return self.subset(self.mask_signal(min_signal, max_signal))
+
+    def filter_by_min_samples(self, min_samples: int) -> TowerColumns:
+        return self.subset(self.mask_min_samples(min_samples))
+
+    def select(self, mask: np.ndarray) -> list[dict[str, Any]]:
+        """Materialize the rows selected by a boolean mask"""
+        return self.rows(np.flatnonzero(mask))
+
+    def subset(self, mask: np.ndarray) -> TowerColumns:
+        """The rows selected by a boolean mask, still as columns"""
+        return self.take(np.flatnonzero(mask))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _with_distance(self, indices: np.ndarray, distances: np.ndarray) -> list[dict[str, Any]]:
+        towers = self.rows(indices)
+        for tower, distance in zip(towers, distances.tolist()):
+            tower["distance_m"] = round(distance, 1)
+        return towers
+
+    async def _get_changes(self, params: dict[str, Any] | None = None) -> dict | None:
+        """One /changes page, or None when the backend has no change feed"""
+        try:
+            return await self.api_client.get("/changes", cache=False, params=params)
+        except httpx.HTTPStatusError as e:
+            # Older backends route /changes to /{id} and answer 400 (or 404/405)
+            if e.response.status_code not in (400, 404, 405):
+                raise
+            logger.info("Backend has no /changes feed; reloading the snapshot in full from now on")
+            self._sync_supported = False
+            self.watermark = None
+            return None
+
+    async def _feed_watermark(self) -> str | None:
+        """Backend server time to sync from after a reload; None without a change feed"""
+        if not self._sync_supported:
+            return None
+        page = await self._get_changes()
+        return None if page is None else page["serverTime"]
+
+    def _apply(self, changed: TowerColumns, deleted: np.ndarray) -> int:
+        """Upsert `changed` rows by id and drop `deleted` ids; returns the rows affected
+
+        Rows identical to the stored ones (re-read through the sync overlap)
+        are skipped, so a round without real changes keeps every index.
+        """
+        if len(changed):
+            # A tower written twice during one round comes back twice; the later copy wins
+            reversed_ids = changed.columns["id"][::-1]
+            _, last = np.unique(reversed_ids, return_index=True)
+            changed = changed.take(len(reversed_ids) - 1 - last)
+
+        positions, found = self._locate(changed.columns["id"])
+        if found.any():
+            same = self._unchanged(changed.take(np.flatnonzero(found)), positions[found])
+            fresh = np.ones(len(changed), dtype=bool)
+            fresh[np.flatnonzero(found)[same]] = False
+            changed = changed.take(np.flatnonzero(fresh))
+            positions, found = positions[fresh], found[fresh]
+        gone, gone_found = self._locate(deleted)
+
+        touched = len(changed) + int(gone_found.sum())
+        if touched:
+            version = self.version
+            before = self.take(np.unique(np.concatenate([positions[found], gone[gone_found]])))
+            self._merge(positions, found, gone[gone_found], changed)
+            for listener in self._delta_listeners:
+                listener(version, before, changed)
+        return touched
+
+    def _merge(self, positions: np.ndarray, found: np.ndarray, removed: np.ndarray, changed: TowerColumns) -> None:
+        """Write id-sorted `changed` rows over the rows at `positions[found]`, insert
+        the rest in id order and drop the rows at `removed`
+
+        Updates and inserts past the highest id, the usual mix, copy each column
+        once; otherwise kept and changed rows are interleaved with masks. Either
+        way there is no concatenate and argsort as in a reload.
+        """
+        ids = self.columns["id"]
+        inserted = ~found
+        appending = not len(removed) and (
+            not inserted.any() or not len(ids) or changed.columns["id"][inserted][0] > ids[-1]
+        )
+        if not appending:
+            keep = np.ones(len(ids), dtype=bool)
+            keep[positions[found]] = False
+            keep[removed] = False
+            kept_ids = ids[keep]
+            slots = np.searchsorted(kept_ids, changed.columns["id"]) + np.arange(len(changed))
+            from_kept = np.ones(len(kept_ids) + len(changed), dtype=bool)
+            from_kept[slots] = False
+
+        names = sorted(set(self.radio_names) | set(changed.radio_names))
+        lookup = {name: code for code, name in enumerate(names)}
+        columns = {}
+        for field, column in self.columns.items():
+            incoming = changed.columns[field]
+            if field == "radio":
+                if names != self.radio_names:
+                    column = np.array([lookup[name] for name in self.radio_names], dtype=np.uint8)[column]
+                incoming = np.array([lookup[name] for name in changed.radio_names], dtype=np.uint8)[incoming]
+            if appending:
+                merged = np.concatenate([column, incoming[inserted]])
+                merged[positions[found]] = incoming[found]
+            else:
+                merged = np.empty(len(from_kept), dtype=column.dtype)
+                merged[from_kept] = column[keep]
+                merged[slots] = incoming
+            columns[field] = merged
+
+        self.columns = columns
+        self.radio_names = names
+        self._reset_derived()
+
+    def _locate(self, wanted: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Positions of `wanted` ids in the id column and which of them exist"""
+        ids = self.columns["id"]
+        positions = np.searchsorted(ids, wanted)
+        found = positions < len(ids)
+        found[found] = ids[positions[found]] == wanted[found]
+        return positions, found
+
+    def _unchanged(self, rows: TowerColumns, positions: np.ndarray) -> np.ndarray:
+        """Which of `rows` equal the stored rows at `positions`, nulls included"""
+        same = np.ones(len(rows), dtype=bool)
+        for field, column in rows.columns.items():
+            stored = self.columns[field][positions]
+            if field == "radio":
+                same &= (
+                    np.array(self.radio_names, dtype=object)[stored]
+                    == np.array(rows.radio_names, dtype=object)[column]
+                )
+            elif column.dtype.kind == "f":
+                same &= (stored == column) | (np.isnan(stored) & np.isnan(column))
+            elif column.dtype.kind == "M":
+                same &= (stored == column) | (np.isnat(stored) & np.isnat(column))
+            else:
+                same &= stored == column
+        return same
+
+    def _clear(self) -> None:
+        self.columns = self._empty_columns()
+        self.radio_names = []
+        self._reset_derived()
+
+    def _reset_derived(self) -> None:
+        """Drop indexes and shared blocks built over the previous columns"""
+        self.version += 1
+        self._spatial_index = None
+        self._column_indexes = {}
+        self._identity_index = None
+        if self._retired_shared is not None:
+            offloader.release(self._retired_shared)
+        self._retired_shared, self._shared = self._shared, None
+
+    def _assign(self, table: TowerColumns) -> None:
+        """Adopt a decoded table as the snapshot contents"""
+        if not len(table):
+            self._clear()
+            return
+
+        columns = table.columns
+        # Keep rows ordered by id so id lookups can binary search
+        order = np.argsort(columns["id"], kind="stable")
+        if not np.all(order[:-1] < order[1:]):
+            columns = {field: column[order] for field, column in columns.items()}
+
+        self.columns = columns
+        self.radio_names = table.radio_names
+        self._reset_derived()